@@ -0,0 +1,186 @@
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import load_workbook
+
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, get_profiler, profile_stage, \
+    start_profiling, stop_profiling
+
+
+def main():
+    print('Start batch parser...')
+    args = parse_args()
+    start_profiling_by_args(args)
+    excel_files = find_excel_files(args.path)
+    if len(excel_files) == 0:
+        sys.exit(f'\nNo excel files are found in {args.path}.')
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    print(f'\nParse {str(len(excel_files))} excel file(s) with {str(args.workers)} worker(s)...')
+    input_root = get_input_root(args.path)
+    jobs = [(excel_file, get_output_file_stem(excel_file, input_root, args.output_dir), args.no_cache, args.ndjson,
+             args.profile, args.profile_memory) for excel_file in excel_files]
+    with profile_stage('parse excel files'), ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(parse_excel_file, jobs))
+    # the stages of each file are recorded in the worker processes
+    for r in results:
+        if r['profile'] is not None:
+            get_profiler().add_profile(r['profile'], f'{r["file"]}: ')
+
+    print_failed_file_logs(results)
+    print_result_table(results)
+    n_failed = len([r for r in results if r['status'] != 'OK'])
+    if n_failed > 0:
+        sys.exit(f'\n{str(n_failed)} of {str(len(results))} excel file(s) failed to be parsed.')
+    sys.exit(f'\nAll {str(len(results))} excel file(s) are parsed, the results are stored in {args.output_dir}.')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='The program parses all the excel files in a folder or matching '
+                                                 'a glob pattern, and detects the type of each file by its sheets')
+    parser.add_argument('path', metavar='path',
+                        help='A folder containing excel files, or a glob pattern e.g. "content/**/*.xlsx"')
+    parser.add_argument('--output-dir', metavar='output_dir', default='output/batch',
+                        help='The folder to store a json file per excel file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='The number of processes parsing the files in parallel')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse the excel files even if they have not changed since they were last parsed')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Store one document per line (NDJSON) instead of a single json object per file')
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+
+def find_excel_files(path: str) -> list:
+    if os.path.isdir(path):
+        path = os.path.join(path, '*.xlsx')
+    # temporary files of excel, e.g., "~$topic.xlsx", are not workbooks
+    return sorted(f for f in glob.glob(path, recursive=True)
+                  if os.path.isfile(f) and not os.path.basename(f).startswith('~$'))
+
+
+def get_input_root(path: str) -> str:
+    """
+    It returns the folder of the path, or the folder of a glob pattern before its first wildcard,
+    e.g., "content" for "content/**/*.xlsx".
+    """
+    root = path
+    while any(wildcard in root for wildcard in '*?['):
+        root = os.path.dirname(root)
+    if not os.path.isdir(root):
+        root = os.path.dirname(root)
+    return root if root != '' else os.curdir
+
+
+def get_output_file_stem(excel_file, input_root: str, output_dir: str) -> str:
+    """
+    It returns the output file of an excel file without the type and the extension, which are added once the type
+    is detected. The path of the excel file relative to the input root is kept, so the workbooks of the same name
+    in different folders, e.g., matched by a recursive glob pattern, are not written to the same output file.
+    """
+    return os.path.join(output_dir, os.path.splitext(os.path.relpath(excel_file, input_root))[0])
+
+
+def get_workbook_types() -> dict:
+    # the sheets identifying each type of workbook, the first matching type is used
+    return {
+        'case-study': ('Case Study', 'Section', 'Section Content', 'Exercises', 'Questions',
+                       'Additional Learning Material'),
+        'learning-topic': ('Topic', 'Learning Modules', 'Learning Materials', 'Exercises', 'Questions'),
+        'survey': ('Survey', 'Sections', 'Questions'),
+    }
+
+
+def detect_workbook_type(excel_file) -> str:
+    """
+    It returns the type of the workbook by its sheet names, or None if the sheets do not match any type.
+    Only the workbook structure is read, not the cells.
+    """
+    workbook = load_workbook(excel_file, read_only=True)
+    sheet_names = set(workbook.sheetnames)
+    workbook.close()
+    for workbook_type, expected_sheet_names in get_workbook_types().items():
+        if sheet_names.issuperset(expected_sheet_names):
+            return workbook_type
+    return None
+
+
+def parse_excel_file(job) -> dict:
+    """
+    It runs in a worker process and parses an excel file with the parser of its type.
+    The output of the parser is kept in the result instead of being printed, so the workers do not mix their output,
+    and it is printed by the main process if the file fails to be parsed.
+    """
+    excel_file, output_file_stem, no_cache, is_ndjson, is_profiled, is_memory_traced = job
+    result = {'file': excel_file, 'type': None, 'status': 'FAILED', 'seconds': 0.0, 'output': None, 'message': None,
+              'log': None, 'profile': None}
+    start = time.perf_counter()
+    log = io.StringIO()
+    if is_profiled:
+        start_profiling(is_memory_traced)
+    try:
+        with contextlib.redirect_stdout(log):
+            with profile_stage('detect workbook type'):
+                result['type'] = detect_workbook_type(excel_file)
+            if result['type'] is None:
+                raise ValueError('The sheets do not match a learning topic, case study or survey workbook.')
+            args = argparse.Namespace(excel_file=[excel_file], collect_all=False, report_file=None,
+                                      no_cache=no_cache, ndjson=is_ndjson)
+            output_file = f'{output_file_stem}.{result["type"]}.{"ndjson" if is_ndjson else "json"}'
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            get_parse_function(result['type'])(args, output_file)
+        result['status'] = 'OK'
+        result['output'] = output_file
+    except Exception as e:
+        # a failing file should not stop the other files in the batch
+        result['message'] = f'{e.__class__.__name__}: {str(e).strip()}'
+    result['seconds'] = time.perf_counter() - start
+    result['log'] = log.getvalue()
+    if is_profiled:
+        result['profile'] = stop_profiling().to_dict()
+    return result
+
+
+def get_parse_function(workbook_type: str):
+    # the parsers are imported in the worker only when needed
+    if workbook_type == 'case-study':
+        from case_study_parser import parse_excel_file_to_case_study_json_file
+        return parse_excel_file_to_case_study_json_file
+    if workbook_type == 'learning-topic':
+        from learning_topic_parser import parse_excel_file_to_topic_json_file
+        return parse_excel_file_to_topic_json_file
+    from survey_parser import parse_excel_file_to_survey_json_file
+    return parse_excel_file_to_survey_json_file
+
+
+def print_failed_file_logs(results: list):
+    # the validation messages of a failed file tell why it has failed
+    for r in results:
+        if r['status'] != 'OK':
+            print(f'\n******************** Output of {r["file"]} ********************')
+            print(r['log'].strip())
+            print(f'\nError: {r["message"]}')
+
+
+def print_result_table(results: list):
+    print('\n******************** Batch result ********************')
+    print(f'{"file":<40} {"type":<15} {"status":<7} {"seconds":>8}  output / error')
+    for r in results:
+        # the end of the path is shown, the name is more telling than the folders
+        file_name = r['file'][-40:]
+        detail = r['output'] if r['status'] == 'OK' else r['message'].splitlines()[0]
+        print(f'{file_name:<40} {str(r["type"]):<15} {r["status"]:<7} {r["seconds"]:>8.2f}  {detail}')
+    n_ok = len([r for r in results if r['status'] == 'OK'])
+    print(f'\n{str(n_ok)} succeeded, {str(len(results) - n_ok)} failed, '
+          f'{sum(r["seconds"] for r in results):.2f} seconds of parsing in total.')
+
+
+if __name__ == '__main__':
+    main()
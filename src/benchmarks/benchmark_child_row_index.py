@@ -0,0 +1,59 @@
+"""
+It compares looking up the questions of every exercise by filtering the whole "Questions" sheet per exercise
+with looking them up in a ChildRowIndex built once for the sheet.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_child_row_index
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from utilities.case_study_parser_utilities import create_case_study_child_row_index
+
+
+def main():
+    args = parse_args()
+    print(f'{"sections":>10} {"questions":>10} {"scan (s)":>10} {"index (s)":>10} {"speedup":>10}')
+    for n_sections in args.sections:
+        exercise_ids, questions_df = create_synthetic_questions_sheet(n_sections, args.exercises, args.questions)
+        scan_seconds = time_lookups_by_scanning(exercise_ids, questions_df)
+        index_seconds = time_lookups_by_index(exercise_ids, questions_df)
+        print(f'{n_sections:>10} {len(questions_df):>10} {scan_seconds:>10.3f} {index_seconds:>10.3f} '
+              f'{scan_seconds / index_seconds:>9.1f}x')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the lookup of child rows in a case study sheet')
+    parser.add_argument('--sections', type=int, nargs='+', default=[10, 30, 60, 99],
+                        help='The numbers of sections to benchmark')
+    parser.add_argument('--exercises', type=int, default=9, help='The number of exercises per section')
+    parser.add_argument('--questions', type=int, default=20, help='The number of questions per exercise')
+    return parser.parse_args()
+
+
+def create_synthetic_questions_sheet(n_sections: int, n_exercises: int, n_questions: int):
+    exercise_ids = [f'{s}.{e}' for s in range(1, n_sections + 1) for e in range(1, n_exercises + 1)]
+    question_ids = [f'{exercise_id}.{q:02d}' for exercise_id in exercise_ids for q in range(1, n_questions + 1)]
+    questions_df = pd.DataFrame({'*Question ID': question_ids, '*Description': 'description'})
+    return exercise_ids, questions_df
+
+
+def time_lookups_by_scanning(exercise_ids, questions_df) -> float:
+    start = time.perf_counter()
+    for exercise_id in exercise_ids:
+        questions_df[questions_df['*Question ID'].str.contains(f'^{exercise_id}\\.', na=False)]
+    return time.perf_counter() - start
+
+
+def time_lookups_by_index(exercise_ids, questions_df) -> float:
+    start = time.perf_counter()
+    question_index = create_case_study_child_row_index(questions_df, 'Questions', 'Exercises')
+    for exercise_id in exercise_ids:
+        question_index.get_children(exercise_id)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
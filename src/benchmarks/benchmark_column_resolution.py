@@ -0,0 +1,49 @@
+"""
+It compares resolving the columns of the "Questions" sheet by their regexes for every exercise, as the question parser
+did before, with resolving them once by the sheet schema and looking them up by their logical names.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_column_resolution
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from utilities.case_study_sheet_schemas import get_case_study_sheet_schema
+from utilities.regex_utilities import get_a_matching_column_name_by_regex
+
+
+def main():
+    args = parse_args()
+    schema = get_case_study_sheet_schema('Questions')
+    df = pd.DataFrame(columns=['*Question ID', '*Description', 'Image URL', 'Option Header', 'Option A', 'Option B',
+                               'Option C', 'Option D', 'Answer', '*Feedback for Correct Answer',
+                               'Feedback for Incorrect Answer', 'Additional Learning Material ID', 'Tags'])
+    print(f'{"exercises":>10} {"regexes (s)":>12} {"schema (s)":>11} {"speedup":>8}')
+    for n_exercises in args.exercises:
+        start = time.perf_counter()
+        for _ in range(n_exercises):
+            scanned = [get_a_matching_column_name_by_regex(df, column.regex) for column in schema.columns.values()]
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columns = schema.resolve(df)
+        for _ in range(n_exercises):
+            resolved = [columns[name] for name in schema.columns]
+        schema_seconds = time.perf_counter() - start
+
+        assert resolved == scanned, 'The schema should resolve the same columns'
+        print(f'{n_exercises:>10} {scan_seconds:>12.3f} {schema_seconds:>11.3f} '
+              f'{scan_seconds / schema_seconds:>7.1f}x')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark resolving the columns of a sheet by its schema')
+    parser.add_argument('--exercises', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='The numbers of exercises whose questions are parsed')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+It compares reading a large "Questions" sheet of a case study with pandas.read_excel, as the parsers did before,
+with reading it through a WorkbookSession, which streams the rows of the read-only workbook and keeps only
+the columns the case study parser needs. The sheet has an instruction row and unused note columns with long texts,
+like the sheets edited by the authors.
+The peak memory of reading the sheet is traced with tracemalloc.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_excel_ingestion
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from openpyxl import Workbook
+
+from case_study_parser import get_case_study_sheet_column_regexes
+from utilities.workbook_session import WorkbookSession
+
+question_columns = ('*Question ID', '*Description', 'Image URL', 'Option Header', 'Option A', 'Option B', 'Option C',
+                    'Option D', 'Answer', '*Feedback for Correct Answer', 'Feedback for Incorrect Answer',
+                    'Additional Learning Material ID', 'Tags')
+
+
+def main():
+    args = parse_args()
+    print(f'{"rows":>8} {"columns":>8} {"kept":>5} {"file (MB)":>10} {"pandas (MB)":>12} {"pruned (MB)":>12} '
+          f'{"pandas (s)":>11} {"pruned (s)":>11}')
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            excel_file = os.path.join(temp_dir, 'case-study.xlsx')
+            write_synthetic_questions_workbook(excel_file, n_rows, args.note_columns)
+            file_mb = os.path.getsize(excel_file) / 1024 / 1024
+            pandas_seconds, pandas_mb, pandas_df = measure(read_with_pandas, excel_file)
+            pruned_seconds, pruned_mb, pruned_df = measure(read_with_workbook_session, excel_file)
+        assert pruned_df.equals(pandas_df[pruned_df.columns]), 'The pruned sheet should have the same values'
+        print(f'{n_rows:>8} {len(pandas_df.columns):>8} {len(pruned_df.columns):>5} {file_mb:>10.1f} '
+              f'{pandas_mb:>12.1f} {pruned_mb:>12.1f} {pandas_seconds:>11.2f} {pruned_seconds:>11.2f}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark reading a large case study sheet with pruned columns')
+    parser.add_argument('--rows', type=int, nargs='+', default=[5000, 20000], help='The numbers of questions')
+    parser.add_argument('--note-columns', type=int, default=10, help='The number of unused note columns')
+    return parser.parse_args()
+
+
+def write_synthetic_questions_workbook(excel_file, n_rows: int, n_note_columns: int):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Questions')
+    sheet.append(['Instructions: ' + 'fill in one question per row. ' * 40])
+    sheet.append(list(question_columns) + [f'Notes {str(i)}' for i in range(1, n_note_columns + 1)])
+    for i in range(n_rows):
+        exercise = f'{str(i // 90 % 99 + 1)}.{str(i // 10 % 9 + 1)}'
+        sheet.append([f'{exercise}.{str(i % 10 + 1).zfill(2)}', f'Question {str(i)} ' + 'x' * 200, None, None,
+                      'A) yes', 'B) no', 'C) maybe', None, 'A', 'Correct!', 'Try again.', None, 'tag1, tag2']
+                     + [f'Note {str(j)} of question {str(i)} ' + 'y' * 150 for j in range(n_note_columns)])
+    workbook.save(excel_file)
+
+
+def read_with_pandas(excel_file) -> pd.DataFrame:
+    return pd.read_excel(excel_file, sheet_name='Questions', header=1)
+
+
+def read_with_workbook_session(excel_file) -> pd.DataFrame:
+    with WorkbookSession(excel_file, {'Questions': 1}, column_regexes=get_case_study_sheet_column_regexes()) \
+            as workbook:
+        return workbook.get_sheet('Questions')
+
+
+def measure(read, excel_file):
+    start = time.perf_counter()
+    df = read(excel_file)
+    seconds = time.perf_counter() - start
+    # tracing slows the allocations down, so the memory is measured in another run
+    tracemalloc.start()
+    read(excel_file)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak_bytes / 1024 / 1024, df
+
+
+if __name__ == '__main__':
+    main()
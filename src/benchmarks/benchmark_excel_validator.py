@@ -0,0 +1,134 @@
+"""
+It compares the vectorized excel validators with their former row-by-row implementations on synthetic sheets.
+First, it checks that the levels of a column with an empty cell, which pandas reads as floats, match the level pattern.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_excel_validator
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from validators.excel_validator import check_column_values_match_a_regex_pattern, \
+    check_column_y_has_value_given_column_x_values, check_cell_string_exists_in_another_sheet_column
+from case_study_parser import check_answer_has_an_existing_option_and_value
+
+
+def main():
+    args = parse_args()
+    check_whole_numbers_of_a_column_with_an_empty_cell()
+    questions_df, materials_df = create_synthetic_sheets(args.rows)
+    print(f'Benchmark validators on {args.rows} synthetic rows...\n')
+    print(f'{"validator":<50} {"row-by-row (s)":>15} {"vectorized (s)":>15} {"speedup":>10}')
+    benchmarks = (
+        ('check_column_values_match_a_regex_pattern',
+         lambda: check_column_values_match_a_regex_pattern_by_row(
+             questions_df, 'Question ID', r'([1-9][0-9]|[1-9]|0[1-9])\.([1-9])\.(0[1-9]|[1-9][0-9])', False),
+         lambda: check_column_values_match_a_regex_pattern(
+             questions_df, 'Question ID', r'([1-9][0-9]|[1-9]|0[1-9])\.([1-9])\.(0[1-9]|[1-9][0-9])', False)),
+        ('check_column_y_has_value_given_column_x_values',
+         lambda: check_column_y_has_value_given_column_x_values_by_row(
+             questions_df, 'Answer', 'Feedback for Incorrect Answer', ('A', 'B', 'C', 'D')),
+         lambda: check_column_y_has_value_given_column_x_values(
+             questions_df, 'Answer', 'Feedback for Incorrect Answer', ('A', 'B', 'C', 'D'))),
+        ('check_answer_has_an_existing_option_and_value',
+         lambda: check_answer_has_an_existing_option_and_value_by_row(questions_df, 'Answer'),
+         lambda: check_answer_has_an_existing_option_and_value(questions_df, r'^answer')),
+        ('check_cell_string_exists_in_another_sheet_column',
+         lambda: check_cell_string_exists_in_another_sheet_column_by_row(
+             questions_df, ['Additional Learning Material ID'], ',', materials_df, 'Learning Material ID'),
+         lambda: check_cell_string_exists_in_another_sheet_column(
+             questions_df, ['Additional Learning Material ID'], ',', materials_df, 'Learning Material ID')),
+    )
+    for name, row_by_row, vectorized in benchmarks:
+        row_by_row_seconds = measure(row_by_row)
+        vectorized_seconds = measure(vectorized)
+        print(f'{name:<50} {row_by_row_seconds:>15.3f} {vectorized_seconds:>15.3f} '
+              f'{row_by_row_seconds / vectorized_seconds:>9.1f}x')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the excel validators on synthetic sheets')
+    parser.add_argument('--rows', type=int, default=50000, help='The number of rows in the synthetic sheet')
+    return parser.parse_args()
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def check_whole_numbers_of_a_column_with_an_empty_cell():
+    # an empty cell makes pandas read the levels as floats, e.g., 4.0, which should still match the pattern
+    levels_df = pd.DataFrame({'Level': [4, None, 2, 5]})
+    check_column_values_match_a_regex_pattern(levels_df, 'Level', r'^[1-5]$', True)
+    try:
+        check_column_values_match_a_regex_pattern(levels_df, 'Level', r'^[1-5]$', False)
+    except AssertionError as e:
+        assert e.rows == [1], f'Only the empty cell should be reported, not {e.rows}'
+    else:
+        raise AssertionError('The empty cell should be reported')
+    print('The whole numbers of a column with an empty cell match the level pattern', 'OK!\n')
+
+
+def create_synthetic_sheets(n_rows: int):
+    question_ids = [f'{s}.{e}.{q:02d}' for s in range(1, 100) for e in range(1, 10) for q in range(1, 100)][:n_rows]
+    material_ids = [f'{s}-mat-{m:02d}' for s in range(1, 100) for m in range(1, 100)]
+    answers = np.resize(np.array(['A', 'B', None], dtype=object), len(question_ids))
+    questions_df = pd.DataFrame({
+        'Question ID': question_ids,
+        'Option A': 'a',
+        'Option B': 'b',
+        'Answer': answers,
+        'Feedback for Incorrect Answer': np.where(pd.isnull(answers), None, 'feedback'),
+        'Additional Learning Material ID': np.resize(np.array(material_ids[:3] + [None], dtype=object),
+                                                     len(question_ids)),
+    })
+    materials_df = pd.DataFrame({'Learning Material ID': material_ids})
+    return questions_df, materials_df
+
+
+# The former row-by-row implementations, kept here as the baseline
+def check_column_values_match_a_regex_pattern_by_row(sheet_data_frame, column_name, regex_pattern,
+                                                     allow_empty_values):
+    for value in sheet_data_frame[column_name]:
+        if pd.isnull(value):
+            assert allow_empty_values
+        else:
+            assert re.match(regex_pattern, str(value))
+
+
+def check_column_y_has_value_given_column_x_values_by_row(current_sheet_df, column_x_name, column_y_name,
+                                                          given_x_values):
+    for index, row in current_sheet_df.iterrows():
+        if row[column_x_name] in given_x_values and pd.isnull(row[column_y_name]):
+            raise ValueError(index)
+        elif row[column_x_name] not in given_x_values and not pd.isnull(row[column_y_name]):
+            raise ValueError(index)
+
+
+def check_answer_has_an_existing_option_and_value_by_row(questions_sheet_df, answer_column_name):
+    for index, row in questions_sheet_df.iterrows():
+        if not pd.isnull(row[answer_column_name]):
+            pattern = re.compile(f'option {row[answer_column_name]}', re.IGNORECASE)
+            option_column_name = [col for col in questions_sheet_df.columns if re.search(pattern, col)][0]
+            if pd.isnull(row[option_column_name]):
+                raise AssertionError(index)
+
+
+def check_cell_string_exists_in_another_sheet_column_by_row(current_sheet, column_names, separator,
+                                                            referencing_sheet, referencing_column_name):
+    for column_name in column_names:
+        for cell_value in current_sheet[column_name]:
+            if pd.isnull(cell_value):
+                continue
+            for item in [item.strip() for item in cell_value.split(separator)]:
+                assert item in referencing_sheet[referencing_column_name].values
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+It measures the import time of each command line entry point in a fresh interpreter, and whether importing it
+also imports the Cloudant SDK. The Cloudant variables are removed from the environment,
+so an entry point creating a Cloudant client on import fails here unless a .env file provides them.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_import_time
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+
+def main():
+    args = parse_args()
+    print(f'{"entry point":<35} {"import (ms)":>12} {"--help (ms)":>12} {"imports ibmcloudant":>20}')
+    for module in args.modules:
+        import_ms, imports_sdk = measure_import(module, args.repeat)
+        help_ms = measure_help(module, args.repeat)
+        print(f'{module:<35} {import_ms:>12.1f} {help_ms:>12.1f} {str(imports_sdk):>20}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the import time of the command line entry points')
+    parser.add_argument('--modules', nargs='+', default=get_entry_points(), help='The modules to import')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of runs per module, the median is shown')
+    return parser.parse_args()
+
+
+def get_entry_points() -> list:
+    return ['learning_topic_parser', 'case_study_parser', 'survey_parser', 'batch_parser',
+            'learning_topic_uploader', 'case_study_uploader', 'survey_uploader', 'create_learning_content_database',
+            'migrate_self_assessment_statement_ids']
+
+
+def get_environment_without_credentials() -> dict:
+    env = {key: value for key, value in os.environ.items() if not key.startswith('CLOUDANT_')}
+    env['PYTHONPATH'] = os.getcwd()
+    return env
+
+
+def measure_import(module: str, repeat: int):
+    """
+    It returns the median cumulative import time of the module from "python -X importtime"
+    and whether the Cloudant SDK is in the imported modules.
+    """
+    import_times = []
+    imports_sdk = False
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                   capture_output=True, text=True, env=get_environment_without_credentials())
+        if completed.returncode != 0:
+            return float('nan'), 'import failed'
+        match = re.search(rf'^import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$', completed.stderr,
+                          re.MULTILINE)
+        import_times.append(int(match.group(1)) / 1000)
+        imports_sdk = re.search(r'\|\s*ibmcloudant$', completed.stderr, re.MULTILINE) is not None
+    return statistics.median(import_times), imports_sdk
+
+
+def measure_help(module: str, repeat: int) -> float:
+    """
+    It returns the median wall time in milliseconds of running the entry point with --help.
+    """
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, f'{module}.py', '--help'], capture_output=True,
+                                   env=get_environment_without_credentials())
+        if completed.returncode != 0:
+            return float('nan')
+        wall_times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(wall_times)
+
+
+if __name__ == '__main__':
+    main()
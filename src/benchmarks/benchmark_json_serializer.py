@@ -0,0 +1,110 @@
+"""
+It compares encoding the documents of a synthetic case study with jsonpickle, as the parsers did before,
+with streaming them to the output file with the json serializer, and checks both produce the same bytes.
+The models leave out their optional properties which are None, so jsonpickle encodes the dicts of the models.
+The time is measured first, then the peak memory in a second run traced with tracemalloc,
+so the memory only counts the allocations made by the encoding.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_json_serializer
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import jsonpickle
+
+from cloudant_models.case_study_section import CaseStudySection
+from cloudant_models.content_element import ContentElement
+from cloudant_models.documents import Documents
+from cloudant_models.exercise_v2 import ExerciseV2
+from cloudant_models.option import Option
+from cloudant_models.question_v2 import QuestionV2
+from cloudant_models.survey import Survey
+from cloudant_models.survey_question import SurveyQuestion
+from cloudant_models.survey_section import SurveySection
+from cloudant_models.option_without_annotation import OptionWithoutAnnotation
+from utilities.json_serializer import write_json_file, encode
+
+
+def main():
+    args = parse_args()
+    print(f'{"questions":>10} {"jsonpickle (s)":>15} {"stream (s)":>11} {"speedup":>8} '
+          f'{"jsonpickle (MB)":>16} {"stream (MB)":>12} {"identical":>10}')
+    for n_sections in args.sections:
+        docs = create_synthetic_case_study_documents(n_sections, args.exercises, args.questions)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonpickle_file = os.path.join(temp_dir, 'jsonpickle.json')
+            stream_file = os.path.join(temp_dir, 'stream.json')
+            jsonpickle_seconds, jsonpickle_mb = measure(write_with_jsonpickle, docs, jsonpickle_file)
+            stream_seconds, stream_mb = measure(write_json_file, docs, stream_file)
+            is_identical = read_bytes(jsonpickle_file) == read_bytes(stream_file)
+        n_questions = n_sections * args.exercises * args.questions
+        print(f'{n_questions:>10} {jsonpickle_seconds:>15.3f} {stream_seconds:>11.3f} '
+              f'{jsonpickle_seconds / stream_seconds:>7.1f}x {jsonpickle_mb:>16.1f} {stream_mb:>12.1f} '
+              f'{str(is_identical):>10}')
+    survey = create_synthetic_survey()
+    is_identical = jsonpickle.encode(survey.to_dict(), unpicklable=False) == encode(survey)
+    print(f'\nThe synthetic survey is encoded identically: {str(is_identical)}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the json serializer against jsonpickle')
+    parser.add_argument('--sections', type=int, nargs='+', default=[10, 50, 99],
+                        help='The numbers of sections to benchmark')
+    parser.add_argument('--exercises', type=int, default=9, help='The number of exercises per section')
+    parser.add_argument('--questions', type=int, default=20, help='The number of questions per exercise')
+    return parser.parse_args()
+
+
+def create_synthetic_case_study_documents(n_sections: int, n_exercises: int, n_questions: int) -> Documents:
+    docs = []
+    for s in range(1, n_sections + 1):
+        section_id = f'org-cs:section-{s:02d}'
+        content_elements = [ContentElement(section_id, f'{str(s)}-content-01', 'text', f'text {str(s)}', None, [])]
+        docs.append(CaseStudySection(section_id, 'org-cs:caseStudyConfig', str(s), f'Section {str(s)}',
+                                     'description', 'objectives', True, content_elements))
+        for e in range(1, n_exercises + 1):
+            questions = [QuestionV2(f'{str(s)}.{str(e)}.{str(q)}', 'Which one is correct? – "quoted"', None,
+                                    'Options', [Option('a', 'Option a'), Option('b', 'Option b')], ['a'],
+                                    'Correct!', 'Try again.', None, ['tag'])
+                         for q in range(1, n_questions + 1)]
+            docs.append(ExerciseV2(f'org-cs:{str(s)}.{str(e)}', f'Exercise {str(e)}', 'description', None, 2,
+                                   questions, section_id, f'{str(s)}.{str(e)}', None, None, None, []))
+    return Documents(docs)
+
+
+def create_synthetic_survey() -> Survey:
+    questions = [SurveyQuestion(str(q), 'single-choice', f'Question {str(q)}', None, 'header',
+                                [OptionWithoutAnnotation('1', 'Yes'), OptionWithoutAnnotation('2', 'No')], False)
+                 for q in range(1, 21)]
+    return Survey('org:survey', 'org', 'preAssessment', 'Survey', 'description',
+                  [SurveySection('1', 'Section', 'description', questions)], 1, 1)
+
+
+def write_with_jsonpickle(docs, file_path):
+    with open(file_path, 'w') as outfile:
+        outfile.write(jsonpickle.encode(docs.to_dict(), unpicklable=False))
+
+
+def measure(write, docs, file_path):
+    start = time.perf_counter()
+    write(docs, file_path)
+    seconds = time.perf_counter() - start
+    # tracing slows the allocations down, so the memory is measured in another run
+    tracemalloc.start()
+    write(docs, file_path)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak_bytes / 1024 / 1024
+
+
+def read_bytes(file_path) -> bytes:
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+
+if __name__ == '__main__':
+    main()
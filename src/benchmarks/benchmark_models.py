@@ -0,0 +1,109 @@
+"""
+It compares the slotted document models with the plain classes they were before, on a synthetic learning topic:
+- the memory of creating the exercises with their questions and options, traced with tracemalloc,
+- the time of creating them,
+- the time of encoding them, with jsonpickle for the plain classes and with the json serializer for the models.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_models
+"""
+import argparse
+import time
+import tracemalloc
+
+import jsonpickle
+import pandas as pd
+
+from cloudant_models.documents import Documents
+from cloudant_models.exercise import Exercise
+from cloudant_models.option import Option
+from cloudant_models.question import Question
+from utilities.json_serializer import encode
+
+
+class PlainOption:
+    def __init__(self, label: str, value: str):
+        self.label = label
+        self.value = value
+
+
+class PlainQuestion:
+    def __init__(self, description, image_url, option_header, options, answer, feedback_for_correct_answer,
+                 feedback_for_incorrect_answer, reference_id):
+        # the same conversions as the Question model
+        self.description = description
+        self.imageUrl = image_url if type(image_url) == str else None
+        self.optionHeader = 'Please select your answer:' if pd.isna(option_header) else option_header
+        self.options = options
+        self.answer = answer
+        self.feedbackForCorrectAnswer = None if pd.isna(feedback_for_correct_answer) else feedback_for_correct_answer
+        self.feedbackForIncorrectAnswer = None if pd.isna(feedback_for_incorrect_answer) else \
+            feedback_for_incorrect_answer
+        self.referenceId = reference_id
+
+
+class PlainExercise:
+    def __init__(self, _id, name, description, objectives, level, questions, learning_module_reference_id,
+                 topic_config_id):
+        self._id = _id
+        self.docType = 'exercise'
+        self.name = name
+        self.description = description
+        self.objectives = objectives
+        self.level = level
+        self.questions = questions
+        self.learningModuleReferenceId = learning_module_reference_id
+        self.topicConfigId = topic_config_id
+
+
+class PlainDocuments:
+    def __init__(self, docs):
+        self.docs = docs
+
+
+def main():
+    args = parse_args()
+    n_exercises = args.questions // args.questions_per_exercise
+    print(f'{"classes":<10} {"questions":>10} {"create (s)":>11} {"memory (MB)":>12} {"encode (s)":>11}')
+    for name, classes, encode_docs in (('plain', (PlainDocuments, PlainExercise, PlainQuestion, PlainOption),
+                                        lambda docs: jsonpickle.encode(docs, unpicklable=False)),
+                                       ('slotted', (Documents, Exercise, Question, Option), encode)):
+        tracemalloc.start()
+        create_synthetic_topic_documents(classes, n_exercises, args.questions_per_exercise)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # tracing slows the allocations down, so the time is measured in another run
+        start = time.perf_counter()
+        docs = create_synthetic_topic_documents(classes, n_exercises, args.questions_per_exercise)
+        create_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        encode_docs(docs)
+        encode_seconds = time.perf_counter() - start
+        print(f'{name:<10} {n_exercises * args.questions_per_exercise:>10} {create_seconds:>11.3f} '
+              f'{peak_bytes / 1024 / 1024:>12.1f} {encode_seconds:>11.3f}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the slotted document models against plain classes')
+    parser.add_argument('--questions', type=int, default=100000, help='The number of questions of the topic')
+    parser.add_argument('--questions-per-exercise', type=int, default=20,
+                        help='The number of questions per exercise')
+    return parser.parse_args()
+
+
+def create_synthetic_topic_documents(classes, n_exercises: int, n_questions: int):
+    documents_class, exercise_class, question_class, option_class = classes
+    docs = []
+    for e in range(1, n_exercises + 1):
+        questions = []
+        for q in range(1, n_questions + 1):
+            options = [option_class(label, f'Option {label}') for label in ('A', 'B', 'C', 'D')]
+            questions.append(question_class(f'Question {str(q)}', None, 'Please select your answer:', options,
+                                            options[0], 'Correct!', None, f'{str(e)}.{str(q)}'))
+        docs.append(exercise_class(f'org-topic:exercise-{str(e)}', f'Exercise {str(e)}', 'description', None, 1,
+                                   questions, f'module-{str(e % 10)}', 'org-topic:topicConfig'))
+    return documents_class(docs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+It generates synthetic learning topic, case study and survey workbooks at the given scales and times
+the validation, the parsing, the serialization and the upload of each, where the documents are uploaded
+to an in-memory storage backend. The stages are recorded with the profiler of the --profile option.
+
+The results of each run are appended to a json file, and compared with the previous run in the file,
+so a regression shows up as a slower stage than before. With --trace-memory, the peak memory of each stage
+is traced as well, and the run is compared with the previous run tracing the memory, as the tracing is slower.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_runner --scales 1 10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+from benchmarks.workbook_generators import create_case_study_workbook, create_learning_topic_workbook, \
+    create_survey_workbook
+from cloudant_db.in_memory_backend import InMemoryBackend
+from cloudant_db.utilities import set_storage_backend, write_documents_to_topic_db, put_a_document
+from utilities.json_serializer import write_json_file
+from utilities.json_stream import load_json_docs, load_json_doc
+from utilities.profiler import start_profiling, stop_profiling, profile_stage
+
+benchmark_db_name = 'benchmark-db'
+stage_names = ('validate', 'parse', 'serialize', 'upload')
+
+
+def main():
+    args = parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scale in args.scales:
+            for workbook_type in args.types:
+                print(f'Benchmark {workbook_type} at scale {str(scale)}...')
+                results.extend(run_benchmark(workbook_type, scale, temp_dir, args.trace_memory))
+    run = {
+        'startedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': get_git_commit(),
+        'python': platform.python_version(),
+        'isMemoryTraced': args.trace_memory,
+        'results': results
+    }
+    previous_runs = load_runs(args.results_file)
+    # tracing the memory slows the stages down, so a run is compared with the previous run of the same setting
+    comparable_runs = [r for r in previous_runs if r.get('isMemoryTraced', False) == args.trace_memory]
+    print_results(run, comparable_runs[-1] if len(comparable_runs) > 0 else None)
+    if not args.no_save:
+        save_runs(args.results_file, previous_runs + [run])
+        print(f'\nThe results are appended to {args.results_file}.')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the parsers and the uploaders on synthetic workbooks')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10],
+                        help='The scales of the workbooks from 1 to 19, see get_workbook_size for the sizes')
+    parser.add_argument('--types', nargs='+', default=['learning-topic', 'case-study', 'survey'],
+                        choices=('learning-topic', 'case-study', 'survey'), help='The types of workbooks')
+    parser.add_argument('--results-file', metavar='results_file', default='output/benchmark-results.json',
+                        help='The json file the results of the runs are appended to')
+    parser.add_argument('--no-save', action='store_true', help='Compare with the previous run without saving')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Trace the peak memory of each stage, which makes the stages slower')
+    return parser.parse_args()
+
+
+def get_workbook_size(workbook_type: str, scale: int) -> dict:
+    """
+    It returns the sizes of the workbook at the scale, where most of the growth is in the questions,
+    e.g., a case study at scale 4 has 20 sections with 4 exercises of 5 questions, 400 questions in total.
+    """
+    if workbook_type == 'case-study':
+        return {'sections': 5 * scale, 'exercises': 4, 'questions': 5, 'materials': 2}
+    if workbook_type == 'learning-topic':
+        return {'sections': 3, 'exercises': 9, 'questions': min(99, 5 * scale), 'materials': 3}
+    return {'sections': 5 * scale, 'questions': 10}
+
+
+def run_benchmark(workbook_type: str, scale: int, temp_dir, trace_memory: bool = False) -> list:
+    size = get_workbook_size(workbook_type, scale)
+    excel_file = os.path.join(temp_dir, f'{workbook_type}-{str(scale)}.xlsx')
+    json_file = os.path.join(temp_dir, f'{workbook_type}-{str(scale)}.json')
+    if workbook_type == 'case-study':
+        create_case_study_workbook(excel_file, size['sections'], size['exercises'], size['questions'],
+                                   size['materials'])
+    elif workbook_type == 'learning-topic':
+        create_learning_topic_workbook(excel_file, size['sections'], size['exercises'], size['questions'],
+                                       size['materials'])
+    else:
+        create_survey_workbook(excel_file, size['sections'], size['questions'])
+    backend = InMemoryBackend()
+    backend.create_database(benchmark_db_name)
+    set_storage_backend(backend)
+    profiler = start_profiling(trace_memory)
+    try:
+        # the parsers print their progress, which is not part of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_stages(workbook_type, excel_file, json_file)
+    finally:
+        stop_profiling()
+        set_storage_backend(None)
+    return [dict(stage, workbookType=workbook_type, scale=scale, size=size)
+            for stage in profiler.stages if stage['name'] in stage_names]
+
+
+def run_stages(workbook_type: str, excel_file, json_file):
+    args = argparse.Namespace(excel_file=[excel_file], collect_all=False, report_file=None, no_cache=True,
+                              ndjson=False)
+    if workbook_type == 'case-study':
+        from case_study_parser import create_case_study_workbook_session, validate_case_study_excel_file, \
+            parse_excel_to_case_study_documents
+        with create_case_study_workbook_session(excel_file) as workbook:
+            with profile_stage('validate'):
+                validate_case_study_excel_file(workbook)
+            with profile_stage('parse'):
+                docs = parse_excel_to_case_study_documents(workbook)
+    elif workbook_type == 'learning-topic':
+        from learning_topic_parser import create_topic_workbook_session, validate_topic_excel_file, \
+            parse_excel_to_documents
+        with create_topic_workbook_session(excel_file) as workbook:
+            with profile_stage('validate'):
+                validate_topic_excel_file(workbook)
+            with profile_stage('parse'):
+                docs = parse_excel_to_documents(workbook)
+    else:
+        from survey_parser import validate_survey_excel_file, parse_excel_to_survey
+        with profile_stage('validate'):
+            validate_survey_excel_file(args)
+        with profile_stage('parse'):
+            docs = parse_excel_to_survey(args)
+    with profile_stage('serialize'):
+        write_json_file(docs, json_file)
+    with profile_stage('upload'):
+        if workbook_type == 'survey':
+            put_a_document(benchmark_db_name, load_json_doc(json_file))
+        else:
+            result = write_documents_to_topic_db(benchmark_db_name, load_json_docs(json_file))
+            assert len(result.error_results) == 0, f'The upload has failed: {result.error_results[:3]}'
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_runs(results_file) -> list:
+    if not os.path.isfile(results_file):
+        return []
+    with open(results_file, 'r') as file:
+        return json.loads(file.read())
+
+
+def save_runs(results_file, runs: list):
+    os.makedirs(os.path.dirname(results_file) or '.', exist_ok=True)
+    with open(results_file, 'w') as outfile:
+        outfile.write(json.dumps(runs, indent=2))
+
+
+def get_result_key(result: dict) -> tuple:
+    return result['workbookType'], json.dumps(result['size'], sort_keys=True), result['name']
+
+
+def print_results(run: dict, previous_run: dict = None):
+    """
+    It prints the stages of the run, with the change of the time from the previous run if it has the same stage.
+    """
+    previous_seconds = {} if previous_run is None else \
+        {get_result_key(r): r['seconds'] for r in previous_run['results']}
+    print('\n******************** Benchmark results ********************')
+    if previous_run is not None:
+        print(f'Compared with the run at {previous_run["startedAt"]} (commit {previous_run["commit"]})')
+    print(f'{"workbook":<16} {"scale":>5} {"stage":<10} {"seconds":>9} {"previous":>9} {"change":>8} '
+          f'{"excel reads":>12} {"rows":>7} {"peak memory (MB)":>17}')
+    for r in run['results']:
+        previous = previous_seconds.get(get_result_key(r))
+        previous_text = '-' if previous is None else f'{previous:.3f}'
+        change_text = '-' if previous is None or previous == 0 else f'{(r["seconds"] / previous - 1) * 100:+.0f}%'
+        peak_memory = '-' if r['peakMemoryMb'] is None else f'{r["peakMemoryMb"]:.1f}'
+        print(f'{r["workbookType"]:<16} {r["scale"]:>5} {r["name"]:<10} {r["seconds"]:>9.3f} {previous_text:>9} '
+              f'{change_text:>8} {r["excelReads"]:>12} {r["rows"]:>7} {peak_memory:>17}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+It compares merging the parsed self-assessment statements (SAS) into the existing ones by scanning the SAS lists
+for every SAS, as the topic uploader did before, with the keyed merge plan indexing both of them by scopeRefId.
+Half of the existing SAS are updated, a quarter are deactivated and a quarter of the parsed SAS are created.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_sas_merge
+"""
+import argparse
+import copy
+import time
+
+from cloudant_db.sas_merge import create_sas_merge_plan
+
+
+def main():
+    args = parse_args()
+    print(f'{"SAS":>8} {"scan (s)":>10} {"keyed (s)":>10} {"speedup":>10}')
+    for n_sas in args.sas:
+        parsed_sas_docs, existing_sas_docs = create_synthetic_sas_docs(n_sas)
+        start = time.perf_counter()
+        merge_sas_docs_by_scanning(copy.deepcopy(parsed_sas_docs), copy.deepcopy(existing_sas_docs))
+        scan_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        create_sas_merge_plan(parsed_sas_docs, existing_sas_docs, 0)
+        keyed_seconds = time.perf_counter() - start
+        print(f'{n_sas:>8} {scan_seconds:>10.3f} {keyed_seconds:>10.3f} {scan_seconds / keyed_seconds:>9.1f}x')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark merging the parsed SAS into the existing SAS')
+    parser.add_argument('--sas', type=int, nargs='+', default=[100, 1000, 5000, 10000],
+                        help='The numbers of existing SAS')
+    return parser.parse_args()
+
+
+def create_sas_doc(doc_id: str, scope_ref_id: str, description: str, created_at: int) -> dict:
+    return {'_id': doc_id, 'docType': 'selfAssessmentStatement', 'description': description, 'scope': 'exercise',
+            'scopeRefId': scope_ref_id, 'scopeName': 'Exercise', 'createdAt': created_at, 'updatedAt': None,
+            'isActive': True}
+
+
+def create_synthetic_sas_docs(n_sas: int):
+    existing_sas_docs = [dict(create_sas_doc(f'bench:sas-{i}', f'bench:{i}', 'I can do it', 1), _rev='1-a')
+                         for i in range(n_sas)]
+    # the last quarter of the existing scopes is not parsed again, and a quarter of new scopes is parsed
+    parsed_sas_docs = [create_sas_doc(f'bench:sas-new-{i}', f'bench:{i}', 'I can do it better', 2)
+                       for i in range(n_sas // 4, n_sas * 5 // 4) if i < n_sas * 3 // 4 or i >= n_sas]
+    return parsed_sas_docs, existing_sas_docs
+
+
+def merge_sas_docs_by_scanning(parsed_sas_docs: list, existing_sas_docs: list) -> list:
+    sas_docs = []
+    for existing_doc in existing_sas_docs:
+        found_parsed_doc = next((d for d in parsed_sas_docs if d['scopeRefId'] == existing_doc['scopeRefId']), None)
+        if found_parsed_doc is not None:
+            found_parsed_doc['_id'] = existing_doc['_id']
+            found_parsed_doc['_rev'] = existing_doc['_rev']
+            sas_docs.append(found_parsed_doc)
+        else:
+            existing_doc['isActive'] = False
+            sas_docs.append(existing_doc)
+    for parsed_sas_doc in parsed_sas_docs:
+        if next((d for d in sas_docs if d['scopeRefId'] == parsed_sas_doc['scopeRefId']), None) is None:
+            sas_docs.append(parsed_sas_doc)
+    return sas_docs
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+It compares assigning the self-assessment (SA) questions to the survey sections of the scope "topic" by scanning
+the topics and the SA questions for every section, as the survey parser did before, with the indexes of the
+metadata snapshot, from 100 to 2000 topics with 20 self-assessment statements (SAS) each and a section per topic.
+
+Then, it counts the requests to an in-memory database when the snapshot is read cold, and when it is cached in memory
+and on disk, in which case only the update_seq of the database is requested.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_survey_metadata
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from cloudant_db.in_memory_backend import InMemoryBackend
+from cloudant_db.metadata_snapshot import MetadataSnapshot, MetadataSnapshotCache, clear_snapshots_in_memory
+from cloudant_db.utilities import set_storage_backend, write_documents_to_topic_db
+
+benchmark_db_name = 'benchmark-db'
+
+
+def main():
+    args = parse_args()
+    print(f'{"topics":>8} {"SAS":>8} {"scan (s)":>10} {"index (s)":>10} {"speedup":>10}')
+    for n_topics in args.topics:
+        sas_docs, topic_configs = create_synthetic_metadata(n_topics, args.sas_per_topic)
+        topic_names = [f'topic {str(t)}' for t in range(n_topics)]
+        start = time.perf_counter()
+        scanned = assign_sas_to_topics_by_scanning(sas_docs, topic_configs, topic_names)
+        scan_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed = assign_sas_to_topics_by_index(MetadataSnapshot(benchmark_db_name, '0', sas_docs, topic_configs),
+                                                topic_names)
+        index_seconds = time.perf_counter() - start
+        assert indexed == scanned, 'The indexes should assign the same SAS'
+        print(f'{n_topics:>8} {len(sas_docs):>8} {scan_seconds:>10.3f} {index_seconds:>10.3f} '
+              f'{scan_seconds / index_seconds:>9.1f}x')
+
+    print(f'\n{"snapshot":>10} {"requests":>10} {"seconds":>10}')
+    backend = InMemoryBackend()
+    backend.create_database(benchmark_db_name)
+    set_storage_backend(backend)
+    sas_docs, topic_configs = create_synthetic_metadata(max(args.topics), args.sas_per_topic)
+    write_documents_to_topic_db(benchmark_db_name, sas_docs + topic_configs)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = MetadataSnapshotCache(os.path.join(temp_dir, 'metadata-cache'))
+        for label in ('cold', 'in memory', 'on disk'):
+            if label == 'on disk':
+                clear_snapshots_in_memory()
+            backend.request_counts.clear()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                cache.get_snapshot(benchmark_db_name)
+            seconds = time.perf_counter() - start
+            print(f'{label:>10} {sum(backend.request_counts.values()):>10} {seconds:>10.3f}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the lookups of the SAS and the topics of survey sections')
+    parser.add_argument('--topics', type=int, nargs='+', default=[100, 500, 1000, 2000],
+                        help='The numbers of topics, each having a survey section')
+    parser.add_argument('--sas-per-topic', type=int, default=20, help='The number of SAS of each topic')
+    return parser.parse_args()
+
+
+def create_synthetic_metadata(n_topics: int, n_sas_per_topic: int):
+    sas_docs = []
+    topic_configs = []
+    for t in range(n_topics):
+        partition_key = f'bench-topic{str(t)}'
+        topic_configs.append({'_id': f'{partition_key}:topicConfig', 'docType': 'topicConfig',
+                              'name': f'Topic {str(t)}'})
+        for e in range(n_sas_per_topic):
+            sas_docs.append({'_id': f'{partition_key}:sas_exercise_{partition_key}:1.{str(e)}',
+                             'docType': 'selfAssessmentStatement', 'description': 'I can do it',
+                             'scope': 'exercise', 'scopeRefId': f'{partition_key}:1.{str(e)}', 'isActive': True})
+    return sas_docs, topic_configs
+
+
+def assign_sas_to_topics_by_scanning(sas_docs: list, topic_configs: list, topic_names: list) -> list:
+    assigned = []
+    for topic_name in topic_names:
+        topic_config_id = next((item['_id'] for item in topic_configs
+                                if item['name'].lower().strip() == topic_name.lower().strip()), None)
+        partition_key = topic_config_id.split(':')[0]
+        assigned.append([doc['_id'] for doc in sas_docs if doc['_id'].split(':')[0] == partition_key])
+    return assigned
+
+
+def assign_sas_to_topics_by_index(snapshot: MetadataSnapshot, topic_names: list) -> list:
+    assigned = []
+    for topic_name in topic_names:
+        partition_key = snapshot.get_topic_config_id_by_name(topic_name).split(':')[0]
+        assigned.append([doc['_id'] for doc in snapshot.get_sas_docs_by_partition_key(partition_key, 'exercise')])
+    return assigned
+
+
+if __name__ == '__main__':
+    main()
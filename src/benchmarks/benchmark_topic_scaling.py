@@ -0,0 +1,107 @@
+"""
+It shows how the learning topic parsing scales with the number of questions.
+
+First, it compares adding the questions to their exercises by scanning all the exercises for every question,
+as the association parser did before, with adding them through the index of the exercises by reference id,
+from 1k to 10k questions with 10 questions per exercise.
+
+Then, it parses synthetic learning topic workbooks of 9 learning modules with 9 exercises each, from 12 to 99
+questions per exercise, i.e., up to 8019 questions which is the most the reference ids of a topic allow.
+The workbook is read once, so the time per question should stay about the same as the questions grow.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_topic_scaling
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.workbook_generators import create_learning_topic_workbook
+from intermediate_models.meta_exercise import MetaExercise
+from intermediate_models.meta_question import MetaQuestion
+from learning_topic_parser import create_topic_workbook_session, parse_excel_to_documents
+from parsers.associations_parser import add_questions_to_exercises
+from parsers.meta_questions_parser import get_reference_id_from_question_id
+from utilities.profiler import start_profiling, stop_profiling
+
+
+def main():
+    args = parse_args()
+    print(f'{"questions":>10} {"exercises":>10} {"scan (s)":>10} {"index (s)":>10} {"speedup":>10}')
+    for n_questions in args.questions:
+        scan_seconds, index_seconds, n_exercises = time_associations(n_questions)
+        print(f'{n_questions:>10} {n_exercises:>10} {scan_seconds:>10.3f} {index_seconds:>10.3f} '
+              f'{scan_seconds / index_seconds:>9.1f}x')
+
+    print(f'\n{"questions":>10} {"excel reads":>12} {"parse (s)":>10} {"per question (ms)":>18}')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_questions_per_exercise in args.questions_per_exercise:
+            excel_file = os.path.join(temp_dir, f'topic-{str(n_questions_per_exercise)}.xlsx')
+            create_learning_topic_workbook(excel_file, 9, 9, n_questions_per_exercise, 3)
+            seconds, n_excel_reads = time_parsing(excel_file)
+            n_questions = 81 * n_questions_per_exercise
+            print(f'{n_questions:>10} {n_excel_reads:>12} {seconds:>10.3f} {seconds / n_questions * 1000:>18.3f}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the learning topic parsing as the questions grow')
+    parser.add_argument('--questions', type=int, nargs='+', default=[1000, 2000, 5000, 10000],
+                        help='The numbers of questions added to their exercises')
+    parser.add_argument('--questions-per-exercise', type=int, nargs='+', default=[12, 25, 50, 99],
+                        help='The numbers of questions per exercise of the parsed workbooks, 1-99')
+    return parser.parse_args()
+
+
+def create_synthetic_associations(n_questions: int, n_questions_per_exercise: int = 10):
+    exercise_ref_ids = [f'{str(m)}.{str(e)}' for m in range(1, n_questions // n_questions_per_exercise // 9 + 2)
+                        for e in range(1, 10)][:n_questions // n_questions_per_exercise]
+    # the reference ids of the exercises are read as numbers from excel
+    exercises = [MetaExercise(float(ref_id), SimpleNamespace(questions=[])) for ref_id in exercise_ref_ids]
+    questions = [MetaQuestion(f'{ref_id}.{str(q).zfill(2)}', f'{ref_id}.{str(q).zfill(2)}')
+                 for ref_id in exercise_ref_ids for q in range(1, n_questions_per_exercise + 1)]
+    return questions, exercises
+
+
+def add_questions_to_exercises_by_scanning(questions, exercises):
+    for q in questions:
+        exercise_ref_id = get_reference_id_from_question_id(q.reference_id)
+        for e in exercises:
+            if exercise_ref_id == str(e.referenceId):
+                e.exercise.questions.append(q.question)
+
+
+def time_associations(n_questions: int):
+    questions, exercises = create_synthetic_associations(n_questions)
+    start = time.perf_counter()
+    add_questions_to_exercises_by_scanning(questions, exercises)
+    scan_seconds = time.perf_counter() - start
+    scanned = [e.exercise.questions for e in exercises]
+
+    questions, exercises = create_synthetic_associations(n_questions)
+    start = time.perf_counter()
+    add_questions_to_exercises(questions, exercises)
+    index_seconds = time.perf_counter() - start
+    assert [e.exercise.questions for e in exercises] == scanned, 'The index should add the same questions'
+    return scan_seconds, index_seconds, len(exercises)
+
+
+def time_parsing(excel_file):
+    profiler = start_profiling()
+    try:
+        start = time.perf_counter()
+        # the parsers print their progress, which is not part of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            with create_topic_workbook_session(excel_file) as workbook:
+                parse_excel_to_documents(workbook)
+        seconds = time.perf_counter() - start
+    finally:
+        stop_profiling()
+    return seconds, profiler.n_excel_reads
+
+
+if __name__ == '__main__':
+    main()
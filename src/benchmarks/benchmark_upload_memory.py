@@ -0,0 +1,87 @@
+"""
+It compares the peak memory of uploading a large parsed json file when the file is loaded with json.loads,
+as the uploaders did before, with reading the docs from the file one at a time while they are written in batches.
+The documents are written to a storage backend which only answers the bulk requests, so only the memory of
+the uploader is traced.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_upload_memory
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from cloudant_db.storage_backend import StorageBackend
+from cloudant_db.utilities import set_storage_backend, write_documents_to_topic_db
+from utilities.json_stream import load_json_docs
+
+
+class AnsweringBackend(StorageBackend):
+    def bulk_docs(self, db_name: str, docs: list) -> list:
+        return [{'id': doc['_id'], 'rev': '1-0', 'ok': True} for doc in docs]
+
+
+def main():
+    args = parse_args()
+    set_storage_backend(AnsweringBackend())
+    print(f'{"docs":>8} {"file (MB)":>10} {"loaded (MB)":>12} {"streamed (MB)":>14} {"loaded (s)":>11} '
+          f'{"streamed (s)":>13}')
+    for n_docs in args.docs:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_file = os.path.join(temp_dir, 'docs.json')
+            write_synthetic_docs_file(json_file, n_docs)
+            file_mb = os.path.getsize(json_file) / 1024 / 1024
+            loaded_seconds, loaded_mb = measure(upload_loaded_file, json_file)
+            streamed_seconds, streamed_mb = measure(upload_streamed_file, json_file)
+        print(f'{n_docs:>8} {file_mb:>10.1f} {loaded_mb:>12.1f} {streamed_mb:>14.1f} {loaded_seconds:>11.2f} '
+              f'{streamed_seconds:>13.2f}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the memory of uploading a large parsed json file')
+    parser.add_argument('--docs', type=int, nargs='+', default=[10000, 100000],
+                        help='The numbers of documents in the file')
+    return parser.parse_args()
+
+
+def write_synthetic_docs_file(file_path, n_docs: int):
+    with open(file_path, 'w') as file:
+        file.write('{"docs": [')
+        for i in range(n_docs):
+            if i > 0:
+                file.write(', ')
+            file.write(json.dumps({'_id': f'org-topic:material-{i:07d}', 'docType': 'learningMaterial',
+                                   'name': f'Material {str(i)}', 'description': 'x' * 400}))
+        file.write(']}')
+
+
+def upload_loaded_file(json_file):
+    with open(json_file, 'r') as file:
+        docs_dict = json.loads(file.read())
+    write_documents_to_topic_db('benchmark-db', docs_dict)
+
+
+def upload_streamed_file(json_file):
+    docs_dict = load_json_docs(json_file)
+    # the uploaders count the docs first, which checks the whole file before writing
+    len(docs_dict['docs'])
+    write_documents_to_topic_db('benchmark-db', docs_dict)
+
+
+def measure(upload, json_file):
+    start = time.perf_counter()
+    upload(json_file)
+    seconds = time.perf_counter() - start
+    # tracing slows the allocations down, so the memory is measured in another run
+    tracemalloc.start()
+    upload(json_file)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak_bytes / 1024 / 1024
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+It load-tests the upload flows of the case study uploader and the learning topic uploader against an in-memory
+storage backend, so no Cloudant service is needed. The database is seeded with other partitions and
+the documents of the uploaded partition, then each flow is timed and its requests are counted:
+- case study: replacing all the documents of the partition vs. syncing only the changed documents,
+- learning topic: replacing the non-SAS documents vs. syncing them, followed by creating or updating the SAS,
+- survey: creating a new version of a survey, which deactivates the active versions in the partition.
+
+Run it from the src folder:
+python -m benchmarks.benchmark_uploaders
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import os
+import time
+
+from cloudant_db.in_memory_backend import InMemoryBackend
+from cloudant_db.utilities import set_storage_backend
+
+db_name = 'benchmark-db'
+os.environ['DATABASE_NAME'] = db_name
+
+
+def main():
+    args = parse_args()
+    # the uploaders ask for a confirmation before writing
+    builtins.input = lambda prompt='': 'YES'
+    print(f'{"flow":<28} {"docs":>8} {"changed":>8} {"seconds":>9} {"requests":>9}  requests by type')
+    for n_docs in args.docs:
+        for flow_name, flow in get_flows().items():
+            backend = create_seeded_backend(args.other_docs, n_docs)
+            parsed_docs = create_changed_docs(n_docs, args.changed)
+            backend.request_counts.clear()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                flow(parsed_docs)
+            seconds = time.perf_counter() - start
+            counts = ', '.join(f'{key}={str(value)}' for key, value in sorted(backend.request_counts.items()))
+            print(f'{flow_name:<28} {n_docs:>8} {args.changed:>8} {seconds:>9.3f} '
+                  f'{sum(backend.request_counts.values()):>9}  {counts}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the upload flows against an in-memory storage backend')
+    parser.add_argument('--docs', type=int, nargs='+', default=[1000, 10000],
+                        help='The numbers of documents in the uploaded partition')
+    parser.add_argument('--other-docs', type=int, default=100000,
+                        help='The number of documents of other partitions in the database')
+    parser.add_argument('--changed', type=int, default=10, help='The number of documents changed by the upload')
+    return parser.parse_args()
+
+
+def get_flows() -> dict:
+    from cloudant_db.utilities import iterate_docs_by_partition_key
+    import case_study_uploader
+    import learning_topic_uploader
+    import survey_uploader
+
+    return {
+        'case study replace': lambda docs: case_study_uploader.replace_all_existing_case_study_documents(
+            db_name, {'docs': docs}, 'bench'),
+        'case study sync': lambda docs: case_study_uploader.sync_case_study_documents(
+            db_name, {'docs': docs}, 'bench', False),
+        'topic replace + SAS': lambda docs: (
+            learning_topic_uploader.replace_existing_non_sas_documents_of_same_partition_key('bench', {'docs': docs}),
+            learning_topic_uploader.create_or_update_sas_documents_of_same_partition_key('bench', {'docs': docs})),
+        'topic sync + SAS': lambda docs: (
+            learning_topic_uploader.sync_non_sas_documents_of_same_partition_key('bench', {'docs': docs}, False),
+            learning_topic_uploader.create_or_update_sas_documents_of_same_partition_key('bench', {'docs': docs})),
+        'survey create version': lambda docs: survey_uploader.handle_user_input(
+            'create', {'_id': 'survey:new', 'isActive': True, 'createdAt': 1},
+            *survey_uploader.analyze_existing_survey_documents(
+                iterate_docs_by_partition_key(db_name, 'survey', True), 'survey:new')),
+    }
+
+
+def create_doc(partition_key: str, i: int) -> dict:
+    # every tenth document is a SAS, which the topic uploader keeps and updates by scopeRefId
+    if i % 10 == 0:
+        return {'_id': f'{partition_key}:sas-{i:07d}', 'docType': 'selfAssessmentStatement', 'scope': 'topic',
+                'scopeRefId': f'{partition_key}-{str(i)}', 'isActive': True, 'createdAt': 1, 'updatedAt': 1,
+                'description': f'statement {str(i)}'}
+    return {'_id': f'{partition_key}:doc-{i:07d}', 'docType': 'learningMaterial', 'name': f'material {str(i)}',
+            'description': 'x' * 200, 'createdAt': 1, 'updatedAt': 1}
+
+
+def create_seeded_backend(n_other_docs: int, n_docs: int) -> InMemoryBackend:
+    backend = InMemoryBackend()
+    backend.create_database(db_name)
+    docs = [create_doc(f'other{str(i % 100)}', i) for i in range(n_other_docs)]
+    docs.extend(create_doc('bench', i) for i in range(n_docs))
+    # the versions of a survey share the partition key, and the older versions are inactive
+    docs.extend({'_id': f'survey:{i:07d}', 'isActive': i % 2 == 0, 'createdAt': 1} for i in range(n_docs // 10))
+    backend.bulk_docs(db_name, docs)
+    set_storage_backend(backend)
+    return backend
+
+
+def create_changed_docs(n_docs: int, n_changed: int) -> list:
+    """
+    It returns the documents of the uploaded partition as parsed from a workbook, i.e., without _rev,
+    where the first documents are changed.
+    """
+    docs = [create_doc('bench', i) for i in range(n_docs)]
+    for doc in docs[:n_changed]:
+        doc['description'] = 'changed'
+    return docs
+
+
+if __name__ == '__main__':
+    main()
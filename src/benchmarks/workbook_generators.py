@@ -0,0 +1,211 @@
+"""
+It writes valid synthetic learning topic, case study and survey workbooks of a configurable size,
+with the sheets, the header rows and the columns the parsers expect, for the benchmarks.
+
+Run it from the src folder, e.g.:
+python -m benchmarks.workbook_generators case-study output/synthetic-case-study.xlsx --sections 20
+"""
+import argparse
+
+from openpyxl import Workbook
+
+from survey_parser import get_expected_column_names_and_row_number
+
+topic_question_reference_id_column = '*Reference ID (<Exercise Ref. ID>.<order in the exercise, 01-99>)'
+topic_exercise_reference_id_column = '*Reference ID (<Learning Module Ref. ID>.<order in the module, 1-9>)'
+topic_module_reference_id_column = '*Reference ID (1-9 if less than 10 modules, otherwise 01-xx, ' \
+                                   'for ordering the modules and for referencing in the subsequent sheets)'
+topic_material_reference_id_column = '*Reference ID (<Learning Module Ref. ID>-mat-<order in the module, 1-9>)'
+topic_tags_column = 'Tags (optional, nouns separated by comma, attributes that do not exist in the columns ' \
+                    'of this sheet, for future query purposes)'
+
+
+def main():
+    args = parse_args()
+    if args.workbook_type == 'case-study':
+        create_case_study_workbook(args.excel_file, args.sections, args.exercises, args.questions, args.materials)
+    elif args.workbook_type == 'learning-topic':
+        create_learning_topic_workbook(args.excel_file, args.sections, args.exercises, args.questions, args.materials)
+    else:
+        create_survey_workbook(args.excel_file, args.sections, args.questions)
+    print(f'The synthetic {args.workbook_type} workbook is stored at {args.excel_file}.')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Write a valid synthetic workbook for the benchmarks')
+    parser.add_argument('workbook_type', choices=('case-study', 'learning-topic', 'survey'))
+    parser.add_argument('excel_file', help='The excel file to write')
+    parser.add_argument('--sections', type=int, default=5,
+                        help='The number of sections, or learning modules of a learning topic')
+    parser.add_argument('--exercises', type=int, default=4, help='The number of exercises per section or module')
+    parser.add_argument('--questions', type=int, default=5,
+                        help='The number of questions per exercise, or per section of a survey')
+    parser.add_argument('--materials', type=int, default=2,
+                        help='The number of learning materials per section or module')
+    return parser.parse_args()
+
+
+def write_sheet(workbook, sheet_name: str, column_names, rows, instruction: str = None):
+    """
+    It appends a sheet with the column names as the header row, after an instruction row if one is given,
+    like the sheets whose first row explains how to fill them in.
+    """
+    sheet = workbook.create_sheet(sheet_name)
+    if instruction is not None:
+        sheet.append([instruction])
+    sheet.append(list(column_names))
+    for row in rows:
+        sheet.append(list(row))
+
+
+def create_case_study_workbook(excel_file, n_sections: int, n_exercises: int, n_questions: int, n_materials: int):
+    """
+    It writes a case study with the sections, each having a text, a video and a list of materials as its content,
+    the exercises of each section and the questions of each exercise. The exercises and the questions refer to
+    the learning materials of their section.
+    """
+    assert 1 <= n_sections <= 99 and 1 <= n_exercises <= 9 and 1 <= n_questions <= 99 and 1 <= n_materials <= 99, \
+        'A case study has 1-99 sections, 1-9 exercises per section, 1-99 questions per exercise ' \
+        'and 1-99 learning materials per section.'
+    workbook = Workbook(write_only=True)
+    write_sheet(workbook, 'Case Study',
+                ('*Organization Name', '*Org ID', '*Case Study ID', '*Name', '*Description', 'Objectives', 'Tags'),
+                [('Synthetic Organization', 'synthetic', 'case-study', 'Synthetic Case Study',
+                  'A synthetic case study for the benchmarks', 'Benchmark the parsers', 'synthetic, benchmark'),
+                 ('The row above is the case study.',)])
+    sections = []
+    contents = []
+    exercises = []
+    questions = []
+    materials = []
+    instruction = 'Fill in one row per item, the columns starting with * are required.'
+    for s in range(1, n_sections + 1):
+        sections.append((f'Section {str(s)}', s))
+        material_ids = [f'{str(s)}-mat-{str(m).zfill(2)}' for m in range(1, n_materials + 1)]
+        for m, material_id in enumerate(material_ids, start=1):
+            materials.append((f'Material {material_id}', f'The learning material {str(m)} of section {str(s)}',
+                              f'https://example.com/materials/{material_id}', ('pdf', 'html', 'video')[m % 3],
+                              m % 5 + 1, material_id))
+        contents.append(('text', f'The introduction of section {str(s)}', None, None, f'{str(s)}-content-01'))
+        contents.append(('video', f'The video of section {str(s)}', f'https://example.com/videos/{str(s)}', None,
+                         f'{str(s)}-content-02'))
+        contents.append(('list of additional learning materials', f'The materials of section {str(s)}', None,
+                         ', '.join(material_ids), f'{str(s)}-content-03'))
+        for e in range(1, n_exercises + 1):
+            exercise_id = f'{str(s)}.{str(e)}'
+            exercises.append((f'Exercise {exercise_id}', f'The exercise {str(e)} of section {str(s)}',
+                              f'Practice {exercise_id}' if e % 2 == 0 else None, e % 5 + 1,
+                              material_ids[0] if e == 1 else None, material_ids[-1], exercise_id))
+            for q in range(1, n_questions + 1):
+                answer = 'ABC'[q % 3]
+                questions.append((f'{exercise_id}.{str(q).zfill(2)}', f'Question {str(q)} of exercise {exercise_id}',
+                                  None, None, 'A) first', 'B) second', 'C) third', 'D) fourth' if q % 2 else None,
+                                  answer, 'Correct!', 'Not quite, try again.',
+                                  material_ids[q % n_materials] if q % 4 == 1 else None,
+                                  'synthetic, question' if q % 5 == 0 else None))
+    write_sheet(workbook, 'Section', ('*Section Name', '*Section ID'), sections, instruction)
+    write_sheet(workbook, 'Section Content', ('*Section Content Format', '*Description', 'Source URL',
+                                              'Additional Learning Material IDs', '*Content ID'),
+                contents, instruction)
+    write_sheet(workbook, 'Exercises', ('*Exercise Name', '*Description', 'Objectives', '*Level', 'Solution ID',
+                                        'Additional Learning Material IDs', '*Exercise ID'), exercises, instruction)
+    write_sheet(workbook, 'Questions', ('*Question ID', '*Description', 'Image URL', 'Option Header', 'Option A',
+                                        'Option B', 'Option C', 'Option D', 'Answer', '*Feedback for Correct Answer',
+                                        'Feedback for Incorrect Answer', 'Additional Learning Material ID', 'Tags'),
+                questions, instruction)
+    write_sheet(workbook, 'Additional Learning Material', ('*Learning Material Name', 'Description', '*Source URL',
+                                                           '*Format', '*Level', '*Additional Learning Material ID'),
+                materials, instruction)
+    workbook.save(excel_file)
+
+
+def create_learning_topic_workbook(excel_file, n_modules: int, n_exercises: int, n_questions: int, n_materials: int):
+    """
+    It writes a learning topic with the learning modules, their learning materials and exercises,
+    and the questions of each exercise. Every other exercise has a self-assessment statement.
+    """
+    assert 1 <= n_modules <= 9 and 1 <= n_exercises <= 9 and 1 <= n_questions <= 99 and 1 <= n_materials <= 9, \
+        'A learning topic has 1-9 learning modules, 1-9 exercises and learning materials per module ' \
+        'and 1-99 questions per exercise.'
+    workbook = Workbook(write_only=True)
+    write_sheet(workbook, 'Topic', ('*Organization Name', '*Org ID', '*Topic ID', '*Topic Name',
+                                    'Topic Description to be Displayed by the Bot', 'Topic Objectives to Be Displayed',
+                                    'Is the Topic Available for the Bot to Offer to the Learner', topic_tags_column),
+                [('Synthetic Organization', 'synthetic', 'topic', 'Synthetic Topic',
+                  'A synthetic learning topic for the benchmarks', 'Benchmark the parsers', True,
+                  'synthetic, benchmark')])
+    modules = []
+    materials = []
+    exercises = []
+    questions = []
+    instruction = 'Fill in one row per item, the columns starting with * are required.'
+    for m in range(1, n_modules + 1):
+        modules.append((f'Module {str(m)}', m, f'The learning module {str(m)}', f'Learn module {str(m)}'))
+        for i in range(1, n_materials + 1):
+            materials.append((f'Material {str(m)}-{str(i)}', f'The learning material {str(i)} of module {str(m)}',
+                              f'https://example.com/materials/{str(m)}-{str(i)}', i % 5 + 1,
+                              ('pdf', 'html', 'video')[i % 3], f'{str(m)}-mat-{str(i)}'))
+        for e in range(1, n_exercises + 1):
+            exercise_id = f'{str(m)}.{str(e)}'
+            # the reference ids of the exercises are typed as numbers in excel
+            exercises.append((f'Exercise {exercise_id}', f'The exercise {str(e)} of module {str(m)}',
+                              f'Practice {exercise_id}', e % 5 + 1, float(exercise_id),
+                              f'I can solve exercise {exercise_id}' if e % 2 == 1 else None))
+            for q in range(1, n_questions + 1):
+                questions.append((f'{exercise_id}.{str(q).zfill(2)}', f'Question {str(q)} of exercise {exercise_id}',
+                                  None, None, 'A) first', 'B) second', 'C) third', 'D) fourth' if q % 2 else None,
+                                  'ABC'[q % 3], 'Correct!', 'Not quite, try again.'))
+    write_sheet(workbook, 'Learning Modules', ('*Learning Module Name', topic_module_reference_id_column,
+                                               'Description to Be Displayed', 'Objectives to Be Displayed'), modules)
+    write_sheet(workbook, 'Learning Materials', ('*Learning Material Name', '*Description to Be Displayed',
+                                                 '*Source Url',
+                                                 '*Level (1 to 5, 1 being the easiest, whereas 5 being the most '
+                                                 'advanced)', '*Format (pdf, html, or video)',
+                                                 topic_material_reference_id_column), materials, instruction)
+    write_sheet(workbook, 'Exercises', ('*Exercise Name', 'Description to Be Displayed Before the Exercise',
+                                        'Objective to Be Displayed Before the Exercise', '*Level',
+                                        topic_exercise_reference_id_column, 'Self-Assessment Statement'),
+                exercises, instruction)
+    # the options of a question are read by their positions, the 5th to the 8th columns
+    write_sheet(workbook, 'Questions', (topic_question_reference_id_column, '*Description', 'Image URL',
+                                        'Option Header to Be Displayed (leave blank to use the default text, '
+                                        '"Please select your answer:")', '*Option A', '*Option B', 'Option C',
+                                        'Option D', '*Answer', '*Feedback for Correct Answer',
+                                        '*Feedback for Incorrect Answer'), questions)
+    workbook.save(excel_file)
+
+
+def create_survey_workbook(excel_file, n_sections: int, n_questions: int):
+    """
+    It writes a survey with the sections and the questions of each section, alternating single-select questions
+    with 5 options and open questions. The columns are the expected columns of the survey parser.
+    """
+    assert 1 <= n_sections and 1 <= n_questions <= 99, 'A survey has 1 or more sections and 1-99 questions each.'
+    survey_columns, *_ = get_expected_column_names_and_row_number('Survey')
+    section_columns, *_ = get_expected_column_names_and_row_number('Sections')
+    question_columns, *_ = get_expected_column_names_and_row_number('Questions')
+    sections = []
+    questions = []
+    for s in range(1, n_sections + 1):
+        # the reference ids are text, a number would be read as a number
+        section_id = f'S{str(s).zfill(2)}'
+        sections.append((f'Section {str(s)}', f'The section {str(s)} of the survey', False, None, None, False,
+                         section_id))
+        for q in range(1, n_questions + 1):
+            if q % 2 == 1:
+                options = [f'Option {str(o)}' for o in range(1, 6)] + [None] * 5
+                questions.append([f'{section_id}.{str(q).zfill(2)}', f'Question {str(q)} of section {str(s)}',
+                                  'singleSelect', 'string', 'Please select your answer below:'] + options)
+            else:
+                questions.append([f'{section_id}.{str(q).zfill(2)}', f'Question {str(q)} of section {str(s)}',
+                                  'open', 'string', None] + [None] * 10)
+    workbook = Workbook(write_only=True)
+    write_sheet(workbook, 'Survey', survey_columns,
+                [('synthetic', 'feedback', 'Synthetic Survey', 'A synthetic survey for the benchmarks')])
+    write_sheet(workbook, 'Sections', section_columns, sections)
+    write_sheet(workbook, 'Questions', question_columns, questions)
+    workbook.save(excel_file)
+
+
+if __name__ == '__main__':
+    main()
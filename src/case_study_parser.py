@@ -1,18 +1,28 @@
 import argparse
 import re
 import sys
-import jsonpickle
-import pandas as pd
 
 from validators.excel_validator import check_a_sheet_has_needed_columns_with_regex, \
     check_required_columns_have_values_by_regex, check_values_in_column_are_unique, \
     check_uniqueness_of_list_items_in_cell, check_cell_string_exists_in_another_sheet_column, \
     check_column_values_match_a_regex_pattern, check_referring_to_an_existing_parent_id, \
     check_ids_are_referred_by_child_ids_in_another_sheet, check_column_y_has_value_given_column_x_values, \
-    check_values_of_columns_matching_given_regex
+    check_values_of_columns_matching_given_regex, format_row_numbers
 from utilities.regex_utilities import get_a_matching_column_name_by_regex, get_matching_column_names_by_regex
+from utilities.workbook_session import WorkbookSession
+from utilities.parse_cache import create_parse_cache, add_parse_cache_arguments
+from utilities.json_serializer import write_output_file, add_output_file_arguments, get_output_file
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
+from utilities.case_study_parser_utilities import get_regex_for_spreadsheet_id_column_name, \
+    get_regex_for_id_pattern_in_case_study
+from utilities.case_study_sheet_schemas import get_case_study_sheet_schemas, get_case_study_sheet_schema
+from validators.validation_message import ValidationMessage
+from validators.validation_report import ValidationReport, add_validation_report_arguments, \
+    finish_validation_report
+from validators.validation_error import ValidationError
 
 from cloudant_models.documents import Documents
+from parsers.parser_utilities import SpreadsheetIdResolver
 from parsers.case_study.case_study_config_parser import parse_excel_to_case_study_config
 from parsers.case_study.additional_learning_material_parser import parse_excel_to_additional_learning_materials
 from parsers.case_study.case_study_section_parser import parse_excel_to_case_study_sections
@@ -23,66 +33,117 @@ def main():
     print("Start case study parser...")
     try:
         args = parse_args()
-        validate_case_study_excel_file(args)
-        docs = parse_excel_to_case_study_documents(args)
-        doc_json = jsonpickle.encode(docs, unpicklable=False)
-        file_path = "output/parsed-case-study-docs.json"
-        with open(file_path, "w") as outfile:
-             outfile.write(doc_json)
+        start_profiling_by_args(args)
+        file_path = get_output_file(args, 'output/parsed-case-study-docs')
+        parse_excel_file_to_case_study_json_file(args, file_path)
         sys.exit("\nParsing is completed, the parsed result is stored at " + file_path + '.')
     except (AssertionError, RuntimeError, ValueError) as e:
         print('\n\nError: ' + str(e))
         sys.exit('\nParsing is aborted. Please fix the error and try again.')
 
 
+def parse_excel_file_to_case_study_json_file(args, output_file):
+    """
+    It validates and parses the excel file of the args, or takes the result from the parse cache
+    if the file has not changed, and writes the json of the case study documents to the output file.
+    """
+    parse_cache = create_parse_cache(args)
+    cache_key = parse_cache.get_key(args.excel_file[0], 'case-study', args.ndjson)
+    if parse_cache.copy_to_file(cache_key, output_file):
+        print('\nThe excel file has not changed since it was last parsed, the cached result is used.')
+        return
+    with create_case_study_workbook_session(args.excel_file[0]) as workbook:
+        report = ValidationReport(fail_fast=not args.collect_all, header_rows=workbook.header_rows)
+        with profile_stage('validate excel file'):
+            validate_case_study_excel_file(workbook, report)
+        if args.collect_all:
+            finish_validation_report(report, args.report_file)
+        docs = parse_excel_to_case_study_documents(workbook)
+    with profile_stage('write output file'):
+        write_output_file(docs, output_file, args.ndjson)
+    parse_cache.put_file(cache_key, output_file)
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description='The program parses \
         an excel file and attempts to convert it into a case study json object')
     parser.add_argument('excel_file', metavar='excel_file', nargs=1,
                         help='The excel file containing case study configuration')
+    add_validation_report_arguments(parser)
+    add_parse_cache_arguments(parser)
+    add_output_file_arguments(parser, 'output/parsed-case-study-docs')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     return args
 
 
+def get_case_study_sheet_names() -> tuple:
+    return tuple(get_case_study_sheet_schemas().keys())
+
+
+def get_case_study_sheet_header_rows() -> dict:
+    return {sheet: schema.header_row for sheet, schema in get_case_study_sheet_schemas().items()}
+
+
+def get_case_study_sheet_column_regexes() -> dict:
+    """
+    It returns the regexes of the columns read from each sheet, the columns of the sheet schema and the other columns
+    the checks look for, e.g., the required columns starting with "*" and the level. The other columns,
+    e.g., notes, are not read from the excel file.
+    """
+    looked_up_column_regexes = (r'^\*', r'name', r'level', r'source url|image url', r'learning material id')
+    return {sheet: schema.get_column_regexes() + looked_up_column_regexes
+            for sheet, schema in get_case_study_sheet_schemas().items()}
+
+
+def create_case_study_workbook_session(excel_file) -> WorkbookSession:
+    return WorkbookSession(excel_file, get_case_study_sheet_header_rows(),
+                           column_regexes=get_case_study_sheet_column_regexes(),
+                           schemas=get_case_study_sheet_schemas())
+
+
 # Validation functions
-def validate_case_study_excel_file(args):
+def validate_case_study_excel_file(workbook: WorkbookSession, report: ValidationReport = None) -> ValidationReport:
+    """
+    It validates the case study excel file. By default, it raises an AssertionError or a ValueError at the first error.
+    If a report in the collecting mode is given, it runs every check and collects all the errors in the report instead.
+    """
     print("\nValidate excel file...")
-    file = args.excel_file[0]
-    all_sheets = {}
-    expected_sheet_names = ('Case Study', 'Section', 'Section Content', 'Exercises', 'Questions',
-                            'Additional Learning Material')
-    # It will raise a value error if the sheet is not in the file
-    for sheet in expected_sheet_names:
-        # most of the sheets show instruction in the first row
-        header_row = 1
-        if sheet == 'Case Study':
-            header_row = 0
-        all_sheets[sheet] = pd.read_excel(file, sheet_name=sheet, header=header_row)
+    if report is None:
+        report = ValidationReport(fail_fast=True, header_rows=get_case_study_sheet_header_rows())
+    expected_sheet_names = get_case_study_sheet_names()
+    missing_sheet_names = [sheet for sheet in expected_sheet_names if sheet not in workbook.sheet_names]
+    for sheet in missing_sheet_names:
+        report.add(ValidationMessage(False, f'"{sheet}" sheet is missing from the excel file.', sheet))
+    if len(missing_sheet_names) > 0:
+        # the other checks refer to the missing sheets, so the validation cannot continue
+        return report
+    all_sheets = workbook.get_sheets(expected_sheet_names)
 
     for expected_sheet in expected_sheet_names:
 
         print(f'\nInspect "{expected_sheet}" sheet...')
 
         expected_column_regex = get_expected_column_name_regexes(expected_sheet)
-        check_expected_columns = check_a_sheet_has_needed_columns_with_regex(expected_sheet, all_sheets[expected_sheet],
-                                                                             expected_column_regex)
         print('Check the sheet having all the needed columns:', end=' ')
+        check_expected_columns = report.check(expected_sheet, check_a_sheet_has_needed_columns_with_regex,
+                                              expected_sheet, all_sheets[expected_sheet], expected_column_regex)
         if check_expected_columns.is_valid is False:
-            raise AssertionError(check_expected_columns.message)
+            # the other checks of the sheet need the columns
+            continue
         print(check_expected_columns.message, 'OK!')
 
         print('Check the number of rows in the sheet: ', end=' ')
-        check_expected_row_number_in_case_study_excel_sheet(expected_sheet, all_sheets)
+        report.check(expected_sheet, check_expected_row_number_in_case_study_excel_sheet, expected_sheet, all_sheets)
 
         pattern = r'^\*'
         print(f'Check if the required columns matching the regex pattern {pattern} have value(s):', end=' ')
         check_first_row_only = False if expected_sheet != 'Case Study' else True
-        check_required_columns_have_values = check_required_columns_have_values_by_regex(expected_sheet,
-                                                                                         all_sheets[expected_sheet],
-                                                                                         pattern, check_first_row_only)
-        if check_required_columns_have_values.is_valid is False:
-            raise AssertionError(check_required_columns_have_values.message)
-        print(check_required_columns_have_values.message, 'OK!')
+        check_required_columns_have_values = report.check(expected_sheet, check_required_columns_have_values_by_regex,
+                                                          expected_sheet, all_sheets[expected_sheet],
+                                                          pattern, check_first_row_only)
+        if check_required_columns_have_values.is_valid:
+            print(check_required_columns_have_values.message, 'OK!')
 
         spreadsheet_id_column_name_regex = get_regex_for_spreadsheet_id_column_name(expected_sheet)
         if spreadsheet_id_column_name_regex is not None:
@@ -91,34 +152,29 @@ def validate_case_study_excel_file(args):
             id_pattern = get_regex_for_id_pattern_in_case_study(expected_sheet)
 
             print(f"Check if the ids match the expected pattern {id_pattern}:", end=' ')
-            check_column_values_match_a_regex_pattern(
-                all_sheets[expected_sheet], column_name, id_pattern, False)
-            print(f'The value(s) in column "{column_name}" match the expected pattern', 'OK!')
+            if report.check(expected_sheet, check_column_values_match_a_regex_pattern,
+                            all_sheets[expected_sheet], column_name, id_pattern, False).is_valid:
+                print(f'The value(s) in column "{column_name}" match the expected pattern', 'OK!')
 
             print('Check if ids are unique:', end=' ')
-            check_spreadsheet_ids_uniqueness = check_values_in_column_are_unique(all_sheets[expected_sheet],
-                                                                                 column_name)
-            if check_spreadsheet_ids_uniqueness.is_valid is False:
-                raise AssertionError(check_spreadsheet_ids_uniqueness.message)
-            print(check_spreadsheet_ids_uniqueness.message, 'OK!')
+            check_spreadsheet_ids_uniqueness = report.check(expected_sheet, check_values_in_column_are_unique,
+                                                            all_sheets[expected_sheet], column_name,
+                                                            column_name=column_name)
+            if check_spreadsheet_ids_uniqueness.is_valid:
+                print(check_spreadsheet_ids_uniqueness.message, 'OK!')
 
         # check urls should contain a valid scheme and domain name pattern
         url_column_name_regex = r'^(?=.*(?:source url|image url)).*$'
 
         print(f'Check valid URLs if there is a url column:')
         url_pattern = r'^(https?://)([A-Za-z0-9-]+\.)+[A-Za-z]{2,6}'
-        check_values_of_columns_matching_given_regex(all_sheets[expected_sheet],
-                                                     url_column_name_regex,
-                                                     url_pattern,
-                                                     allow_empty=True)
+        check_values_of_matching_columns(report, expected_sheet, all_sheets[expected_sheet], url_column_name_regex,
+                                         url_pattern, allow_empty=True)
 
         # check valid level
         print('Check if any column for Level:')
-        check_values_of_columns_matching_given_regex(
-            all_sheets[expected_sheet],
-            r'level',
-            r'^[1-5]$',
-            allow_empty=False)
+        check_values_of_matching_columns(report, expected_sheet, all_sheets[expected_sheet], r'level', r'^[1-5]$',
+                                         allow_empty=False)
         # check if referenced learning material ids are unique and existing in the additional learning material
         if expected_sheet != "Additional Learning Material":
 
@@ -134,119 +190,118 @@ def validate_case_study_excel_file(args):
                 # print(columns_containing_additional_learning_material_ids)
                 print(f'Column(s) {columns_containing_additional_learning_material_ids} '
                       f'referencing additional learning materials', 'OK!')
-                check_uniqueness_of_list_items_in_cell(all_sheets[expected_sheet],
-                                                       columns_containing_additional_learning_material_ids,
-                                                       ',')
-                print('The referenced additional learning material ids are unique', 'OK!')
-                learning_material_sheet = 'Additional Learning Material'
-                # print(f'Check if the referencing ids exist in the {learning_material_sheet}:')
-                pattern = get_regex_for_spreadsheet_id_column_name(learning_material_sheet)
-                additional_learning_material_sheet_id_col = get_a_matching_column_name_by_regex(
-                    all_sheets[learning_material_sheet], pattern)
-                check_cell_string_exists_in_another_sheet_column(
-                    all_sheets[expected_sheet],
-                    columns_containing_additional_learning_material_ids,
-                    ',',
-                    all_sheets[learning_material_sheet],
-                    additional_learning_material_sheet_id_col
-                )
-                print(f'The referenced additional learning material ids exist '
-                      f'in the sheet "{learning_material_sheet}"', 'OK!')
+                if report.check(expected_sheet, check_uniqueness_of_list_items_in_cell, all_sheets[expected_sheet],
+                                columns_containing_additional_learning_material_ids, ',').is_valid:
+                    print('The referenced additional learning material ids are unique', 'OK!')
+                report.check(expected_sheet, check_referenced_learning_material_ids_exist, expected_sheet,
+                             columns_containing_additional_learning_material_ids, all_sheets)
 
         if expected_sheet == 'Section':
             print(f'Check specific logic for {expected_sheet}...')
             # print(f'Check specific logic for "{expected_sheet}"')
             # each section should at least have one section content
             child_sheet_name = 'Section Content'
-            check_each_id_is_referred_in_another_sheet(expected_sheet, child_sheet_name, all_sheets)
+            report.check(expected_sheet, check_each_id_is_referred_in_another_sheet,
+                         expected_sheet, child_sheet_name, all_sheets)
 
         if expected_sheet == 'Section Content':
             print(f'Check specific logic for {expected_sheet}...')
             parent_sheet = "Section"
-            check_each_child_ids_refer_to_existing_parent_id(expected_sheet, parent_sheet, all_sheets)
+            report.check(expected_sheet, check_each_child_ids_refer_to_existing_parent_id,
+                         expected_sheet, parent_sheet, all_sheets)
             independent_column_name_regex = r'\*section content format'
 
             print('Check valid section content formats:')
             valid_section_content_types = r'^(text|video|image|pdf|html|list of additional learning materials)$'
-            check_values_of_columns_matching_given_regex(all_sheets[expected_sheet],
-                                                         independent_column_name_regex,
-                                                         valid_section_content_types,
-                                                         allow_empty=False)
+            check_values_of_matching_columns(report, expected_sheet, all_sheets[expected_sheet],
+                                             independent_column_name_regex, valid_section_content_types,
+                                             allow_empty=False)
             # print('All section content formats are valid.', 'OK!')
 
             dependent_column_name_regex = r'source url'
             given_values_in_independent_column = ('video', 'image', 'pdf', 'html')
-            check_the_dependency_between_two_columns(expected_sheet, independent_column_name_regex,
-                                                     dependent_column_name_regex, given_values_in_independent_column,
-                                                     all_sheets)
+            report.check(expected_sheet, check_the_dependency_between_two_columns, expected_sheet,
+                         independent_column_name_regex, dependent_column_name_regex,
+                         given_values_in_independent_column, all_sheets)
 
             dependent_column_name_regex = r'additional learning material ids'
             given_values_in_independent_column = ('list of additional learning materials',)
-            check_the_dependency_between_two_columns(expected_sheet, independent_column_name_regex,
-                                                     dependent_column_name_regex, given_values_in_independent_column,
-                                                     all_sheets)
+            report.check(expected_sheet, check_the_dependency_between_two_columns, expected_sheet,
+                         independent_column_name_regex, dependent_column_name_regex,
+                         given_values_in_independent_column, all_sheets)
 
         if expected_sheet == 'Exercises':
             print(f'Check specific logic for {expected_sheet}...')
             parent_sheet = "Section"
-            check_each_child_ids_refer_to_existing_parent_id(expected_sheet, parent_sheet, all_sheets)
+            report.check(expected_sheet, check_each_child_ids_refer_to_existing_parent_id,
+                         expected_sheet, parent_sheet, all_sheets)
             # Every exercise should have at least one question
             child_sheet_name = 'Questions'
-            check_each_id_is_referred_in_another_sheet(expected_sheet, child_sheet_name, all_sheets)
+            report.check(expected_sheet, check_each_id_is_referred_in_another_sheet,
+                         expected_sheet, child_sheet_name, all_sheets)
 
         if expected_sheet == 'Questions':
             print(f'Check specific logic for {expected_sheet}...')
             parent_sheet = 'Exercises'
-            check_each_child_ids_refer_to_existing_parent_id(expected_sheet, parent_sheet, all_sheets)
+            report.check(expected_sheet, check_each_child_ids_refer_to_existing_parent_id,
+                         expected_sheet, parent_sheet, all_sheets)
             # if there is an option header value, Option A should not be empty
-            check_option_a_should_have_value_if_option_header_has_value(all_sheets[expected_sheet])
+            report.check(expected_sheet, check_option_a_should_have_value_if_option_header_has_value,
+                         all_sheets[expected_sheet])
             # If has an answer, there should be a matching option
             # and the feedback for incorrect answer should not be empty
             print('Check answer:')
             independent_column_name_regex = r'^answer'
             valid_answer_values = r'^[ABCD]$'
-            check_values_of_columns_matching_given_regex(all_sheets[expected_sheet], independent_column_name_regex,
-                                                         valid_answer_values, allow_empty=True)
-            check_answer_has_an_existing_option_and_value(all_sheets[expected_sheet], independent_column_name_regex)
+            is_answer_valid = check_values_of_matching_columns(report, expected_sheet, all_sheets[expected_sheet],
+                                                               independent_column_name_regex, valid_answer_values,
+                                                               allow_empty=True)
+            if is_answer_valid:
+                # the option columns can only be found for valid answers
+                report.check(expected_sheet, check_answer_has_an_existing_option_and_value,
+                             all_sheets[expected_sheet], independent_column_name_regex)
             given_values_in_independent_column = ('A', 'B', 'C', 'D')
             dependent_column_name_regex = r'feedback for incorrect'
-            check_the_dependency_between_two_columns(expected_sheet, independent_column_name_regex,
-                                                     dependent_column_name_regex, given_values_in_independent_column,
-                                                     all_sheets)
+            report.check(expected_sheet, check_the_dependency_between_two_columns, expected_sheet,
+                         independent_column_name_regex, dependent_column_name_regex,
+                         given_values_in_independent_column, all_sheets)
         if expected_sheet == 'Additional Learning Material':
             print(f'Check specific logic for {expected_sheet}...')
             parent_sheet = "Section"
-            check_each_child_ids_refer_to_existing_parent_id(expected_sheet, parent_sheet, all_sheets)
+            report.check(expected_sheet, check_each_child_ids_refer_to_existing_parent_id,
+                         expected_sheet, parent_sheet, all_sheets)
             # check additional learning material formats are valid
             print(f'Check if the formats in {expected_sheet} are valid:')
             format_column_name_regex = r'format'
             format_value_regex = r'^(pdf|html|video)$'
-            check_values_of_columns_matching_given_regex(
-                all_sheets[expected_sheet], format_column_name_regex, format_value_regex, allow_empty=False)
+            check_values_of_matching_columns(report, expected_sheet, all_sheets[expected_sheet],
+                                             format_column_name_regex, format_value_regex, allow_empty=False)
 
-        print(f'\nThe sheet "{expected_sheet}" seems OK.')
+        print(f'\nThe sheet "{expected_sheet}" has been inspected.')
 
     print("\nComplete case study excel file validation.")
+    return report
+
+
+def check_referenced_learning_material_ids_exist(sheet_name: str, referencing_column_names: list, all_sheets):
+    learning_material_sheet = 'Additional Learning Material'
+    # print(f'Check if the referencing ids exist in the {learning_material_sheet}:')
+    pattern = get_regex_for_spreadsheet_id_column_name(learning_material_sheet)
+    additional_learning_material_sheet_id_col = get_a_matching_column_name_by_regex(
+        all_sheets[learning_material_sheet], pattern)
+    check_cell_string_exists_in_another_sheet_column(
+        all_sheets[sheet_name],
+        referencing_column_names,
+        ',',
+        all_sheets[learning_material_sheet],
+        additional_learning_material_sheet_id_col
+    )
+    print(f'The referenced additional learning material ids exist '
+          f'in the sheet "{learning_material_sheet}"', 'OK!')
 
 
 def get_expected_column_name_regexes(sheet_name: str):
-    col_name_regexes = ('organization name', 'org id', 'case study id', r'\*name', 'description', 'objectives', 'tags')
-    if sheet_name == 'Section':
-        col_name_regexes = ('section name', 'section id')
-    elif sheet_name == 'Section Content':
-        col_name_regexes = ('section content format', 'description', 'source url', 'additional learning material ids',
-                            'content id')
-    elif sheet_name == 'Exercises':
-        col_name_regexes = ('exercise name', 'description', 'objectives', 'level', 'solution id',
-                            'additional learning material ids', 'exercise id')
-    elif sheet_name == 'Questions':
-        col_name_regexes = ('question id', 'description', 'image url', 'option header', 'option a', 'option b',
-                            'option c', 'option d', 'answer', 'feedback for correct answer',
-                            'feedback for incorrect answer', 'additional learning material id', 'tags')
-    elif sheet_name == 'Additional Learning Material':
-        col_name_regexes = ('learning material name', 'description', 'source url', 'format',
-                            'additional learning material id')
-    return col_name_regexes
+    return get_case_study_sheet_schema(sheet_name).get_required_column_regexes()
 
 
 def check_expected_row_number_in_case_study_excel_sheet(expected_sheet, all_sheets):
@@ -278,39 +333,6 @@ def compare_additional_learning_material_rows_with_cells_referencing_learning_ma
                              "are in the Additional Learning Material sheet.")
 
 
-def get_regex_for_spreadsheet_id_column_name(sheet_name: str):
-    if sheet_name == "Section":
-        return r'section id'
-    elif sheet_name == "Section Content":
-        return r'content id'
-    elif sheet_name == "Exercises":
-        return r'exercise id'
-    elif sheet_name == "Questions":
-        return r'question id'
-    elif sheet_name == "Additional Learning Material":
-        return r'learning material id'
-    else:
-        return None
-
-
-def get_regex_for_id_pattern_in_case_study(sheet_name: str) -> str:
-    """
-    This function returns a regex pattern based on the sheet_name input.
-    """
-    if sheet_name == 'Section':
-        return r"([1-9][0-9]|[1-9]|0[1-9])"
-    elif sheet_name == 'Section Content':
-        return r"([1-9][0-9]|[1-9]|0[1-9])-content-(0[1-9]|[1-9][0-9])"
-    elif sheet_name == 'Exercises':
-        return r"([1-9][0-9]|[1-9]|0[1-9])\.([1-9])"
-    elif sheet_name == 'Questions':
-        return r"([1-9][0-9]|[1-9]|0[1-9])\.([1-9])\.(0[1-9]|[1-9][0-9])"
-    elif sheet_name == 'Additional Learning Material':
-        return r"([1-9][0-9]|[1-9]|0[1-9])-mat-(0[1-9]|[1-9][0-9])"
-    else:
-        raise AssertionError(f'the given sheet name {sheet_name} is invalid.')
-
-
 def check_each_child_ids_refer_to_existing_parent_id(child_sheet: str, parent_sheet: str, all_sheets):
     print(f'Check the ids in "{child_sheet}" refer to an existing parent id in "{parent_sheet}":', end=' ')
 
@@ -357,13 +379,23 @@ def check_the_dependency_between_two_columns(sheet_name, independent_col_name_re
 
 def check_answer_has_an_existing_option_and_value(questions_sheet_df, answer_column_regex):
     answer_column_name = get_a_matching_column_name_by_regex(questions_sheet_df, answer_column_regex)
-    for index, row in questions_sheet_df.iterrows():
-        if not pd.isnull(row[answer_column_name]):
-            option_column_regex = f'option {row[answer_column_name]}'
-            option_column_name = get_a_matching_column_name_by_regex(questions_sheet_df, option_column_regex)
-            if pd.isnull(row[option_column_name]):
-                raise AssertionError(f'In row {str(index + 1)}, answer is {row[answer_column_name]} '
-                                     f'but {option_column_name} is empty.')
+    answers = questions_sheet_df[answer_column_name]
+    error_messages = []
+    error_columns = []
+    error_rows = []
+    # resolve the option column once per distinct answer instead of once per row
+    for answer in answers.dropna().unique():
+        option_column_regex = f'option {answer}'
+        option_column_name = get_a_matching_column_name_by_regex(questions_sheet_df, option_column_regex)
+        is_option_empty = (answers == answer) & questions_sheet_df[option_column_name].isnull()
+        if is_option_empty.any():
+            rows = questions_sheet_df.index[is_option_empty].tolist()
+            error_messages.append(f'In row(s) {format_row_numbers(questions_sheet_df, rows)}, '
+                                  f'answer is {answer} but {option_column_name} is empty.')
+            error_columns.append(option_column_name)
+            error_rows += rows
+    if len(error_messages) > 0:
+        raise ValidationError('\n'.join(error_messages), ', '.join(error_columns), sorted(error_rows))
 
 
 def check_option_a_should_have_value_if_option_header_has_value(question_sheet_df):
@@ -372,14 +404,36 @@ def check_option_a_should_have_value_if_option_header_has_value(question_sheet_d
     option_header_col_name = get_a_matching_column_name_by_regex(question_sheet_df, option_header_regex)
     option_a_regex = r'^option a'
     option_a_col_name = get_a_matching_column_name_by_regex(question_sheet_df, option_a_regex)
-    for index, row in question_sheet_df.iterrows():
-        if not pd.isnull(row[option_header_col_name]):
-            assert not pd.isnull(row[option_a_col_name]), \
-                (f'In row {str(index + 1)}, "{option_header_col_name}" has value "{row[option_header_col_name]}", '
-                 f'therefore column "{option_a_col_name}" should not be empty!')
+    is_option_a_missing = question_sheet_df[option_header_col_name].notnull() & \
+        question_sheet_df[option_a_col_name].isnull()
+    if is_option_a_missing.any():
+        rows = question_sheet_df.index[is_option_a_missing].tolist()
+        raise ValidationError(f'In row(s) {format_row_numbers(question_sheet_df, rows)}, '
+                              f'"{option_header_col_name}" has value, '
+                              f'therefore column "{option_a_col_name}" should not be empty!', option_a_col_name, rows)
     print(f'If column "{option_header_col_name}" has value, column "{option_a_col_name}" also has value', 'OK!')
 
 
+def check_values_of_matching_columns(report: ValidationReport, sheet_name, sheet_df, column_name_regex, value_regex,
+                                     allow_empty: bool) -> bool:
+    """
+    It checks the values of each column matching the column name regex as a check of its own,
+    so in the collecting mode the errors of all the matching columns are reported, e.g., of all the answer columns.
+    It returns whether the values of all the matching columns are valid.
+    """
+    column_names = get_matching_column_names_by_regex(sheet_df, column_name_regex)
+    print(f'{str(len(column_names))} column(s) match {column_name_regex}', 'OK!')
+    are_all_valid = True
+    for name in column_names:
+        result = report.check(sheet_name, check_column_values_match_a_regex_pattern, sheet_df, name, value_regex,
+                              allow_empty, column_name=name)
+        if result.is_valid:
+            print(f'Column "{name}" has values match {value_regex}', 'OK!')
+        else:
+            are_all_valid = False
+    return are_all_valid
+
+
 def check_is_level_column_valid(sheet_name, level_col_name_regex, sheet_df):
     # does the sheet has a column for level
     print(f'Check if the sheet "{sheet_name}" has a column for level:', end=' ')
@@ -396,7 +450,7 @@ def check_is_level_column_valid(sheet_name, level_col_name_regex, sheet_df):
 
 
 # Parser functions
-def parse_excel_to_case_study_documents(args) -> Documents:
+def parse_excel_to_case_study_documents(workbook: WorkbookSession) -> Documents:
     """
     It takes a loaded case study excel file
     and returns documents based on the data models
@@ -405,20 +459,28 @@ def parse_excel_to_case_study_documents(args) -> Documents:
     documents = Documents([])
 
     # parse "Case Study" sheet into CoseStudyConfig
-    case_study_config = parse_excel_to_case_study_config(args)
+    with profile_stage('parse case study config'):
+        case_study_config = parse_excel_to_case_study_config(workbook)
     documents.docs.append(case_study_config)
 
     # parse "Additional Learning Material" sheet into a list of LearningMaterialV2
-    learning_materials = parse_excel_to_additional_learning_materials(args, case_study_config._id)
+    with profile_stage('parse additional learning materials'):
+        learning_materials = parse_excel_to_additional_learning_materials(workbook, case_study_config._id)
     documents.docs.extend(learning_materials)
+    # map the spreadsheet ids of the learning materials to their doc ids once for all referencing cells
+    learning_material_resolver = SpreadsheetIdResolver(learning_materials)
 
     # parse "Section" and "Section Content" sheet into a list of CaseStudySection
-    sections = parse_excel_to_case_study_sections(args, case_study_config._id, learning_materials)
+    with profile_stage('parse sections'):
+        sections = parse_excel_to_case_study_sections(workbook, case_study_config._id, learning_material_resolver)
     documents.docs.extend(sections)
 
     # parse "Exercises" and "Questions" sheet into a list of ExerciseV2
-    exercises = parse_excel_to_a_exercise_v2_list(args, sections, learning_materials)
+    with profile_stage('parse exercises'):
+        exercises = parse_excel_to_a_exercise_v2_list(workbook, sections, learning_material_resolver)
     documents.docs.extend(exercises)
+    # every sheet is parsed first, so all the unresolved references are reported at once
+    learning_material_resolver.check_all_references_resolved()
 
     return documents
 
@@ -1,12 +1,12 @@
 import argparse
-import json
 import sys
 from validators.cloudant_docs_validator import (check_docs_have_given_properties,
                                                 check_expected_doc_exists_with_given_property_and_value,
                                                 check_all_docs_share_given_partition_key)
-from cloudant_db.utilities import (get_db_name_from_env, confirm_database_environment_variable,
-                                   get_docs_by_partition_key, post_documents_to_topic_db,
-                                   create_bulk_docs_for_deletion_from_database_result)
+from cloudant_db.config import get_db_name_from_env
+from cloudant_db.bulk_writer import BulkWriteResult
+from utilities.json_stream import load_json_docs
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
 
 
 def main():
@@ -14,25 +14,38 @@ def main():
 
     try:
         args = parse_args()
-        with open(args.json_file[0], 'r') as file:
-            file_dict = json.loads(file.read())
+        start_profiling_by_args(args)
+        # the docs are read from the file one at a time whenever they are iterated, instead of loading the file
+        file_dict = load_json_docs(args.json_file[0])
         # Check if the json is about case study:
         # All docs should have _id and docType.
         # Check there is one and only one doc with docType caseStudyConfig.
         # Check each document share a partition key,
         #  so they can be deleted together by the partition key if needed
         print('\nCheck case study json...')
-        validate_case_study_dict(file_dict)
+        with profile_stage('validate json'):
+            validate_case_study_dict(file_dict)
 
+        # the database modules are imported after the arguments are parsed, so --help does not pay for them
+        from cloudant_db.utilities import confirm_database_environment_variable
         confirm_database_environment_variable()
 
         topic_db_name = get_db_name_from_env()
         case_study_partition_key = get_case_study_partition_key(file_dict)
+        if args.sync or args.dry_run:
+            # only write the differences between the json file and the existing documents
+            result = sync_case_study_documents(topic_db_name, file_dict, case_study_partition_key, args.dry_run)
+            if result is None:
+                sys.exit('\nDry run is completed, no changes have been made.')
+            print_final_result(result, 'written')
+            sys.exit('\nCase Study Uploader is completed.')
+
         # check if there are existing documents sharing the same partition key
         print(f'\nCheck if there are existing cloudant documents '
               f'sharing the partition key "{case_study_partition_key}"...')
-        has_existing_docs = check_if_there_are_existing_case_study_docs_with_given_partition_key(
-            topic_db_name, case_study_partition_key)
+        with profile_stage('list existing documents'):
+            has_existing_docs = check_if_there_are_existing_case_study_docs_with_given_partition_key(
+                topic_db_name, case_study_partition_key)
 
         if has_existing_docs:
             # Ask if the user want to delete the existing documents and create new ones.
@@ -48,7 +61,7 @@ def main():
         print_final_result(result)
 
         sys.exit('\nCase Study Uploader is completed.')
-    except (AssertionError, AttributeError) as e:
+    except (AssertionError, AttributeError, ValueError) as e:
         print(f'\n\nCase Study Uploader has aborted due to {e.__class__.__name__}: {e}')
         sys.exit()
 
@@ -58,7 +71,12 @@ def parse_args():
         description='Case Study Uploader uploads a valid case study JSON to the topic database.'
     )
     parser.add_argument('json_file', metavar='json_file', nargs=1,
-                        help='The resulted json file from case_study_parser.py')
+                        help='The resulted json or ndjson file from case_study_parser.py')
+    parser.add_argument('--sync', action='store_true',
+                        help='Only create, update and delete the documents which differ from the existing ones')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the changes of --sync without writing anything to the database')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     return args
 
@@ -89,26 +107,23 @@ def validate_case_study_dict(case_study_dict):
 
 
 def check_if_there_are_existing_case_study_docs_with_given_partition_key(topic_db, p_key) -> bool:
-    db_result = get_docs_by_partition_key(topic_db, p_key, False)
-    assert 'rows' in db_result, f'Something went wrong when querying the database, got {db_result}'
-    has_existing_docs = False
+    from cloudant_db.utilities import iterate_docs_by_partition_key
+    # the rows are read page by page, so the ids are listed before the number of the documents is known
+    n_existing_docs = 0
+    for row in iterate_docs_by_partition_key(topic_db, p_key, False):
+        if n_existing_docs == 0:
+            print('The id(s) of existing document(s) are listed below:')
+        print(row['id'])
+        n_existing_docs += 1
+
     msg = f'There are no documents in "{topic_db}" matching the partition key.'
-    if len(db_result['rows']) == 1:
-        has_existing_docs = True
-        msg = f'There is {str(len(db_result["rows"]))} document in "{topic_db}" matching the partition key.'
-    elif len(db_result['rows']) > 1:
-        has_existing_docs = True
-        msg = f'There are {str(len(db_result["rows"]))} documents in "{topic_db}" matching the partition key.'
+    if n_existing_docs == 1:
+        msg = f'There is {str(n_existing_docs)} document in "{topic_db}" matching the partition key.'
+    elif n_existing_docs > 1:
+        msg = f'There are {str(n_existing_docs)} documents in "{topic_db}" matching the partition key.'
     print(msg)
 
-    if has_existing_docs:
-        msg = 'The id of existing document is listed below:' \
-            if len(db_result['rows']) == 1 else 'The ids of existing documents are listed below:'
-        print(msg)
-        for row in db_result['rows']:
-            print(row['id'])
-
-    return has_existing_docs
+    return n_existing_docs > 0
 
 
 def get_case_study_partition_key(case_study_dict):
@@ -132,7 +147,9 @@ def create_new_case_study_documents(topic_db, case_study_dict):
     assert user_input == 'YES', msg
 
     print('\nCreate new documents based on the json file...')
-    return post_documents_to_topic_db(topic_db, case_study_dict)
+    from cloudant_db.utilities import write_documents_to_topic_db
+    with profile_stage('write documents'):
+        return write_documents_to_topic_db(topic_db, case_study_dict)
 
 
 def replace_all_existing_case_study_documents(topic_db, case_study_dict, partition_key):
@@ -149,27 +166,65 @@ def replace_all_existing_case_study_documents(topic_db, case_study_dict, partiti
     assert user_input == 'YES', msg
 
     print(f'\nDelete existing documents by the partition key "{partition_key}"...')
-    # return post_documents_to_topic_db(topic_db, case_study_dict)
-    existing_docs = get_docs_by_partition_key(topic_db, partition_key, False)
-    bulk_doc_for_deletion = create_bulk_docs_for_deletion_from_database_result(existing_docs)
-    deletion_result = post_documents_to_topic_db(topic_db, bulk_doc_for_deletion)
-    msg = f'{str(len(deletion_result))} document is deleted.' if len(deletion_result) == 1 \
-        else f'{str(len(deletion_result))} are deleted.'
+    from cloudant_db.utilities import iterate_docs_by_partition_key, delete_docs_page_by_page, \
+        write_documents_to_topic_db
+    # return write_documents_to_topic_db(topic_db, case_study_dict)
+    existing_rows = iterate_docs_by_partition_key(topic_db, partition_key, False)
+    with profile_stage('delete documents'):
+        deletion_result = delete_docs_page_by_page(topic_db, existing_rows)
+    n_deleted_docs = len(deletion_result.ok_results)
+    msg = f'{str(n_deleted_docs)} document is deleted.' if n_deleted_docs == 1 \
+        else f'{str(n_deleted_docs)} are deleted.'
     print(msg)
+    assert len(deletion_result.error_results) == 0, \
+        f'{str(len(deletion_result.error_results))} existing document(s) cannot be deleted: ' \
+        f'{deletion_result.error_results}'
 
     print('\nCreate new documents based on the json file...')
-    return post_documents_to_topic_db(topic_db, case_study_dict)
+    with profile_stage('write documents'):
+        return write_documents_to_topic_db(topic_db, case_study_dict)
+
+
+def sync_case_study_documents(topic_db, case_study_dict, partition_key, is_dry_run: bool) -> BulkWriteResult:
+    print(f'\nCompare the json file with the existing documents using the partition key "{partition_key}"...')
+    from cloudant_db.utilities import iterate_docs_by_partition_key, write_documents_to_topic_db
+    from cloudant_db.change_set import create_change_set
+    existing_docs = (row['doc'] for row in iterate_docs_by_partition_key(topic_db, partition_key, True))
+    with profile_stage('compare documents'):
+        change_set = create_change_set(case_study_dict['docs'], existing_docs)
+    change_set.print_change_set()
+    if is_dry_run:
+        return None
+    if change_set.is_empty:
+        print('The existing documents are up to date.')
+        return BulkWriteResult()
+
+    print('\n*********************************************************************************************************')
+    print(f'You are about to write the changes above to "{topic_db}" using the partition key "{partition_key}".')
+    print('*********************************************************************************************************')
+
+    msg = '\nAre you ready? Type YES to proceed, other keys to abort.\n'
+    user_input = input(msg)
+
+    msg = 'You aborted the process, no changes have been made.'
+    assert user_input == 'YES', msg
+
+    print('\nWrite the changes to the database...')
+    with profile_stage('write documents'):
+        return write_documents_to_topic_db(topic_db, change_set.get_docs_to_write())
 
 
-def print_final_result(result):
-    n_created_docs = len(result)
+def print_final_result(result: BulkWriteResult, action: str = 'created'):
+    result.print_summary()
+    created_docs = result.ok_results
+    n_created_docs = len(created_docs)
     if n_created_docs == 0:
-        print(f'No document is created.')
+        print(f'No document is {action}.')
     elif n_created_docs == 1:
-        print(f'Document "{result[0]["id"]}" is created.')
+        print(f'Document "{created_docs[0]["id"]}" is {action}.')
     else:
-        print(f'{str(len(result))} documents are created, ids are listed below:')
-        for doc in result:
+        print(f'{str(n_created_docs)} documents are {action}, ids are listed below:')
+        for doc in created_docs:
             print(doc['id'])
 
 
@@ -0,0 +1,138 @@
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .storage_backend import StorageBackend, StorageBackendError
+
+
+class BulkWriteResult:
+    """
+    A BulkWriteResult merges the per-document results of all the bulk requests in the order of the documents.
+    Each result is the dict returned by the storage backend, i.e., {"id", "rev", "ok"} or {"id", "error", "reason"}.
+    """
+    def __init__(self, results: list = None):
+        self.results = [] if results is None else results
+        self.n_requests = 0
+        self.n_retries = 0
+
+    @property
+    def ok_results(self) -> list:
+        return [r for r in self.results if 'error' not in r]
+
+    @property
+    def error_results(self) -> list:
+        return [r for r in self.results if 'error' in r]
+
+    def extend(self, other):
+        self.results.extend(other.results)
+        self.n_requests += other.n_requests
+        self.n_retries += other.n_retries
+
+    def print_summary(self):
+        print(f'\n{str(len(self.results))} document(s) are written in {str(self.n_requests)} bulk request(s) '
+              f'with {str(self.n_retries)} retry(ies): {str(len(self.ok_results))} ok, '
+              f'{str(len(self.error_results))} error(s).')
+        for r in self.error_results:
+            print(f'Document "{r.get("id")}" failed due to {r.get("error")}: {r.get("reason")}')
+
+
+class BulkWriter:
+    """
+    A BulkWriter splits the documents into batches bounded by the number of documents and the size of the request,
+    and posts the batches to _bulk_docs of the storage backend concurrently with a thread pool.
+    The documents can be an iterator, e.g., read from a file one at a time, since the batches are created
+    as they are posted and only a few batches per worker are held in memory.
+    A batch rejected with 429 or 5xx is retried with an exponential backoff, other errors are raised.
+    """
+    def __init__(self, backend: StorageBackend, db_name: str, max_docs_per_batch: int = 500,
+                 max_bytes_per_batch: int = 1000000, max_workers: int = 4, max_retries: int = 5,
+                 backoff_seconds: float = 1.0):
+        self.backend = backend
+        self.db_name = db_name
+        self.max_docs_per_batch = max_docs_per_batch
+        self.max_bytes_per_batch = max_bytes_per_batch
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+    def write(self, docs) -> BulkWriteResult:
+        result = BulkWriteResult()
+        batches = self.iterate_batches(get_docs_from_bulk_input(docs))
+        if self.max_workers <= 1:
+            for batch in batches:
+                result.extend(self.post_batch(batch))
+            return result
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # the results are merged in the order of the batches, so they are in the order of the documents,
+            # and no more batches are created until the oldest pending one is posted
+            pending_batches = deque()
+            for batch in batches:
+                pending_batches.append(executor.submit(self.post_batch, batch))
+                if len(pending_batches) >= 2 * self.max_workers:
+                    result.extend(pending_batches.popleft().result())
+            while len(pending_batches) > 0:
+                result.extend(pending_batches.popleft().result())
+        return result
+
+    def iterate_batches(self, docs):
+        batch = []
+        batch_bytes = 0
+        for doc in docs:
+            doc_bytes = get_doc_size_in_bytes(doc)
+            if len(batch) > 0 and (len(batch) == self.max_docs_per_batch or
+                                   batch_bytes + doc_bytes > self.max_bytes_per_batch):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            # a document larger than the limit is still sent alone and left to the database to accept or reject
+            batch.append(doc)
+            batch_bytes += doc_bytes
+        if len(batch) > 0:
+            yield batch
+
+    def post_batch(self, batch: list) -> BulkWriteResult:
+        result = BulkWriteResult()
+        for attempt in range(self.max_retries + 1):
+            result.n_requests += 1
+            try:
+                result.results = self.backend.bulk_docs(self.db_name, batch)
+                return result
+            except StorageBackendError as e:
+                if not is_retryable_status_code(e.status_code) or attempt == self.max_retries:
+                    raise
+                result.n_retries += 1
+                time.sleep(self.get_backoff_seconds(attempt, e))
+        return result
+
+    def get_backoff_seconds(self, attempt: int, error: StorageBackendError) -> float:
+        if error.retry_after is not None:
+            return error.retry_after
+        # the jitter keeps the concurrent batches from retrying at the same time
+        return self.backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def is_retryable_status_code(status_code: int) -> bool:
+    return status_code == 429 or 500 <= status_code < 600
+
+
+def get_docs_from_bulk_input(docs):
+    """
+    It returns the documents from the inputs accepted by the uploaders,
+    i.e., a json string or a dict having "docs", a BulkDocs, or a list or an iterator of documents.
+    """
+    if isinstance(docs, str):
+        docs = json.loads(docs)
+    # the SDK models are recognized by their attributes, so the Cloudant SDK is not imported for them
+    if hasattr(docs, 'docs') and not isinstance(docs, dict):
+        return docs.docs
+    if isinstance(docs, dict):
+        return docs['docs']
+    return docs
+
+
+def get_doc_size_in_bytes(doc) -> int:
+    if hasattr(doc, 'to_dict'):
+        doc = doc.to_dict()
+    return len(json.dumps(doc).encode('utf-8'))
@@ -0,0 +1,67 @@
+import hashlib
+import json
+
+
+class ChangeSet:
+    """
+    A ChangeSet holds the writes needed to make the existing documents of a partition equal to the parsed documents:
+    parsed documents without an existing _id are created, changed documents are updated with the existing _rev,
+    and existing documents without a parsed _id are deleted. Unchanged documents are not written at all.
+    """
+    def __init__(self):
+        self.creates = []
+        self.updates = []
+        self.deletes = []
+        self.unchanged_ids = []
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.creates) + len(self.updates) + len(self.deletes) == 0
+
+    def get_docs_to_write(self) -> list:
+        from ibmcloudant.cloudant_v1 import Document
+        return self.creates + self.updates + \
+            [Document(_id=doc['_id'], _rev=doc['_rev'], _deleted=True) for doc in self.deletes]
+
+    def print_change_set(self):
+        print(f'\n{str(len(self.creates))} document(s) to create, {str(len(self.updates))} to update, '
+              f'{str(len(self.deletes))} to delete, and {str(len(self.unchanged_ids))} unchanged.')
+        for action, docs in (('create', self.creates), ('update', self.updates), ('delete', self.deletes)):
+            for doc in docs:
+                print(f'{action}: {doc["_id"]}')
+
+
+def get_content_hash(doc: dict, ignored_properties: tuple = ('_rev', 'createdAt', 'updatedAt')) -> str:
+    """
+    It hashes the content of a document regardless of the key order.
+    The revision and the timestamps are ignored, since they differ on every parse or upload.
+    """
+    content = {key: value for key, value in doc.items() if key not in ignored_properties}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def create_change_set(parsed_docs: list, existing_docs) -> ChangeSet:
+    """
+    It compares the parsed documents with the existing documents by _id and content hash.
+    The existing documents can be any iterable, e.g., a paged reader, since each of them is only visited once.
+    An updated document keeps the existing createdAt if it has one.
+    """
+    change_set = ChangeSet()
+    parsed_docs_by_id = {doc['_id']: doc for doc in parsed_docs}
+    existing_ids = set()
+    for existing_doc in existing_docs:
+        doc_id = existing_doc['_id']
+        existing_ids.add(doc_id)
+        parsed_doc = parsed_docs_by_id.get(doc_id)
+        if parsed_doc is None:
+            change_set.deletes.append({'_id': doc_id, '_rev': existing_doc['_rev']})
+        elif get_content_hash(parsed_doc) == get_content_hash(existing_doc):
+            change_set.unchanged_ids.append(doc_id)
+        else:
+            updated_doc = dict(parsed_doc, _rev=existing_doc['_rev'])
+            if 'createdAt' in existing_doc and 'createdAt' in parsed_doc:
+                updated_doc['updatedAt'] = parsed_doc['createdAt']
+                updated_doc['createdAt'] = existing_doc['createdAt']
+            change_set.updates.append(updated_doc)
+    change_set.creates = [doc for doc in parsed_docs if doc['_id'] not in existing_ids]
+    return change_set
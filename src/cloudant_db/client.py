@@ -0,0 +1,38 @@
+from .config import CloudantConfig, get_cloudant_config_from_env
+from .storage_backend import StorageBackend, CloudantBackend
+
+_clients = {}
+_storage_backend = None
+
+
+def get_cloudant_client(config: CloudantConfig = None):
+    """
+    It returns a CloudantV1 client for the config, or for the .env file if no config is given.
+    The client is created on the first call and reused afterwards, and the Cloudant SDK is only imported then,
+    so the scripts which do not talk to the database neither pay for the SDK nor need the credentials.
+    """
+    config = get_cloudant_config_from_env() if config is None else config
+    key = (config.url, config.api_key)
+    if key not in _clients:
+        from ibmcloudant.cloudant_v1 import CloudantV1
+        from ibm_cloud_sdk_core.authenticators import IAMAuthenticator
+        client = CloudantV1(authenticator=IAMAuthenticator(config.api_key))
+        client.set_service_url(config.url)
+        _clients[key] = client
+    return _clients[key]
+
+
+def get_storage_backend() -> StorageBackend:
+    """
+    It returns the storage backend of the document requests, which is Cloudant with the client of the .env file
+    unless another backend has been set, e.g., an InMemoryBackend to run the uploaders without a Cloudant service.
+    """
+    global _storage_backend
+    if _storage_backend is None:
+        _storage_backend = CloudantBackend(get_cloudant_client())
+    return _storage_backend
+
+
+def set_storage_backend(backend: StorageBackend):
+    global _storage_backend
+    _storage_backend = backend
@@ -0,0 +1,41 @@
+import os
+
+_is_env_loaded = False
+
+
+class CloudantConfig:
+    """
+    A CloudantConfig holds the settings to connect to a Cloudant database,
+    so a client can be created for other settings than the ones in the .env file.
+    """
+    def __init__(self, url: str, api_key: str, database_name: str = None, page_size: int = 200):
+        self.url = url
+        self.api_key = api_key
+        self.database_name = database_name
+        self.page_size = page_size
+
+
+def load_env():
+    # the .env file is loaded once, on the first use of the settings instead of on import
+    global _is_env_loaded
+    if not _is_env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _is_env_loaded = True
+
+
+def get_cloudant_config_from_env() -> CloudantConfig:
+    load_env()
+    return CloudantConfig(os.getenv('CLOUDANT_URL'), os.getenv('CLOUDANT_APIKEY'), os.getenv('DATABASE_NAME'),
+                          get_page_size_from_env())
+
+
+def get_db_name_from_env() -> str:
+    load_env()
+    return os.getenv('DATABASE_NAME')
+
+
+def get_page_size_from_env() -> int:
+    # the number of rows or docs requested per page when reading documents from the database
+    load_env()
+    return int(os.getenv('CLOUDANT_PAGE_SIZE', '200'))
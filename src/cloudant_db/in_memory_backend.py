@@ -0,0 +1,188 @@
+import copy
+import hashlib
+import json
+import threading
+import uuid
+from collections import Counter
+
+from .storage_backend import StorageBackend, StorageBackendError
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    An InMemoryBackend keeps partitioned databases in memory and behaves like CouchDB for the requests of the uploaders:
+    - a document can only be updated or deleted with its current _rev, otherwise it is a conflict,
+    - the document ids must be "<partition key>:<doc id>",
+    - all_docs and find return the documents ordered by _id and page by start_key or bookmark,
+    - the selectors support the field conditions and the combination operators of the simple Mango selectors.
+    It counts the requests by type, so the uploaders can be measured without a Cloudant service.
+    """
+    def __init__(self):
+        self.databases = {}
+        self.request_counts = Counter()
+        self._lock = threading.Lock()
+
+    def create_database(self, db_name: str):
+        self.databases.setdefault(db_name, {'docs': {}, 'deleted_revs': {}, 'update_seq': 0})
+
+    def _get_database(self, db_name: str) -> dict:
+        if db_name not in self.databases:
+            raise StorageBackendError(404, f'Database "{db_name}" does not exist.')
+        return self.databases[db_name]
+
+    def bulk_docs(self, db_name: str, docs: list) -> list:
+        with self._lock:
+            self.request_counts['bulk_docs'] += 1
+            database = self._get_database(db_name)
+            return [self._write_document(database, doc.to_dict() if hasattr(doc, 'to_dict') else doc)
+                    for doc in docs]
+
+    def post_document(self, db_name: str, doc: dict) -> dict:
+        with self._lock:
+            self.request_counts['post_document'] += 1
+            result = self._write_document(self._get_database(db_name), doc)
+        if 'error' in result:
+            raise StorageBackendError(409 if result['error'] == 'conflict' else 400, result['reason'])
+        return result
+
+    def _write_document(self, database: dict, doc: dict) -> dict:
+        doc = copy.deepcopy(doc)
+        doc_id = doc.setdefault('_id', uuid.uuid4().hex)
+        if ':' not in doc_id or doc_id.startswith(':') or doc_id.endswith(':'):
+            return {'id': doc_id, 'error': 'illegal_docid', 'reason': 'Doc id must be of form partition:id'}
+        current_doc = database['docs'].get(doc_id)
+        current_rev = current_doc['_rev'] if current_doc is not None else database['deleted_revs'].get(doc_id)
+        if current_doc is not None and doc.get('_rev') != current_rev or \
+                current_doc is None and doc.get('_rev') is not None and doc.get('_rev') != current_rev:
+            return {'id': doc_id, 'error': 'conflict', 'reason': 'Document update conflict.'}
+        generation = 0 if current_rev is None else int(current_rev.split('-')[0])
+        doc['_rev'] = f'{str(generation + 1)}-{hashlib.md5(json.dumps(doc, sort_keys=True).encode()).hexdigest()}'
+        if doc.get('_deleted'):
+            if current_doc is None:
+                return {'id': doc_id, 'error': 'not_found', 'reason': 'deleted'}
+            del database['docs'][doc_id]
+            database['deleted_revs'][doc_id] = doc['_rev']
+        else:
+            database['docs'][doc_id] = doc
+        database['update_seq'] += 1
+        return {'id': doc_id, 'rev': doc['_rev'], 'ok': True}
+
+    def get_database_information(self, db_name: str) -> dict:
+        with self._lock:
+            self.request_counts['get_database_information'] += 1
+            database = self._get_database(db_name)
+            # the update_seq of CouchDB is an opaque string, which only tells whether the database has changed
+            return {'db_name': db_name, 'doc_count': len(database['docs']),
+                    'update_seq': f'{str(database["update_seq"])}-in-memory'}
+
+    def partition_all_docs(self, db_name: str, partition_key: str, include_docs: bool, limit: int = None,
+                           start_key: str = None) -> dict:
+        with self._lock:
+            self.request_counts['partition_all_docs'] += 1
+            docs = self._get_sorted_docs(db_name, partition_key)
+            if start_key is not None:
+                docs = [doc for doc in docs if doc['_id'] >= start_key]
+            docs = docs[:limit] if limit is not None else docs
+            rows = [{'id': doc['_id'], 'key': doc['_id'], 'value': {'rev': doc['_rev']}} for doc in docs]
+            if include_docs:
+                for row, doc in zip(rows, docs):
+                    row['doc'] = copy.deepcopy(doc)
+            return {'total_rows': len(rows), 'offset': 0, 'rows': rows}
+
+    def partition_find(self, db_name: str, partition_key: str, selector: dict, fields: list = None,
+                       limit: int = None, bookmark: str = None) -> dict:
+        with self._lock:
+            self.request_counts['partition_find'] += 1
+            return self._find(self._get_sorted_docs(db_name, partition_key), selector, fields, limit, bookmark)
+
+    def find(self, db_name: str, selector: dict, fields: list = None, limit: int = None,
+             bookmark: str = None) -> dict:
+        with self._lock:
+            self.request_counts['find'] += 1
+            return self._find(self._get_sorted_docs(db_name, None), selector, fields, limit, bookmark)
+
+    def _get_sorted_docs(self, db_name: str, partition_key: str) -> list:
+        docs = self._get_database(db_name)['docs']
+        prefix = None if partition_key is None else partition_key + ':'
+        return [docs[doc_id] for doc_id in sorted(docs) if prefix is None or doc_id.startswith(prefix)]
+
+    @staticmethod
+    def _find(sorted_docs: list, selector: dict, fields: list, limit: int, bookmark: str) -> dict:
+        # the bookmark is the _id of the last doc of the previous page, like the opaque bookmark of CouchDB
+        limit = 25 if limit is None else limit
+        matching_docs = []
+        for doc in sorted_docs:
+            if bookmark is not None and doc['_id'] <= bookmark:
+                continue
+            if is_matching_selector(doc, selector):
+                matching_docs.append(doc)
+                if len(matching_docs) == limit:
+                    break
+        next_bookmark = matching_docs[-1]['_id'] if len(matching_docs) > 0 else bookmark
+        if fields is not None:
+            matching_docs = [{field: doc[field] for field in fields if field in doc} for doc in matching_docs]
+        return {'docs': copy.deepcopy(matching_docs), 'bookmark': next_bookmark}
+
+
+def get_field_value(doc: dict, field: str):
+    value = doc
+    for part in field.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _missing
+        value = value[part]
+    return value
+
+
+_missing = object()
+
+
+def is_matching_selector(doc: dict, selector: dict) -> bool:
+    """
+    It evaluates a Mango selector with the combination operators $and, $or, $nor and $not,
+    and the condition operators $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin and $exists.
+    A field without an operator is an implicit $eq, and a selector with several fields is an implicit $and.
+    """
+    for key, condition in selector.items():
+        if key == '$and':
+            if not all(is_matching_selector(doc, s) for s in condition):
+                return False
+        elif key == '$or':
+            if not any(is_matching_selector(doc, s) for s in condition):
+                return False
+        elif key == '$nor':
+            if any(is_matching_selector(doc, s) for s in condition):
+                return False
+        elif key == '$not':
+            if is_matching_selector(doc, condition):
+                return False
+        elif not is_matching_condition(get_field_value(doc, key), condition):
+            return False
+    return True
+
+
+def is_matching_condition(value, condition) -> bool:
+    if not isinstance(condition, dict) or not any(key.startswith('$') for key in condition):
+        return value is not _missing and value == condition
+    for operator, operand in condition.items():
+        if operator == '$exists':
+            if (value is not _missing) != operand:
+                return False
+        elif operator == '$not':
+            if is_matching_condition(value, operand):
+                return False
+        elif value is _missing:
+            return False
+        elif operator == '$eq' and not value == operand or operator == '$ne' and not value != operand or \
+                operator == '$in' and value not in operand or operator == '$nin' and value in operand:
+            return False
+        elif operator in ('$gt', '$gte', '$lt', '$lte'):
+            try:
+                if operator == '$gt' and not value > operand or operator == '$gte' and not value >= operand or \
+                        operator == '$lt' and not value < operand or operator == '$lte' and not value <= operand:
+                    return False
+            except TypeError:
+                # CouchDB orders values of different types, which is out of the scope of this stand-in
+                return False
+        elif operator not in ('$eq', '$ne', '$in', '$nin'):
+            raise StorageBackendError(400, f'The operator {operator} is not supported by the in-memory backend.')
+    return True
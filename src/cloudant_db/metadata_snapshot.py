@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+from urllib.parse import quote
+
+from .config import load_env
+from .utilities import iterate_docs_by_selector, get_update_seq
+
+# a snapshot file of another format is read from the database again
+snapshot_format_version = 1
+_snapshots = {}
+
+
+class MetadataSnapshot:
+    """
+    A MetadataSnapshot holds the active self-assessment statements (SAS) and the ids and names of the topic configs
+    of a database at its update_seq. The SAS are indexed by partition key and the topic config ids by the normalized
+    topic name, so the survey sections find their SAS and their topics without scanning them.
+    """
+    def __init__(self, db_name: str, update_seq: str, sas_docs: list, topic_configs: list):
+        self.db_name = db_name
+        self.update_seq = update_seq
+        self.sas_docs = sas_docs
+        self.topic_configs = topic_configs
+        self.sas_docs_by_partition_key = {}
+        for doc in sas_docs:
+            self.sas_docs_by_partition_key.setdefault(doc['_id'].split(':')[0], []).append(doc)
+        self.topic_config_ids_by_name = {}
+        for topic_config in topic_configs:
+            # the first topic of a name is used, as the topics were searched in order
+            self.topic_config_ids_by_name.setdefault(normalize_topic_name(topic_config['name']), topic_config['_id'])
+
+    def get_sas_docs(self, scope: str = None) -> list:
+        return [doc for doc in self.sas_docs if scope is None or doc['scope'] == scope]
+
+    def get_sas_docs_by_partition_key(self, partition_key: str, scope: str = None) -> list:
+        return [doc for doc in self.sas_docs_by_partition_key.get(partition_key, [])
+                if scope is None or doc['scope'] == scope]
+
+    def get_topic_config_id_by_name(self, topic_name: str) -> str:
+        return self.topic_config_ids_by_name.get(normalize_topic_name(topic_name))
+
+    def to_dict(self) -> dict:
+        return {'version': snapshot_format_version, 'dbName': self.db_name, 'updateSeq': self.update_seq,
+                'sasDocs': self.sas_docs, 'topicConfigs': self.topic_configs}
+
+    @staticmethod
+    def from_dict(snapshot: dict):
+        return MetadataSnapshot(snapshot['dbName'], snapshot['updateSeq'], snapshot['sasDocs'],
+                                snapshot['topicConfigs'])
+
+
+class MetadataSnapshotCache:
+    """
+    A MetadataSnapshotCache keeps the metadata snapshot of each database in memory and on disk, and only reads
+    the documents from the database again when its update_seq has changed, which takes a single request otherwise.
+    A disabled cache reads the documents from the database every time and stores nothing on disk.
+    """
+    def __init__(self, cache_dir: str, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    def get_path(self, db_name: str) -> str:
+        # a database name may have a slash
+        return os.path.join(self.cache_dir, quote(db_name, safe='') + '.json')
+
+    def get_snapshot(self, db_name: str) -> MetadataSnapshot:
+        update_seq = get_update_seq(db_name)
+        if self.enabled:
+            snapshot = _snapshots.get(db_name) or self.load(db_name)
+            if snapshot is not None and snapshot.update_seq == update_seq:
+                print('\nThe database has not changed since it was last read, the cached documents are used.')
+                _snapshots[db_name] = snapshot
+                return snapshot
+        snapshot = read_metadata_snapshot(db_name, update_seq)
+        if self.enabled:
+            _snapshots[db_name] = snapshot
+            self.save(snapshot)
+        return snapshot
+
+    def load(self, db_name: str) -> MetadataSnapshot:
+        """
+        It reads the snapshot of the database from disk, and returns None if there is no readable snapshot.
+        """
+        try:
+            with open(self.get_path(db_name), encoding='utf-8') as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get('version') != snapshot_format_version or snapshot.get('dbName') != db_name:
+            return None
+        return MetadataSnapshot.from_dict(snapshot)
+
+    def save(self, snapshot: MetadataSnapshot):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # write to a temporary file first, so concurrent parsers never read a partial snapshot
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+            json.dump(snapshot.to_dict(), file)
+        os.replace(temp_path, self.get_path(snapshot.db_name))
+
+
+def clear_snapshots_in_memory():
+    # the snapshots on disk are kept, as if the next parse ran in a new process
+    _snapshots.clear()
+
+
+def normalize_topic_name(topic_name: str) -> str:
+    return topic_name.lower().strip()
+
+
+def read_metadata_snapshot(db_name: str, update_seq: str) -> MetadataSnapshot:
+    """
+    It reads the active SAS and the topic configs of the database page by page.
+    The update_seq is taken before the documents are read, so a write during the reading leaves a snapshot
+    with an older update_seq than the database, which is read again next time.
+    """
+    sas_docs = list(iterate_docs_by_selector(db_name, selector={'docType': 'selfAssessmentStatement',
+                                                                 'isActive': True}))
+    topic_configs = list(iterate_docs_by_selector(db_name, fields=['_id', 'name'],
+                                                  selector={'docType': 'topicConfig'}))
+    return MetadataSnapshot(db_name, update_seq, sas_docs, topic_configs)
+
+
+def create_metadata_snapshot_cache(args) -> MetadataSnapshotCache:
+    load_env()
+    cache_dir = os.getenv('METADATA_CACHE_DIR', os.path.join('output', '.metadata-cache'))
+    return MetadataSnapshotCache(cache_dir, enabled=not getattr(args, 'no_cache', False))
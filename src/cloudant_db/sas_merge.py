@@ -0,0 +1,82 @@
+from cloudant_db.change_set import get_content_hash
+
+# the ids and the timestamps of a parsed SAS differ from the existing SAS of the same scope on every parse
+sas_ignored_properties = ('_id', '_rev', 'createdAt', 'updatedAt')
+
+
+class SasMergePlan:
+    """
+    A SasMergePlan holds the writes merging the parsed self-assessment statements (SAS) into the existing ones
+    of a partition, matched by their scopeRefId:
+    - a parsed SAS without an existing SAS of the same scope is created,
+    - a changed SAS updates the existing SAS of the same scope, keeping its _id, _rev and createdAt,
+      which is the same _id unless the existing SAS has a legacy id with the timestamp of its creation,
+    - an active existing SAS without a parsed SAS of the same scope is deactivated, but never deleted.
+    The SAS which are unchanged or already inactive are not written at all.
+    """
+    def __init__(self):
+        self.creates = []
+        self.updates = []
+        self.deactivations = []
+        self.unchanged_ids = []
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.creates) + len(self.updates) + len(self.deactivations) == 0
+
+    def get_docs_to_write(self) -> list:
+        return self.creates + self.updates + self.deactivations
+
+    def print_plan(self):
+        print(f'\n{str(len(self.creates))} SAS document(s) to create, {str(len(self.updates))} to update, '
+              f'{str(len(self.deactivations))} to deactivate, and {str(len(self.unchanged_ids))} unchanged.')
+        for action, docs in (('create', self.creates), ('update', self.updates),
+                             ('deactivate', self.deactivations)):
+            for doc in docs:
+                print(f'{action}: {doc["_id"]}')
+
+
+def create_sas_merge_plan(parsed_sas_docs, existing_sas_docs, updated_at: int) -> SasMergePlan:
+    """
+    It indexes the parsed SAS and the existing SAS by scopeRefId and classifies each of them in one pass.
+    If several parsed SAS have the same scope, the first one is used. If several existing SAS have the same scope,
+    e.g., the deactivated statements of the earlier uploads, the one with the same _id or else the active one
+    is updated and the other active ones are deactivated.
+    The given documents are not modified, the plan holds new documents.
+    The updated_at is the time of the deactivations, the updates take the createdAt of the parsed SAS instead.
+    """
+    plan = SasMergePlan()
+    parsed_docs_by_scope = {}
+    for doc in parsed_sas_docs:
+        parsed_docs_by_scope.setdefault(doc['scopeRefId'], doc)
+    existing_docs_by_scope = {}
+    for doc in existing_sas_docs:
+        existing_docs_by_scope.setdefault(doc['scopeRefId'], []).append(doc)
+
+    for scope_ref_id, parsed_doc in parsed_docs_by_scope.items():
+        if scope_ref_id not in existing_docs_by_scope:
+            plan.creates.append(dict(parsed_doc))
+    for scope_ref_id, existing_docs in existing_docs_by_scope.items():
+        parsed_doc = parsed_docs_by_scope.get(scope_ref_id)
+        updated_doc = None
+        if parsed_doc is not None:
+            # an inactive SAS is reactivated if its scope is parsed again
+            updated_doc = next((doc for doc in existing_docs if doc['_id'] == parsed_doc['_id']), None) or \
+                next((doc for doc in existing_docs if doc.get('isActive')), existing_docs[-1])
+            add_update_to_plan(plan, parsed_doc, updated_doc)
+        for doc in existing_docs:
+            if doc is updated_doc:
+                continue
+            if doc.get('isActive'):
+                plan.deactivations.append(dict(doc, isActive=False, updatedAt=updated_at))
+            else:
+                plan.unchanged_ids.append(doc['_id'])
+    return plan
+
+
+def add_update_to_plan(plan: SasMergePlan, parsed_doc: dict, existing_doc: dict):
+    if get_content_hash(parsed_doc, sas_ignored_properties) == get_content_hash(existing_doc, sas_ignored_properties):
+        plan.unchanged_ids.append(existing_doc['_id'])
+        return
+    plan.updates.append(dict(parsed_doc, _id=existing_doc['_id'], _rev=existing_doc['_rev'],
+                             createdAt=existing_doc['createdAt'], updatedAt=parsed_doc['createdAt']))
@@ -0,0 +1,107 @@
+from cloudant_db.bulk_writer import BulkWriteResult
+from cloudant_db.utilities import write_documents_to_topic_db, iterate_pages
+from cloudant_models.self_assessment_statement import get_self_assessment_statement_id
+
+
+class SasIdMigration:
+    """
+    A SasIdMigration moves the self-assessment statement (SAS) of a scope from its legacy ids, which end with
+    the timestamp of their creation, to the id derived from the partition, the scope and the scopeRefId.
+    The copy is the SAS written to the new id, or None if a SAS with the new id already exists.
+    The legacy writes deactivate, or delete if asked, the SAS with legacy ids of the scope.
+    """
+    def __init__(self, doc_id: str, copy: dict = None, legacy_writes: list = None):
+        self.doc_id = doc_id
+        self.copy = copy
+        self.legacy_writes = [] if legacy_writes is None else legacy_writes
+
+    @property
+    def is_empty(self) -> bool:
+        return self.copy is None and len(self.legacy_writes) == 0
+
+
+class SasIdMigrationPlan:
+    """
+    A SasIdMigrationPlan holds the migrations of the scopes having SAS with legacy ids,
+    and the ids of the SAS which are left as they are.
+    """
+    def __init__(self):
+        self.migrations = []
+        self.unchanged_ids = []
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.migrations) == 0
+
+    @property
+    def copies(self) -> list:
+        return [migration.copy for migration in self.migrations if migration.copy is not None]
+
+    @property
+    def legacy_writes(self) -> list:
+        return [doc for migration in self.migrations for doc in migration.legacy_writes]
+
+    def print_plan(self):
+        print(f'\n{str(len(self.copies))} SAS document(s) to copy to their new ids, '
+              f'{str(len(self.legacy_writes))} SAS document(s) with legacy ids to deactivate or delete, '
+              f'and {str(len(self.unchanged_ids))} unchanged.')
+        for migration in self.migrations:
+            if migration.copy is not None:
+                print(f'copy: {migration.doc_id}')
+            for doc in migration.legacy_writes:
+                print(f'{"delete" if doc.get("_deleted") else "deactivate"}: {doc["_id"]}')
+
+
+def get_new_sas_id(doc: dict) -> str:
+    return get_self_assessment_statement_id(doc['_id'].split(':')[0], doc['scope'], doc['scopeRefId'])
+
+
+def create_sas_id_migration_plan(sas_docs, updated_at: int, is_deleting_legacy_docs: bool = False) \
+        -> SasIdMigrationPlan:
+    """
+    It groups the SAS by their new ids, i.e., by partition, scope and scopeRefId, and plans the migration of each
+    group with legacy ids. If the group has no SAS with the new id yet, the active SAS, or else the last one, is
+    copied to the new id with its createdAt and isActive. The active SAS with legacy ids are then deactivated,
+    so they stay available to the surveys referring to them, or all the SAS with legacy ids are deleted if asked.
+    Running the plan again after it is written finds nothing to migrate.
+    """
+    plan = SasIdMigrationPlan()
+    docs_by_new_id = {}
+    for doc in sas_docs:
+        docs_by_new_id.setdefault(get_new_sas_id(doc), []).append(doc)
+    for new_id, docs in docs_by_new_id.items():
+        legacy_docs = [doc for doc in docs if doc['_id'] != new_id]
+        if len(legacy_docs) < len(docs):
+            plan.unchanged_ids.append(new_id)
+        if is_deleting_legacy_docs:
+            legacy_writes = [{'_id': doc['_id'], '_rev': doc['_rev'], '_deleted': True} for doc in legacy_docs]
+        else:
+            legacy_writes = [dict(doc, isActive=False, updatedAt=updated_at) for doc in legacy_docs
+                             if doc.get('isActive')]
+        copy = None
+        if len(legacy_docs) == len(docs):
+            source = next((doc for doc in legacy_docs if doc.get('isActive')), legacy_docs[-1])
+            copy = {key: value for key, value in source.items() if key != '_rev'}
+            copy['_id'] = new_id
+        migration = SasIdMigration(new_id, copy, legacy_writes)
+        if not migration.is_empty:
+            plan.migrations.append(migration)
+        plan.unchanged_ids.extend(doc['_id'] for doc in legacy_docs if not doc.get('isActive')
+                                  and not is_deleting_legacy_docs)
+    return plan
+
+
+def write_sas_id_migration_plan(db_name, plan: SasIdMigrationPlan, page_size: int = None) -> BulkWriteResult:
+    """
+    It writes the migrations page by page. In each page, the copies are written first, and the SAS with legacy ids
+    of a scope are only deactivated or deleted if its copy is written, so a failed page can be migrated again.
+    """
+    result = BulkWriteResult()
+    for page in iterate_pages(plan.migrations, page_size):
+        copy_result = write_documents_to_topic_db(db_name, [m.copy for m in page if m.copy is not None])
+        result.extend(copy_result)
+        failed_ids = {r.get('id') for r in copy_result.error_results}
+        legacy_writes = [doc for m in page if m.doc_id not in failed_ids for doc in m.legacy_writes]
+        if len(legacy_writes) > 0:
+            result.extend(write_documents_to_topic_db(db_name, legacy_writes))
+    return result
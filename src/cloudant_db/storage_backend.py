@@ -0,0 +1,84 @@
+class StorageBackendError(Exception):
+    """
+    A StorageBackendError is raised by a storage backend when a request is rejected,
+    with the HTTP status code and the seconds to wait before retrying if the backend tells it.
+    """
+    def __init__(self, status_code: int, message: str = None, retry_after: float = None):
+        super().__init__(f'{str(status_code)}: {message}')
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+
+
+class StorageBackend:
+    """
+    A StorageBackend is the interface of the document requests made by the uploaders.
+    The requests and the results follow the CouchDB API, e.g., bulk_docs returns a list of {"id", "rev", "ok"}
+    or {"id", "error", "reason"}, and the find requests return {"docs", "bookmark"}.
+    """
+    def bulk_docs(self, db_name: str, docs: list) -> list:
+        raise NotImplementedError
+
+    def partition_all_docs(self, db_name: str, partition_key: str, include_docs: bool, limit: int = None,
+                           start_key: str = None) -> dict:
+        raise NotImplementedError
+
+    def partition_find(self, db_name: str, partition_key: str, selector: dict, fields: list = None,
+                       limit: int = None, bookmark: str = None) -> dict:
+        raise NotImplementedError
+
+    def find(self, db_name: str, selector: dict, fields: list = None, limit: int = None,
+             bookmark: str = None) -> dict:
+        raise NotImplementedError
+
+    def post_document(self, db_name: str, doc: dict) -> dict:
+        raise NotImplementedError
+
+    def get_database_information(self, db_name: str) -> dict:
+        raise NotImplementedError
+
+
+class CloudantBackend(StorageBackend):
+    """
+    A CloudantBackend sends the requests to IBM Cloudant with a CloudantV1 client.
+    The errors of the SDK are raised as StorageBackendError.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def bulk_docs(self, db_name: str, docs: list) -> list:
+        from ibmcloudant.cloudant_v1 import BulkDocs
+        return self._get_result(lambda: self.client.post_bulk_docs(db=db_name, bulk_docs=BulkDocs(docs=docs)))
+
+    def partition_all_docs(self, db_name: str, partition_key: str, include_docs: bool, limit: int = None,
+                           start_key: str = None) -> dict:
+        return self._get_result(lambda: self.client.post_partition_all_docs(
+            db=db_name, partition_key=partition_key, include_docs=include_docs, limit=limit, start_key=start_key))
+
+    def partition_find(self, db_name: str, partition_key: str, selector: dict, fields: list = None,
+                       limit: int = None, bookmark: str = None) -> dict:
+        return self._get_result(lambda: self.client.post_partition_find(
+            db=db_name, partition_key=partition_key, selector=selector, fields=fields, limit=limit,
+            bookmark=bookmark))
+
+    def find(self, db_name: str, selector: dict, fields: list = None, limit: int = None,
+             bookmark: str = None) -> dict:
+        return self._get_result(lambda: self.client.post_find(
+            db=db_name, selector=selector, fields=fields, limit=limit, bookmark=bookmark))
+
+    def post_document(self, db_name: str, doc: dict) -> dict:
+        return self._get_result(lambda: self.client.post_document(db=db_name, document=doc))
+
+    def get_database_information(self, db_name: str) -> dict:
+        return self._get_result(lambda: self.client.get_database_information(db=db_name))
+
+    @staticmethod
+    def _get_result(request):
+        from ibm_cloud_sdk_core import ApiException
+        try:
+            return request().get_result()
+        except ApiException as e:
+            retry_after = None
+            if e.http_response is not None and str(e.http_response.headers.get('Retry-After', '')).isdigit():
+                retry_after = float(e.http_response.headers.get('Retry-After'))
+            raise StorageBackendError(e.status_code, e.message, retry_after) from e
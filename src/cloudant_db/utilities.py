@@ -1,68 +1,162 @@
 import json
 import os
-from ibmcloudant.cloudant_v1 import CloudantV1, Document, BulkDocs
-from ibm_cloud_sdk_core.authenticators import IAMAuthenticator
-from dotenv import load_dotenv
-
-load_dotenv()
-authenticator = IAMAuthenticator(os.getenv('CLOUDANT_APIKEY'))
-service = CloudantV1(authenticator=authenticator)
-service.set_service_url(os.getenv('CLOUDANT_URL'))
-
-
-def get_db_name_from_env() -> str:
-    return os.getenv('DATABASE_NAME')
+from .bulk_writer import BulkWriter, BulkWriteResult, get_docs_from_bulk_input
+from .client import get_cloudant_client, get_storage_backend, set_storage_backend
+from .config import load_env, get_db_name_from_env, get_page_size_from_env
+from utilities.profiler import count_rows
 
 
 def print_cloudant_env_variables():
+    load_env()
     print(os.getenv('CLOUDANT_URL'))
     print(os.getenv('CLOUDANT_APIKEY'))
     print(os.getenv('DATABASE_NAME'))
 
 
 def print_capacity_throughput_information():
-    response = service.get_capacity_throughput_information().get_result()
+    response = get_cloudant_client().get_capacity_throughput_information().get_result()
     print(json.dumps(response, indent=2))
 
 
 def print_all_dbs_info():
-    db_list = service.get_all_dbs().get_result()
-    response = service.post_dbs_info(keys=db_list).get_result()
+    db_list = get_cloudant_client().get_all_dbs().get_result()
+    response = get_cloudant_client().post_dbs_info(keys=db_list).get_result()
     print(json.dumps(response, indent=2))
 
 
 def create_cloudant_database(new_db_name, is_partitioned):
-    return service.put_database(db=new_db_name, partitioned=is_partitioned).get_result()
+    return get_cloudant_client().put_database(db=new_db_name, partitioned=is_partitioned).get_result()
 
 
 def get_database_info(db_name):
-    return service.get_database_information(db=db_name).get_result()
+    return get_cloudant_client().get_database_information(db=db_name).get_result()
+
+
+def get_update_seq(db_name) -> str:
+    return get_storage_backend().get_database_information(db_name)['update_seq']
 
 
 def create_search_index(db_name, design_doc_name, index_name, index_fields, is_partitioned_index):
     index = {'fields': index_fields}
-    return service.post_index(
+    return get_cloudant_client().post_index(
         db=db_name, ddoc=design_doc_name, name=index_name, index=index, type='json', partitioned=is_partitioned_index)
 
 
 def post_documents_to_topic_db(db_name, docs) -> []:
-    response = service.post_bulk_docs(
-        db=db_name,
-        bulk_docs=docs
-    ).get_result()
-    return response
+    return get_storage_backend().bulk_docs(db_name, list(get_docs_from_bulk_input(docs)))
+
+
+def write_documents_to_topic_db(db_name, docs) -> BulkWriteResult:
+    """
+    It writes the documents in size- and count-bounded batches concurrently, and retries the batches
+    rejected by rate limiting or server errors. The docs can be a json string or a dict having "docs",
+    a BulkDocs, or a list or an iterator of documents.
+    """
+    result = BulkWriter(get_storage_backend(), db_name).write(docs)
+    count_rows(len(result.results))
+    return result
+
+
+def iterate_docs_by_partition_key(db_name, partition_key, include_docs, page_size: int = None):
+    """
+    It yields the rows of the partition from _all_docs page by page, so a partition of any size
+    can be read with a constant memory. The next page starts from the id after the last row of the current page.
+    """
+    page_size = get_page_size_from_env() if page_size is None else page_size
+    start_key = None
+    while True:
+        # one extra row is requested to know whether there is a next page and where it starts
+        response = get_storage_backend().partition_all_docs(
+            db_name,
+            partition_key,
+            include_docs=include_docs,
+            limit=page_size + 1,
+            start_key=start_key
+        )
+        rows = response['rows']
+        yield from rows[:page_size]
+        if len(rows) <= page_size:
+            return
+        start_key = rows[page_size]['id']
+
+
+def iterate_docs_by_partition_key_and_selector(db_name, partition_key, selector, fields: list = None,
+                                               page_size: int = None):
+    """
+    It yields the docs of the partition matching the selector page by page using the bookmark of _find,
+    which otherwise only returns the first 25 docs.
+    """
+    page_size = get_page_size_from_env() if page_size is None else page_size
+    bookmark = None
+    while True:
+        response = get_storage_backend().partition_find(
+            db_name,
+            partition_key,
+            selector=selector,
+            fields=fields,
+            limit=page_size,
+            bookmark=bookmark
+        )
+        docs = response['docs']
+        yield from docs
+        if len(docs) < page_size:
+            return
+        bookmark = response['bookmark']
+
+
+def iterate_docs_by_selector(db_name, selector, fields: list = None, page_size: int = None):
+    """
+    It yields the docs of the database matching the selector page by page using the bookmark of _find.
+    """
+    page_size = get_page_size_from_env() if page_size is None else page_size
+    bookmark = None
+    while True:
+        response = get_storage_backend().find(
+            db_name,
+            selector=selector,
+            fields=fields,
+            limit=page_size,
+            bookmark=bookmark
+        )
+        docs = response['docs']
+        yield from docs
+        if len(docs) < page_size:
+            return
+        bookmark = response['bookmark']
+
+
+def iterate_pages(items, page_size: int = None):
+    """
+    It groups the items of an iterable into lists of at most the page size.
+    """
+    page_size = get_page_size_from_env() if page_size is None else page_size
+    page = []
+    for item in items:
+        page.append(item)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if len(page) > 0:
+        yield page
+
+
+def delete_docs_page_by_page(db_name, rows_or_docs, page_size: int = None) -> BulkWriteResult:
+    """
+    It deletes the given _all_docs rows or _find docs page by page, so only one page is kept in memory,
+    and returns the merged results from the database.
+    """
+    result = BulkWriteResult()
+    for page in iterate_pages(rows_or_docs, page_size):
+        result.extend(write_documents_to_topic_db(db_name, [create_document_for_deletion(d) for d in page]))
+    return result
 
 
 def get_docs_by_partition_key(db_name, partition_key, include_docs) -> []:
-    response = service.post_partition_all_docs(
-        db=db_name,
-        partition_key=partition_key,
-        include_docs=include_docs
-    ).get_result()
-    return response
+    return {'rows': list(iterate_docs_by_partition_key(db_name, partition_key, include_docs))}
 
 
-def create_bulk_docs_from_docs_result_rows_for_deletion(docs_result_rows) -> BulkDocs:
+def create_bulk_docs_from_docs_result_rows_for_deletion(docs_result_rows) -> 'BulkDocs':
+    from ibmcloudant.cloudant_v1 import Document, BulkDocs
     bulk_docs = BulkDocs(docs=[])
     for row in docs_result_rows['rows']:
         doc = Document(
@@ -74,97 +168,106 @@ def create_bulk_docs_from_docs_result_rows_for_deletion(docs_result_rows) -> Bul
     return bulk_docs
 
 
-def get_docs_by_partition_key_excluding_a_given_doc_type(db_name, partition_key, excluding_doc_type):
-    response = service.post_partition_find(
-        db=db_name,
-        partition_key=partition_key,
+def iterate_docs_by_partition_key_excluding_a_given_doc_type(db_name, partition_key, excluding_doc_type,
+                                                             fields: list = None, page_size: int = None):
+    return iterate_docs_by_partition_key_and_selector(
+        db_name,
+        partition_key,
         selector={
             "$not": {
                 "docType": excluding_doc_type
             }
-        }
-    ).get_result()
-    return response
+        },
+        fields=fields,
+        page_size=page_size
+    )
 
 
-def create_bulk_docs_for_deletion_from_database_result(db_result) -> BulkDocs:
+def get_docs_by_partition_key_excluding_a_given_doc_type(db_name, partition_key, excluding_doc_type):
+    return {'docs': list(iterate_docs_by_partition_key_excluding_a_given_doc_type(db_name, partition_key,
+                                                                                  excluding_doc_type))}
+
+
+def create_bulk_docs_for_deletion_from_database_result(db_result) -> 'BulkDocs':
+    from ibmcloudant.cloudant_v1 import BulkDocs
     bulk_docs = BulkDocs(docs=[])
 
     if 'rows' in db_result:
         for row in db_result['rows']:
-            doc = Document(
-                _id=row['id'],
-                _rev=row['value']['rev'],
-                _deleted=True
-            )
-            bulk_docs.docs.append(doc)
+            bulk_docs.docs.append(create_document_for_deletion(row))
     if 'docs' in db_result:
         for document in db_result['docs']:
-            doc = Document(
-                _id=document['_id'],
-                _rev=document['_rev'],
-                _deleted=True
-            )
-            bulk_docs.docs.append(doc)
+            bulk_docs.docs.append(create_document_for_deletion(document))
     return bulk_docs
 
 
-def get_docs_by_partition_key_and_a_given_doc_type(db_name, partition_key, doc_type):
-    response = service.post_partition_find(
-        db=db_name,
-        partition_key=partition_key,
+def create_document_for_deletion(row_or_doc) -> 'Document':
+    # the Cloudant SDK is only imported when its models are created, not on the import of the utilities
+    from ibmcloudant.cloudant_v1 import Document
+    # a row from _all_docs has "id" and "value.rev" while a doc from _find has "_id" and "_rev"
+    if 'value' in row_or_doc:
+        return Document(_id=row_or_doc['id'], _rev=row_or_doc['value']['rev'], _deleted=True)
+    return Document(_id=row_or_doc['_id'], _rev=row_or_doc['_rev'], _deleted=True)
+
+
+def iterate_docs_by_partition_key_and_a_given_doc_type(db_name, partition_key, doc_type, fields: list = None,
+                                                       page_size: int = None):
+    return iterate_docs_by_partition_key_and_selector(
+        db_name,
+        partition_key,
         selector={
             "docType": doc_type
-        }
-    ).get_result()
-    return response
+        },
+        fields=fields,
+        page_size=page_size
+    )
+
+
+def get_docs_by_partition_key_and_a_given_doc_type(db_name, partition_key, doc_type):
+    return {'docs': list(iterate_docs_by_partition_key_and_a_given_doc_type(db_name, partition_key, doc_type))}
 
 
 def get_active_docs_by_doc_type_and_scope(db_name, doc_type, scope):
-    response = service.post_find(
-        db=db_name,
+    return {'docs': list(iterate_docs_by_selector(
+        db_name,
         selector={
             "docType": doc_type,
             "scope": scope,
             "isActive": True
         }
-    ).get_result()
-    return response
+    ))}
 
 
 def get_docs_by_doc_type(db_name, doc_type):
-    return service.post_find(
-        db=db_name,
+    return {'docs': list(iterate_docs_by_selector(
+        db_name,
         selector={
             "docType": doc_type
         }
-    ).get_result()
+    ))}
 
 
 def get_all_topic_config_id_and_name(db_name):
-    return service.post_find(
-        db=db_name,
+    return {'docs': list(iterate_docs_by_selector(
+        db_name,
         fields=['_id', 'name'],
         selector={'docType': 'topicConfig'}
-    ).get_result()
+    ))}
 
 
 def get_active_surveys_by_partition_key(db_name, partition_key, survey_type):
-    return service.post_partition_find(
-        db=db_name,
-        partition_key=partition_key,
+    return {'docs': list(iterate_docs_by_partition_key_and_selector(
+        db_name,
+        partition_key,
         selector={
             'surveyType': survey_type,
             'isActive': True
         }
-    ).get_result()
+    ))}
 
 
 def put_a_document(db_name, doc):
-    return service.post_document(
-        db=db_name,
-        document=doc
-    ).get_result()
+    return get_storage_backend().post_document(db_name, doc)
 
 
 def confirm_database_environment_variable():
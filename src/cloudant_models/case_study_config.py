@@ -1,4 +1,10 @@
-class CaseStudyConfig:
+from .model import Model
+
+
+class CaseStudyConfig(Model):
+    __slots__ = ('docType', '_id', 'organizationName', 'orgId', 'spreadSheetRefId', 'name', 'description', 'objectives',
+                 'tags')
+
     def __init__(
             self,
             _id,
@@ -1,4 +1,10 @@
-class CaseStudySection:
+from .model import Model
+
+
+class CaseStudySection(Model):
+    __slots__ = ('docType', '_id', 'parentId', 'spreadSheetRefId', 'name', 'description', 'objectives', 'hasExercises',
+                 'contentElements')
+
     def __init__(self,
                  _id,
                  parent_id,
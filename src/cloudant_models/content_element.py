@@ -1,4 +1,11 @@
-class ContentElement:
+from .model import Model
+
+
+class ContentElement(Model):
+    __slots__ = ('parentId', 'spreadSheetRefId', 'contentElementType', 'description', 'sourceUrl',
+                 'additionalLearningMaterialIds')
+    optional_fields = ('sourceUrl', 'additionalLearningMaterialIds')
+
     def __init__(self,
                  parent_id,
                  spread_sheet_ref_id,
@@ -1,3 +1,8 @@
-class Documents:
+from .model import Model
+
+
+class Documents(Model):
+    __slots__ = ('docs',)
+
     def __init__(self, docs):
         self.docs = docs
@@ -1,4 +1,10 @@
-class Exercise:
+from .model import Model
+
+
+class Exercise(Model):
+    __slots__ = ('_id', 'docType', 'name', 'description', 'objectives', 'level', 'questions',
+                 'learningModuleReferenceId', 'topicConfigId')
+
     def __init__(self, _id, name, description, objectives, level, questions, learning_module_reference_id, topic_config_id):
         self._id = _id
         self.docType = 'exercise'
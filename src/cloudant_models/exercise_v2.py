@@ -1,4 +1,11 @@
-class ExerciseV2:
+from .model import Model
+
+
+class ExerciseV2(Model):
+    __slots__ = ('docType', '_id', 'name', 'description', 'objectives', 'level', 'questions', 'parentId',
+                 'spreadSheetRefId', 'topicConfigId', 'learningModuleReferenceId', 'solutionId',
+                 'additionalLearningMaterialIds')
+
     def __init__(self,
                  _id,
                  name,
@@ -1,7 +1,11 @@
 import pandas as pd
+from .model import Model
 
 
-class LearningMaterial:
+class LearningMaterial(Model):
+    __slots__ = ('_id', 'format', 'docType', 'sourceUrl', 'level', 'name', 'description', 'learningModuleReferenceId',
+                 'topicConfigId')
+
     def __init__(self, _id, format, source_url, level, name, description, learning_module_reference_id, topic_config_id):
         self._id = _id
         self.format = format
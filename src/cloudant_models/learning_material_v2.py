@@ -1,4 +1,10 @@
-class LearningMaterialV2:
+from .model import Model
+
+
+class LearningMaterialV2(Model):
+    __slots__ = ('docType', '_id', 'format', 'sourceUrl', 'level', 'name', 'description', 'learningModuleReferenceId',
+                 'topicConfigId', 'parentId', 'spreadSheetRefId')
+
     def __init__(self, _id, material_format, source_url, level, name, description,
                  learning_module_reference_id, topic_config_id, parent_id, spread_sheet_ref_id):
         self.docType = "learningMaterial"
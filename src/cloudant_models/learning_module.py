@@ -1,5 +1,9 @@
+from .model import Model
+
+
+class LearningModule(Model):
+    __slots__ = ('referenceId', 'name', 'description', 'objectives')
 
-class LearningModule:
     def __init__(self, reference_id, name, description, objectives):
         self.referenceId = reference_id
         self.name = name
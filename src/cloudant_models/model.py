@@ -0,0 +1,45 @@
+from operator import attrgetter
+
+
+class Model:
+    """
+    A Model is the base of the document models. A model declares its properties in __slots__,
+    in the order they are written to the json, so its instances do not carry a __dict__.
+    The properties in optional_fields are left out of to_dict when they are None,
+    e.g., the image url of a question without an image. The top-level properties of a document are never optional,
+    because a Mango selector matching null does not match a missing property.
+    """
+    __slots__ = ()
+    optional_fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the getter of all the slots is built once per class, to_dict does not look up the attributes by name
+        cls.fields = tuple(cls.__slots__)
+        get_values = attrgetter(*cls.fields)
+        # attrgetter of a single attribute returns the value instead of a tuple
+        cls._get_values = staticmethod(get_values if len(cls.fields) > 1 else lambda model: (get_values(model),))
+        cls._optional_fields = frozenset(cls.optional_fields)
+
+    def iterate_items(self):
+        """
+        It yields the properties of the model as (name, value) in the order of the slots, without converting the values.
+        """
+        for field, value in zip(self.fields, self._get_values(self)):
+            if value is None and field in self._optional_fields:
+                continue
+            yield field, value
+
+    def to_dict(self) -> dict:
+        """
+        It returns the properties of the model as a dict, where the nested models are also converted.
+        """
+        return {field: to_plain_value(value) for field, value in self.iterate_items()}
+
+
+def to_plain_value(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if type(value) is list:
+        return [to_plain_value(item) for item in value]
+    return value
@@ -1,4 +1,9 @@
-class Option:
+from .model import Model
+
+
+class Option(Model):
+    __slots__ = ('label', 'value')
+
     def __init__(self, label: str, value: str):
         self.label = label
         self.value = value
@@ -1,4 +1,9 @@
-class OptionWithoutAnnotation:
+from .model import Model
+
+
+class OptionWithoutAnnotation(Model):
+    __slots__ = ('label', 'value')
+
     def __init__(self, label, value):
         self.label = label
         self.value = value
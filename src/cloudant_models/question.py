@@ -1,9 +1,14 @@
 import pandas as pd
 from typing import List
 from .option import Option
+from .model import Model
 
 
-class Question:
+class Question(Model):
+    __slots__ = ('description', 'imageUrl', 'optionHeader', 'options', 'answer', 'feedbackForCorrectAnswer',
+                 'feedbackForIncorrectAnswer', 'referenceId')
+    optional_fields = ('imageUrl',)
+
     def __init__(
             self,
             description,
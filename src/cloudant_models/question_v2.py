@@ -1,4 +1,11 @@
-class QuestionV2:
+from .model import Model
+
+
+class QuestionV2(Model):
+    __slots__ = ('referenceId', 'description', 'imageUrl', 'optionHeader', 'options', 'answer',
+                 'feedbackForCorrectAnswer', 'feedbackForIncorrectAnswer', 'additionalLearningMaterialId', 'tags')
+    optional_fields = ('imageUrl', 'additionalLearningMaterialId')
+
     def __init__(self,
                  reference_id,
                  description,
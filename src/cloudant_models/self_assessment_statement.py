@@ -1,4 +1,10 @@
-class SelfAssessmentStatement:
+from .model import Model
+
+
+class SelfAssessmentStatement(Model):
+    __slots__ = ('_id', 'docType', 'description', 'scope', 'scopeRefId', 'scopeName', 'createdAt', 'updatedAt',
+                 'isActive')
+
     def __init__(self, doc_id, statement, scope, scope_ref_id, scope_name, created_at, updated_at, is_active):
         self._id = doc_id
         self.docType = 'selfAssessmentStatement'
@@ -9,3 +15,11 @@ class SelfAssessmentStatement:
         self.createdAt = created_at
         self.updatedAt = updated_at
         self.isActive = is_active
+
+
+def get_self_assessment_statement_id(partition_key: str, scope: str, scope_ref_id: str) -> str:
+    """
+    It returns the id of the self-assessment statement of the scope, e.g., "org-topic:sas_exercise_org-topic:1.2".
+    The id only depends on the scope, so parsing the same statement again gives the same id.
+    """
+    return f'{partition_key}:sas_{scope}_{scope_ref_id}'
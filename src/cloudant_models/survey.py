@@ -1,8 +1,12 @@
 from typing import List
 from .survey_section import SurveySection
+from .model import Model
 
 
-class Survey:
+class Survey(Model):
+    __slots__ = ('_id', 'orgId', 'docType', 'surveyType', 'name', 'description', 'sections', 'createdAt', 'updatedAt',
+                 'isActive')
+
     def __init__(self,
                  doc_id,
                  org_id,
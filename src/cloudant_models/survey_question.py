@@ -1,9 +1,13 @@
 from typing import List
 from .option_without_annotation import OptionWithoutAnnotation
 import pandas
+from .model import Model
 
 
-class SurveyQuestion:
+class SurveyQuestion(Model):
+    __slots__ = ('questionType', 'description', 'referenceId', 'isSelfAssessmentStatement', 'expectedInputType',
+                 'optionHeader', 'options')
+
     def __init__(self,
                  reference_id,
                  question_type,
@@ -1,9 +1,12 @@
 from typing import List
 
 from .survey_question import SurveyQuestion
+from .model import Model
 
 
-class SurveySection:
+class SurveySection(Model):
+    __slots__ = ('referenceId', 'name', 'description', 'questions')
+
     def __init__(self, reference_id, name, description, questions: List[SurveyQuestion]):
         self.referenceId = reference_id
         self.name = name
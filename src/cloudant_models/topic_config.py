@@ -1,4 +1,10 @@
-class TopicConfig:
+from .model import Model
+
+
+class TopicConfig(Model):
+    __slots__ = ('docType', '_id', 'organizationName', 'orgId', 'topicId', 'name', 'description', 'objectives',
+                 'learningModules', 'isAvailable', 'tags')
+
     def __init__(
             self,
             _id,
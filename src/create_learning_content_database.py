@@ -1,32 +1,37 @@
 import argparse
 import json
-from cloudant_db.utilities import create_cloudant_database, create_search_index, get_database_info
-from ibm_cloud_sdk_core import ApiException
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
 
 
 def main():
     args = parse_args()
+    start_profiling_by_args(args)
+    # the Cloudant SDK is imported after the arguments are parsed, so --help does not pay for it
+    from cloudant_db.utilities import create_cloudant_database, create_search_index, get_database_info
+    from ibm_cloud_sdk_core import ApiException
     db_name = args.new_database_name
     print(f"Start creating a cloudant database for learning topics, case studies, and self-assessment surveys: {db_name}")
     try:
-        create_cloudant_database(db_name, True)
-
-        design_doc_name = 'globalIndexes'
-        index_name = 'byDocType'
-        fields = ['docType']
-        is_partitioned_index = False
-        create_search_index(db_name, design_doc_name,index_name,fields,is_partitioned_index)
-
-        design_doc_name = 'partitionedIndexes'
-        index_name = 'partitionedIndexByDocType'
-        is_partitioned_index = True
-        create_search_index(db_name, design_doc_name, index_name, fields, is_partitioned_index)
-
-        design_doc_name = 'partitionedIndexes'
-        index_name = 'partitionedIndexByIsActive'
-        fields = ['isActive']
-        is_partitioned_index = True
-        create_search_index(db_name, design_doc_name, index_name, fields, is_partitioned_index)
+        with profile_stage('create database'):
+            create_cloudant_database(db_name, True)
+
+        with profile_stage('create search indexes'):
+            design_doc_name = 'globalIndexes'
+            index_name = 'byDocType'
+            fields = ['docType']
+            is_partitioned_index = False
+            create_search_index(db_name, design_doc_name,index_name,fields,is_partitioned_index)
+
+            design_doc_name = 'partitionedIndexes'
+            index_name = 'partitionedIndexByDocType'
+            is_partitioned_index = True
+            create_search_index(db_name, design_doc_name, index_name, fields, is_partitioned_index)
+
+            design_doc_name = 'partitionedIndexes'
+            index_name = 'partitionedIndexByIsActive'
+            fields = ['isActive']
+            is_partitioned_index = True
+            create_search_index(db_name, design_doc_name, index_name, fields, is_partitioned_index)
 
         db_info = get_database_info(db_name)
         db_info = json.dumps(db_info, indent=4)
@@ -42,6 +47,7 @@ def parse_args():
                                                  design documents for the configurations of learning topics, \
                                                  case studies, and self-assessment surveys')
     parser.add_argument('new_database_name', help='Give the name of the new database')
+    add_profile_arguments(parser)
     return parser.parse_args()
 
 
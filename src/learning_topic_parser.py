@@ -1,8 +1,6 @@
 import argparse
 import sys
 
-import jsonpickle
-
 from parsers.meta_questions_parser import parse_excel_to_meta_questions
 from cloudant_models.documents import Documents
 from parsers.meta_exercises_parser import parse_excel_to_meta_exercises
@@ -11,21 +9,52 @@ from parsers.associations_parser import add_questions_to_exercises
 from parsers.topic_config_parser import parse_excel_to_topic_config
 from parsers.meta_learning_materials_parser import parse_excel_meta_learning_materials
 from parsers.self_assessment_statements_parser import parse_excel_to_self_assessment_statements
+from utilities.workbook_session import WorkbookSession
+from utilities.parse_cache import create_parse_cache, add_parse_cache_arguments
+from utilities.json_serializer import write_output_file, add_output_file_arguments, get_output_file
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
+from validators.excel_validator import check_required_columns_have_values_by_regex
+from validators.validation_message import ValidationMessage
+from validators.validation_report import ValidationReport, add_validation_report_arguments, \
+    finish_validation_report
 
 
 def main():
     print("Starting learning topic parser...")
     try:
         args = parse_args()
-        docs = parse_excel_to_documents(args)
-        docs_json = jsonpickle.encode(docs, unpicklable=False)
-        with open("output/parsed-result.json", "w") as outfile:
-            outfile.write(docs_json)
+        start_profiling_by_args(args)
+        parse_excel_file_to_topic_json_file(args, get_output_file(args, 'output/parsed-result'))
         # print(f"Program terminating with exit code {res}")
         sys.exit("done")
     except RuntimeError as e:
         # Errors from argument parsing and ui creation are caught here
         print(e)
+    except AssertionError as e:
+        print('\nError: ' + str(e))
+        sys.exit('Parsing is aborted.')
+
+
+def parse_excel_file_to_topic_json_file(args, output_file):
+    """
+    It parses the excel file of the args, or takes the result from the parse cache
+    if the file has not changed, and writes the json of the learning topic documents to the output file.
+    """
+    parse_cache = create_parse_cache(args)
+    cache_key = parse_cache.get_key(args.excel_file[0], 'learning-topic', args.ndjson)
+    if parse_cache.copy_to_file(cache_key, output_file):
+        print('\nThe excel file has not changed since it was last parsed, the cached result is used.')
+        return
+    with create_topic_workbook_session(args.excel_file[0]) as workbook:
+        if args.collect_all:
+            with profile_stage('validate excel file'):
+                report = validate_topic_excel_file(workbook, ValidationReport(fail_fast=False,
+                                                                              header_rows=workbook.header_rows))
+            finish_validation_report(report, args.report_file)
+        docs = parse_excel_to_documents(workbook)
+    with profile_stage('write output file'):
+        write_output_file(docs, output_file, args.ndjson)
+    parse_cache.put_file(cache_key, output_file)
 
 
 def parse_args():
@@ -33,23 +62,79 @@ def parse_args():
         an excel file and attempts to convert it into a json object')
     parser.add_argument('excel_file', metavar='excel_file', nargs=1,
                         help='The excel file containing questions')
+    add_validation_report_arguments(parser)
+    add_parse_cache_arguments(parser)
+    add_output_file_arguments(parser, 'output/parsed-result')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     return args
 
 
-def parse_excel_to_documents(args) -> Documents:
+def get_topic_sheet_names() -> tuple:
+    return 'Topic', 'Learning Modules', 'Learning Materials', 'Exercises', 'Questions'
+
+
+def get_topic_sheet_header_rows() -> dict:
+    # the learning materials and the exercises sheets show instruction in the first row
+    return {'Learning Materials': 1, 'Exercises': 1}
+
+
+def create_topic_workbook_session(excel_file) -> WorkbookSession:
+    return WorkbookSession(excel_file, get_topic_sheet_header_rows())
+
+
+def validate_topic_excel_file(workbook: WorkbookSession, report: ValidationReport = None) -> ValidationReport:
+    """
+    It checks the learning topic excel file has all the sheets and the required values which the parsers
+    would otherwise raise at one by one, so they can be collected in a report before parsing.
+    """
+    print("\nValidate excel file...")
+    if report is None:
+        report = ValidationReport(fail_fast=True, header_rows=get_topic_sheet_header_rows())
+    missing_sheet_names = [sheet for sheet in get_topic_sheet_names() if sheet not in workbook.sheet_names]
+    for sheet in missing_sheet_names:
+        report.add(ValidationMessage(False, f'"{sheet}" sheet is missing from the excel file.', sheet))
+
+    # only the topic and the learning module sheets have required columns for every row
+    for sheet, check_first_row_only in (('Topic', True), ('Learning Modules', False)):
+        if sheet in missing_sheet_names:
+            continue
+        print(f'\nInspect "{sheet}" sheet...')
+        pattern = r'^\*'
+        print(f'Check if the required columns matching the regex pattern {pattern} have value(s):', end=' ')
+        check_required_columns_have_values = report.check(sheet, check_required_columns_have_values_by_regex,
+                                                          sheet, workbook.get_sheet(sheet), pattern,
+                                                          check_first_row_only)
+        if check_required_columns_have_values.is_valid:
+            print(check_required_columns_have_values.message, 'OK!')
+    print("\nComplete learning topic excel file validation.")
+    return report
+
+
+def parse_excel_to_documents(workbook: WorkbookSession) -> Documents:
+    """
+    It parses the sheets of the learning topic excel file into documents. Each sheet is read once by the workbook,
+    e.g., the exercises sheet is shared by the exercises and the self-assessment statements.
+    """
     documents = Documents([])
 
-    topic_config = parse_excel_to_topic_config(args)
-    topic_config.learningModules = parse_excel_to_learning_modules(args, topic_config)
+    with profile_stage('parse topic config'):
+        topic_config = parse_excel_to_topic_config(workbook)
+    with profile_stage('parse learning modules'):
+        topic_config.learningModules = parse_excel_to_learning_modules(workbook, topic_config)
 
-    meta_learning_materials = parse_excel_meta_learning_materials(args, topic_config)
+    with profile_stage('parse learning materials'):
+        meta_learning_materials = parse_excel_meta_learning_materials(workbook, topic_config)
 
-    meta_exercises = parse_excel_to_meta_exercises(args, topic_config)
-    meta_questions = parse_excel_to_meta_questions(args)
-    add_questions_to_exercises(meta_questions, meta_exercises)
+    with profile_stage('parse exercises'):
+        meta_exercises = parse_excel_to_meta_exercises(workbook, topic_config)
+    with profile_stage('parse questions'):
+        meta_questions = parse_excel_to_meta_questions(workbook)
+    with profile_stage('add questions to exercises'):
+        add_questions_to_exercises(meta_questions, meta_exercises)
 
-    self_assessment_statements = parse_excel_to_self_assessment_statements(args, topic_config)
+    with profile_stage('parse self-assessment statements'):
+        self_assessment_statements = parse_excel_to_self_assessment_statements(workbook, topic_config)
 
     documents.docs.append(topic_config)
 
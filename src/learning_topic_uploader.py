@@ -1,12 +1,11 @@
 import argparse
 import json
 import sys
-from cloudant_db.utilities import get_db_name_from_env, post_documents_to_topic_db, get_docs_by_partition_key, \
-    create_bulk_docs_for_deletion_from_database_result, get_docs_by_partition_key_excluding_a_given_doc_type, \
-    get_docs_by_partition_key_and_a_given_doc_type
+from cloudant_db.config import get_db_name_from_env
+from cloudant_db.bulk_writer import BulkWriteResult
 from parsers.parser_utilities import get_now_in_unix_milliseconds
-
-topic_db_name = get_db_name_from_env()
+from utilities.json_stream import load_json_docs, JsonFileArray
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
 
 
 def main():
@@ -15,19 +14,28 @@ def main():
     try:
         # load the json file from argument
         args = parse_args()
-        with open(args.json_file[0], 'r') as file:
-            docs_str = file.read()
-            docs_dict = json.loads(docs_str)
-
-        input_validation(docs_dict)
-
-        partition_key = docs_dict['docs'][0]['_id'].split(':')[0]
-        existing_docs = get_docs_by_partition_key(topic_db_name, partition_key, include_docs=False)
-
-        if len(existing_docs['rows']) > 0:
-            print('\nFound existing document(s) from the database:')
-            print(json.dumps(existing_docs, indent=2))
-            print('\nThere are totally ' + str(len(existing_docs['rows'])) +
+        start_profiling_by_args(args)
+        # the docs are read from the file one at a time whenever they are iterated, instead of loading the file
+        docs_dict = load_json_docs(args.json_file[0])
+
+        with profile_stage('validate json'):
+            input_validation(docs_dict)
+
+        partition_key = next(iter(docs_dict['docs']))['_id'].split(':')[0]
+        if args.sync or args.dry_run:
+            # only write the differences between the json file and the existing documents
+            with profile_stage('sync non-SAS documents'):
+                sync_non_sas_documents_of_same_partition_key(partition_key, docs_dict, args.dry_run)
+            with profile_stage('create or update SAS documents'):
+                create_or_update_sas_documents_of_same_partition_key(partition_key, docs_dict, args.dry_run)
+            sys.exit('\nTopic Uploader is finished.' if not args.dry_run
+                     else '\nDry run is completed, no changes have been made.')
+
+        with profile_stage('list existing documents'):
+            n_existing_docs = print_existing_docs_of_partition_key(partition_key)
+
+        if n_existing_docs > 0:
+            print('\nThere are totally ' + str(n_existing_docs) +
                   ' documents in the database using the same partition key: ' + partition_key)
             # ask if the user want to abort the action or continue to replace all non SAS-type documents and
             # to update existing SAS documents
@@ -36,16 +44,20 @@ def main():
                                '(Type "yes" to continue or any other key to abort)\n')
 
             if user_input.lower() == 'yes':
-                replace_existing_non_sas_documents_of_same_partition_key(partition_key, docs_dict)
+                with profile_stage('replace non-SAS documents'):
+                    replace_existing_non_sas_documents_of_same_partition_key(partition_key, docs_dict)
                 # create or update SAS documents
-                create_or_update_sas_documents_of_same_partition_key(partition_key, docs_dict)
+                with profile_stage('create or update SAS documents'):
+                    create_or_update_sas_documents_of_same_partition_key(partition_key, docs_dict)
             else:
                 print('\nAborting the process...')
                 print('\nNo documents are changed.')
         else:
             # upload the json to the database if it passes the validation
             print('\nPost the json object to the topic database...')
-            post_results = post_documents_to_topic_db(topic_db_name, docs_str)
+            from cloudant_db.utilities import write_documents_to_topic_db
+            with profile_stage('write documents'):
+                post_results = write_documents_to_topic_db(get_db_name_from_env(), docs_dict)
             print_db_result(post_results, 'created', 'new')
 
         sys.exit('\nTopic Uploader is finished.')
@@ -58,7 +70,12 @@ def main():
 def parse_args():
     parser = argparse.ArgumentParser(description='Topic Uploader uploads a valid JSON to the topic database.')
     parser.add_argument('json_file', metavar='json_file', nargs=1,
-                        help='The resulted json file from learning_topic_parser.py')
+                        help='The resulted json or ndjson file from learning_topic_parser.py')
+    parser.add_argument('--sync', action='store_true',
+                        help='Only create, update and delete the documents which differ from the existing ones')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the changes of --sync without writing anything to the database')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     return args
 
@@ -69,95 +86,108 @@ def input_validation(dict_object):
     if 'docs' not in dict_object:
         raise AssertionError('"docs" is missing from the json')
 
-    if type(dict_object['docs']) is not list:
+    if not isinstance(dict_object['docs'], (list, JsonFileArray)):
         raise AssertionError('"docs" should be an array')
 
+    try:
+        # counting the docs of a file reads the whole file, so an invalid json is found before uploading
+        n_docs = len(dict_object['docs'])
+    except ValueError as e:
+        raise AssertionError(str(e))
+    if n_docs == 0:
+        raise AssertionError('"docs" should not be empty')
+
     print('The input object seems valid.')
 
 
+def print_existing_docs_of_partition_key(partition_key) -> int:
+    # the database modules are imported after the arguments are parsed, so --help does not pay for them
+    from cloudant_db.utilities import iterate_docs_by_partition_key
+    # the rows are read and printed page by page instead of loading the whole partition
+    n_existing_docs = 0
+    for row in iterate_docs_by_partition_key(get_db_name_from_env(), partition_key, include_docs=False):
+        if n_existing_docs == 0:
+            print('\nFound existing document(s) from the database:')
+        print(json.dumps(row))
+        n_existing_docs += 1
+    return n_existing_docs
+
+
 def replace_existing_non_sas_documents_of_same_partition_key(partition_key, json_dict):
     print('\nReplacing the existing non-SAS documents...')
+    from cloudant_db.utilities import iterate_docs_by_partition_key_excluding_a_given_doc_type, \
+        delete_docs_page_by_page, write_documents_to_topic_db
+    topic_db_name = get_db_name_from_env()
 
     excluding_doc_type = 'selfAssessmentStatement'
 
     # get all existing non-SAS documents using the same partition key
-    existing_docs_result = get_docs_by_partition_key_excluding_a_given_doc_type(topic_db_name, partition_key,
-                                                                                excluding_doc_type)
+    existing_docs = iterate_docs_by_partition_key_excluding_a_given_doc_type(topic_db_name, partition_key,
+                                                                             excluding_doc_type, fields=['_id', '_rev'])
     # delete the documents
-    bulk_doc = create_bulk_docs_for_deletion_from_database_result(existing_docs_result)
-    deletion_result = post_documents_to_topic_db(topic_db_name, bulk_doc)
-    print('\nDeleted ' + str(len(deletion_result)) + ' existing documents of the same partition key which are not '+
-          excluding_doc_type + '.')
+    deletion_result = delete_docs_page_by_page(topic_db_name, existing_docs)
+    print('\nDeleted ' + str(len(deletion_result.ok_results)) + ' existing documents of the same partition key '
+          'which are not ' + excluding_doc_type + '.')
+    if len(deletion_result.error_results) > 0:
+        deletion_result.print_summary()
+        raise AssertionError('Some existing documents cannot be deleted, no new documents are created.')
 
     # create documents using the json dict
     print('\nCreating non-SAS documents...')
-    docs_excluding_sas = {'docs': list(filter(lambda doc: doc['docType'] != excluding_doc_type, json_dict['docs']))}
-    creation_result = post_documents_to_topic_db(topic_db_name, docs_excluding_sas)
+    docs_excluding_sas = {'docs': (doc for doc in json_dict['docs'] if doc['docType'] != excluding_doc_type)}
+    creation_result = write_documents_to_topic_db(topic_db_name, docs_excluding_sas)
     print_db_result(creation_result, 'created', 'non-SAS')
 
 
-def create_or_update_sas_documents_of_same_partition_key(partition_key, json_dict):
+def sync_non_sas_documents_of_same_partition_key(partition_key, json_dict, is_dry_run: bool):
+    print('\nCompare the non-SAS documents with the existing ones...')
+    from cloudant_db.utilities import iterate_docs_by_partition_key_excluding_a_given_doc_type, \
+        write_documents_to_topic_db
+    from cloudant_db.change_set import create_change_set
+    topic_db_name = get_db_name_from_env()
+    excluding_doc_type = 'selfAssessmentStatement'
+    existing_docs = iterate_docs_by_partition_key_excluding_a_given_doc_type(topic_db_name, partition_key,
+                                                                             excluding_doc_type)
+    parsed_docs = [doc for doc in json_dict['docs'] if doc['docType'] != excluding_doc_type]
+    change_set = create_change_set(parsed_docs, existing_docs)
+    change_set.print_change_set()
+    if is_dry_run:
+        return
+    if change_set.is_empty:
+        print('The existing non-SAS documents are up to date.')
+        return
+    sync_result = write_documents_to_topic_db(topic_db_name, change_set.get_docs_to_write())
+    print_db_result(sync_result, 'created, updated or deleted', 'non-SAS')
+
+
+def create_or_update_sas_documents_of_same_partition_key(partition_key, json_dict, is_dry_run: bool = False):
     print('\nCreate or update SAS documents...')
+    from cloudant_db.utilities import get_docs_by_partition_key_and_a_given_doc_type, write_documents_to_topic_db
+    from cloudant_db.sas_merge import create_sas_merge_plan
+    topic_db_name = get_db_name_from_env()
     # filter parsed sas documents
     sas_doc_type = 'selfAssessmentStatement'
-    parsed_sas_docs = {'docs': list(filter(lambda doc: doc['docType'] == sas_doc_type, json_dict['docs']))}
+    parsed_sas_docs = [doc for doc in json_dict['docs'] if doc['docType'] == sas_doc_type]
     existing_sas_docs = get_docs_by_partition_key_and_a_given_doc_type(topic_db_name, partition_key, sas_doc_type)
     print('\nThere are ' + str(len(existing_sas_docs['docs'])) + ' existing SAS documents in the database.')
-    # create or update SAS documents
-    prepared_sas_docs = prepare_sas_docs(parsed_sas_docs, existing_sas_docs)
-    if len(prepared_sas_docs['docs']) > 0:
-        update_result = post_documents_to_topic_db(topic_db_name, prepared_sas_docs)
+    # create, update or deactivate SAS documents by their scopeRefId
+    sas_merge_plan = create_sas_merge_plan(parsed_sas_docs, existing_sas_docs['docs'], get_now_in_unix_milliseconds())
+    sas_merge_plan.print_plan()
+    if is_dry_run:
+        return
+    if not sas_merge_plan.is_empty:
+        update_result = write_documents_to_topic_db(topic_db_name, {'docs': sas_merge_plan.get_docs_to_write()})
         print_db_result(update_result, 'updated or created', 'SAS')
     else:
         print('There is no SAS document to be created or updated.')
 
 
-def prepare_sas_docs(parsed_sas_docs, existing_sas_docs):
-    sas_docs = {'docs': []}
-    if len(parsed_sas_docs['docs']) == 0 and len(existing_sas_docs['docs']) == 0:
-        return sas_docs
-    if len(parsed_sas_docs['docs']) > 0 and len(existing_sas_docs['docs']) == 0:
-        return parsed_sas_docs
-    if len(parsed_sas_docs['docs']) == 0 and len(existing_sas_docs['docs']) > 0:
-        for existing_doc in existing_sas_docs['docs']:
-            existing_doc['isActive'] = False
-            existing_doc['updatedAt'] = get_now_in_unix_milliseconds()
-        return existing_sas_docs
-    # if an existing SAS is found in the parsed SAS docs, it is an update by the parsed SAS doc
-    # if an existing SAS cannot be found in the docs, the existing SAS should be marked isActive False
-    for existing_doc in existing_sas_docs['docs']:
-        found_parsed_doc = next(
-            (d for d in parsed_sas_docs['docs'] if d['scopeRefId'] == existing_doc['scopeRefId']),
-            None
-        )
-        if found_parsed_doc is not None:
-            found_parsed_doc['_id'] = existing_doc['_id']
-            found_parsed_doc['_rev'] = existing_doc['_rev']
-            found_parsed_doc['updatedAt'] = found_parsed_doc['createdAt']
-            found_parsed_doc['createdAt'] = existing_doc['createdAt']
-            sas_docs['docs'].append(found_parsed_doc)
-        else:
-            existing_doc['isActive'] = False
-            existing_doc['updatedAt'] = get_now_in_unix_milliseconds()
-            sas_docs['docs'].append(existing_doc)
-    # if a parsed SAS is found in the sas_docs, it is an update and should not be appended again
-    # if a parsed SAS is not found, it is a new document and should be appended to the sas_docs
-    for parsed_sas_doc in parsed_sas_docs['docs']:
-        found_sas_doc = next(
-            (d for d in sas_docs['docs'] if d['scopeRefId'] == parsed_sas_doc['scopeRefId']),
-            None
-        )
-        if found_sas_doc is not None:
-            continue
-        else:
-            sas_docs['docs'].append(parsed_sas_doc)
-    return sas_docs
-
-
-def print_db_result(db_result, action_str, doc_type_str):
+def print_db_result(db_result: BulkWriteResult, action_str, doc_type_str):
     print('\nThe result of ' + action_str + ' ' + doc_type_str + ' document(s):')
-    print(json.dumps(db_result, indent=2))
-    print('\nTotally ' + str(len(db_result)) + ' ' + doc_type_str + ' document(s) is/are ' + action_str + '.')
+    print(json.dumps(db_result.results, indent=2))
+    db_result.print_summary()
+    print('\nTotally ' + str(len(db_result.ok_results)) + ' ' + doc_type_str + ' document(s) is/are ' + action_str +
+          '.')
 
 
 if __name__ == '__main__':
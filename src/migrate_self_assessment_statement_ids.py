@@ -0,0 +1,66 @@
+import argparse
+import sys
+from cloudant_db.config import get_db_name_from_env
+from parsers.parser_utilities import get_now_in_unix_milliseconds
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
+
+sas_doc_type = 'selfAssessmentStatement'
+
+
+def main():
+    print('Start migrating the ids of the self-assessment statements...')
+    try:
+        args = parse_args()
+        start_profiling_by_args(args)
+        # the database modules are imported after the arguments are parsed, so --help does not pay for them
+        from cloudant_db.utilities import confirm_database_environment_variable
+        from cloudant_db.sas_migration import create_sas_id_migration_plan, write_sas_id_migration_plan
+        confirm_database_environment_variable()
+        db_name = get_db_name_from_env()
+
+        with profile_stage('read SAS documents'):
+            sas_docs = list(iterate_sas_docs(db_name, args.partition_key))
+        print(f'\nThere are {str(len(sas_docs))} SAS documents in the database.')
+        plan = create_sas_id_migration_plan(sas_docs, get_now_in_unix_milliseconds(), args.delete_legacy_docs)
+        plan.print_plan()
+        if args.dry_run:
+            sys.exit('\nDry run is completed, no changes have been made.')
+        if plan.is_empty:
+            sys.exit('\nAll the SAS documents have their new ids, there is nothing to migrate.')
+
+        with profile_stage('write SAS documents'):
+            result = write_sas_id_migration_plan(db_name, plan)
+        result.print_summary()
+        if len(result.error_results) > 0:
+            sys.exit('\nSome SAS documents are not migrated, please run the migration again.')
+        sys.exit('\nThe migration is completed.')
+
+    except AssertionError as e:
+        print('\nThe migration has exited due to an error:')
+        sys.exit(e)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='The program copies the self-assessment statements with legacy ids, \
+        which end with the time of their creation, to the ids derived from their partitions and scopes, \
+        so parsing and uploading the same statements again gives the same ids.')
+    parser.add_argument('--partition-key', metavar='partition_key', default=None,
+                        help='Only migrate the SAS documents of the partition, e.g., "org-topic"')
+    parser.add_argument('--delete-legacy-docs', action='store_true',
+                        help='Delete the SAS documents with legacy ids instead of deactivating them. '
+                             'The surveys referring to the legacy ids will not find them anymore.')
+    parser.add_argument('--dry-run', action='store_true', help='Print the migration without writing anything')
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+
+def iterate_sas_docs(db_name, partition_key: str = None):
+    from cloudant_db.utilities import iterate_docs_by_selector, iterate_docs_by_partition_key_and_a_given_doc_type
+    # the docs are read page by page
+    if partition_key is None:
+        return iterate_docs_by_selector(db_name, selector={'docType': sas_doc_type})
+    return iterate_docs_by_partition_key_and_a_given_doc_type(db_name, partition_key, sas_doc_type)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,8 +7,14 @@ from intermediate_models.meta_question import MetaQuestion
 
 
 def add_questions_to_exercises(questions: List[MetaQuestion], exercises: List[MetaExercise]):
+    """
+    It adds each question to the exercises of the reference id in the question id, e.g., "1.2" of "1.2.01".
+    The exercises are indexed by their reference ids once, so the time grows with the number of questions
+    instead of the number of questions times the number of exercises.
+    """
+    exercises_by_ref_id = {}
+    for e in exercises:
+        exercises_by_ref_id.setdefault(str(e.referenceId), []).append(e)
     for q in questions:
-        exercise_ref_id = get_reference_id_from_question_id(q.reference_id)
-        for e in exercises:
-            if exercise_ref_id == str(e.referenceId):
-                e.exercise.questions.append(q.question)
+        for e in exercises_by_ref_id.get(get_reference_id_from_question_id(q.reference_id), []):
+            e.exercise.questions.append(q.question)
@@ -1,19 +1,19 @@
 import pandas as pd
-from utilities.regex_utilities import get_a_matching_column_name_by_regex
 from cloudant_models.learning_material_v2 import LearningMaterialV2
 from utilities.case_study_parser_utilities import add_zero_to_section_ref_id
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_additional_learning_materials(args, case_study_config_id: str) -> list:
-    file = args.excel_file[0]
-    df = pd.read_excel(file, sheet_name='Additional Learning Material', header=1)
+def parse_excel_to_additional_learning_materials(workbook: WorkbookSession, case_study_config_id: str) -> list:
+    df = workbook.get_sheet('Additional Learning Material')
+    columns = workbook.get_columns('Additional Learning Material')
 
-    col_format = get_a_matching_column_name_by_regex(df, r'format')
-    col_url = get_a_matching_column_name_by_regex(df, r'source url')
-    col_level = get_a_matching_column_name_by_regex(df, r'level')
-    col_name = get_a_matching_column_name_by_regex(df, r'name')
-    col_desc = get_a_matching_column_name_by_regex(df, r'description')
-    col_row_id = get_a_matching_column_name_by_regex(df, r'learning material id')
+    col_format = columns['format']
+    col_url = columns['source_url']
+    col_level = columns['level']
+    col_name = columns['learning_material_name']
+    col_desc = columns['description']
+    col_row_id = columns['learning_material_id']
     # print(col_name, col_desc, col_url, col_level, col_format, col_row_id, sep='\n')
 
     case_study_partition_key = case_study_config_id.split(":")[0]
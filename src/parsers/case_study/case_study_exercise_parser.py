@@ -1,23 +1,28 @@
 import pandas as pd
-from utilities.regex_utilities import get_a_matching_column_name_by_regex
 from cloudant_models.exercise_v2 import ExerciseV2
-from parsers.parser_utilities import get_doc_ids_by_their_spreadsheet_ids
+from parsers.parser_utilities import SpreadsheetIdResolver
 from .case_study_question_parser import parse_excel_to_case_study_exercise_question_by_exercise_id
-from utilities.case_study_parser_utilities import add_zero_to_assignment_ref_id
+from utilities.case_study_parser_utilities import add_zero_to_assignment_ref_id, create_case_study_child_row_index
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_a_exercise_v2_list(args, list_parents, list_learning_material_v2):
+def parse_excel_to_a_exercise_v2_list(workbook: WorkbookSession, list_parents,
+                                      learning_material_resolver: SpreadsheetIdResolver):
     # parent_spreadsheet_ref_ids = [parent.spreadSheetRefId for parent in list_parents]
     # print(parent_spreadsheet_ref_ids)
-    file = args.excel_file[0]
-    df = pd.read_excel(file, sheet_name='Exercises', header=1)
-    col_exercise_id = get_a_matching_column_name_by_regex(df, r'exercise id')
-    col_exercise_name = get_a_matching_column_name_by_regex(df, r'exercise name')
-    col_description = get_a_matching_column_name_by_regex(df, r'description')
-    col_objectives = get_a_matching_column_name_by_regex(df, r'objectives')
-    col_level = get_a_matching_column_name_by_regex(df, r'level')
-    col_solution_id = get_a_matching_column_name_by_regex(df, r'solution id')
-    col_learning_materials = get_a_matching_column_name_by_regex(df, r'learning material ids')
+    df = workbook.get_sheet('Exercises')
+    columns = workbook.get_columns('Exercises')
+    col_exercise_id = columns['exercise_id']
+    col_exercise_name = columns['exercise_name']
+    col_description = columns['description']
+    col_objectives = columns['objectives']
+    col_level = columns['level']
+    col_solution_id = columns['solution_id']
+    col_learning_materials = columns['additional_learning_material_ids']
+    # group the questions by their exercise ids once for all exercises
+    question_index = create_case_study_child_row_index(workbook.get_sheet('Questions'), 'Questions', 'Exercises')
+    question_columns = workbook.get_columns('Questions')
+    parent_doc_ids_by_spreadsheet_id = {parent.spreadSheetRefId: parent._id for parent in list_parents}
 
     exercises = []
     for index, row in df.iterrows():
@@ -25,24 +30,25 @@ def parse_excel_to_a_exercise_v2_list(args, list_parents, list_learning_material
         description = None if pd.isnull(row[col_description]) else row[col_description]
         objectives = None if pd.isnull(row[col_objectives]) else row[col_objectives]
         level = row[col_level]
-        spread_sheet_ref_id = str(row[col_exercise_id])
+        spread_sheet_ref_id = row[col_exercise_id]
         # find parent doc id by finding exercise spreadsheet id
-        parent_id = find_parent_doc_id_by_exercise_spreadsheet_id(spread_sheet_ref_id, list_parents)
+        parent_id = find_parent_doc_id_by_exercise_spreadsheet_id(spread_sheet_ref_id,
+                                                                  parent_doc_ids_by_spreadsheet_id)
 
         topic_config_id = None
         learning_module_reference_id = None
         # get solution id which is a learning material id
         solution_id = None if pd.isnull(row[col_solution_id]) else (
-            get_doc_ids_by_their_spreadsheet_ids(row[col_solution_id], list_learning_material_v2)[0])
+            learning_material_resolver.resolve_one(row[col_solution_id], spread_sheet_ref_id))
         # get learning material ids
         additional_learning_material_ids = None if pd.isnull(row[col_learning_materials]) else (
-            get_doc_ids_by_their_spreadsheet_ids(row[col_learning_materials], list_learning_material_v2))
+            learning_material_resolver.resolve(row[col_learning_materials], spread_sheet_ref_id))
         doc_id = f'{parent_id.split(":")[0]}:{add_zero_to_assignment_ref_id(spread_sheet_ref_id)}'
         # get questions by exercise
         # minimum fix without have to update the question ref id in the excel file
         old_doc_id = f'{parent_id.split(":")[0]}:{spread_sheet_ref_id}'
         questions = parse_excel_to_case_study_exercise_question_by_exercise_id(
-            file, old_doc_id, list_learning_material_v2)
+            question_index, question_columns, old_doc_id, learning_material_resolver)
 
         exercise = ExerciseV2(
             _id=doc_id,
@@ -69,10 +75,9 @@ def return_spreadsheet_id(o: ExerciseV2):
     return o.spreadSheetRefId
 
 
-def find_parent_doc_id_by_exercise_spreadsheet_id(exercise_spreadsheet_id, list_parents):
+def find_parent_doc_id_by_exercise_spreadsheet_id(exercise_spreadsheet_id, parent_doc_ids_by_spreadsheet_id: dict):
     parent_spreadsheet_id = exercise_spreadsheet_id.split('.')[0]
-    result = [parent._id for parent in list_parents if parent.spreadSheetRefId == parent_spreadsheet_id]
-    return result[0]
+    return parent_doc_ids_by_spreadsheet_id[parent_spreadsheet_id]
 
 
 
@@ -1,32 +1,34 @@
 import pandas as pd
-from utilities.regex_utilities import get_a_matching_column_name_by_regex
 from cloudant_models.question_v2 import QuestionV2
 from cloudant_models.option_without_annotation import OptionWithoutAnnotation
-from parsers.parser_utilities import get_doc_ids_by_their_spreadsheet_ids
+from parsers.parser_utilities import SpreadsheetIdResolver
+from utilities.child_row_index import ChildRowIndex
+from utilities.sheet_schema import SheetColumns
 
 
-def parse_excel_to_case_study_exercise_question_by_exercise_id(excel_file, exercise_doc_id: str, learning_materials):
-    df = pd.read_excel(excel_file, sheet_name='Questions', header=1)
+def parse_excel_to_case_study_exercise_question_by_exercise_id(question_index: ChildRowIndex, columns: SheetColumns,
+                                                               exercise_doc_id: str,
+                                                               learning_material_resolver: SpreadsheetIdResolver):
     exercise_spreadsheet_id = exercise_doc_id.split(':')[1]
     # print(section_spreadsheet_id)
-    pattern = f'^{exercise_spreadsheet_id}\.'
-    col_id = get_a_matching_column_name_by_regex(df, r'question id')
-    filtered_df = df[df[col_id].str.contains(pattern, na=False)]
+    col_id = question_index.child_id_column_name
+    filtered_df = question_index.get_children(exercise_spreadsheet_id)
     # print('\n')
     # print(filtered_df)
 
-    col_desc = get_a_matching_column_name_by_regex(df, r'description')
-    col_url = get_a_matching_column_name_by_regex(df, r'image url')
-    col_option_header = get_a_matching_column_name_by_regex(df, r'option header')
-    col_a = get_a_matching_column_name_by_regex(df, r'option a')
-    col_b = get_a_matching_column_name_by_regex(df, r'option b')
-    col_c = get_a_matching_column_name_by_regex(df, r'option c')
-    col_d = get_a_matching_column_name_by_regex(df, r'option d')
-    col_answer = get_a_matching_column_name_by_regex(df, r'^answer')
-    col_feedback_for_correct_answer = get_a_matching_column_name_by_regex(df, r'feedback for correct')
-    col_feedback_for_incorrect_answer = get_a_matching_column_name_by_regex(df, r'feedback for incorrect')
-    col_learning_mat = get_a_matching_column_name_by_regex(df, r'additional learning material id')
-    col_tags = get_a_matching_column_name_by_regex(df, r'tags')
+    # the columns are resolved once for all exercises
+    col_desc = columns['description']
+    col_url = columns['image_url']
+    col_option_header = columns['option_header']
+    col_a = columns['option_a']
+    col_b = columns['option_b']
+    col_c = columns['option_c']
+    col_d = columns['option_d']
+    col_answer = columns['answer']
+    col_feedback_for_correct_answer = columns['feedback_for_correct_answer']
+    col_feedback_for_incorrect_answer = columns['feedback_for_incorrect_answer']
+    col_learning_mat = columns['additional_learning_material_id']
+    col_tags = columns['tags']
 
     exercise_questions = []
     for index, row in filtered_df.iterrows():
@@ -45,7 +47,7 @@ def parse_excel_to_case_study_exercise_question_by_exercise_id(excel_file, exerc
             option_header = 'Please select your answer:'
         # get additional learning material doc id
         additional_learning_material_id = None if pd.isnull(row[col_learning_mat]) else (
-            get_doc_ids_by_their_spreadsheet_ids(row[col_learning_mat], learning_materials)[0])
+            learning_material_resolver.resolve_one(row[col_learning_mat], reference_id))
         tags = None if pd.isnull(row[col_tags]) else [tag.strip() for tag in row[col_tags].split(',')]
 
         question = QuestionV2(
@@ -1,23 +1,24 @@
 import pandas as pd
-from utilities.regex_utilities import get_a_matching_column_name_by_regex
 from cloudant_models.content_element import ContentElement
-from parsers.parser_utilities import get_doc_ids_by_their_spreadsheet_ids
+from parsers.parser_utilities import SpreadsheetIdResolver
+from utilities.child_row_index import ChildRowIndex
+from utilities.sheet_schema import SheetColumns
 
 
-def parse_excel_to_case_study_section_content_by_section_id(excel_file, section_doc_id: str, learning_materials):
-    df = pd.read_excel(excel_file, sheet_name='Section Content', header=1)
+def parse_excel_to_case_study_section_content_by_section_id(content_index: ChildRowIndex, columns: SheetColumns,
+                                                            section_doc_id: str,
+                                                            learning_material_resolver: SpreadsheetIdResolver):
     section_spreadsheet_id = section_doc_id.split('section-')[1]
     # print(section_spreadsheet_id)
-    pattern = f'^{section_spreadsheet_id}-content-'
-    col_id = get_a_matching_column_name_by_regex(df, r'content id')
-    filtered_df = df[df[col_id].str.contains(pattern, na=False)]
+    col_id = content_index.child_id_column_name
+    filtered_df = content_index.get_children(section_spreadsheet_id)
     # print('\n')
     # print(filtered_df)
 
-    col_format = get_a_matching_column_name_by_regex(df, r'\*section content format')
-    col_desc = get_a_matching_column_name_by_regex(df, r'description')
-    col_url = get_a_matching_column_name_by_regex(df, r'source url')
-    col_learning_mat = get_a_matching_column_name_by_regex(df, r'additional learning material ids')
+    col_format = columns['section_content_format']
+    col_desc = columns['description']
+    col_url = columns['source_url']
+    col_learning_mat = columns['additional_learning_material_ids']
 
     section_contents = []
     for index, row in filtered_df.iterrows():
@@ -29,7 +30,7 @@ def parse_excel_to_case_study_section_content_by_section_id(excel_file, section_
         url = None if pd.isnull(row[col_url]) else row[col_url]
         # get additional learning material doc ids
         additional_mat = None if pd.isnull(row[col_learning_mat]) else (
-            get_doc_ids_by_their_spreadsheet_ids(row[col_learning_mat], learning_materials))
+            learning_material_resolver.resolve(row[col_learning_mat], spreadsheet_ref_id))
 
         content = ContentElement(
             parent_id=parent_id,
@@ -46,22 +47,20 @@ def parse_excel_to_case_study_section_content_by_section_id(excel_file, section_
     return section_contents
 
 
-def parse_excel_to_case_study_section_content_by_section_spreadsheet_id(excel_file, section_doc_id: str,
-                                                                        section_spreadsheet_id: str,
-                                                                        learning_materials):
-    df = pd.read_excel(excel_file, sheet_name='Section Content', header=1)
+def parse_excel_to_case_study_section_content_by_section_spreadsheet_id(
+        content_index: ChildRowIndex, columns: SheetColumns, section_doc_id: str, section_spreadsheet_id: str,
+        learning_material_resolver: SpreadsheetIdResolver):
     # section_spreadsheet_id = section_doc_id.split('section-')[1]
     # print(section_spreadsheet_id)
-    pattern = f'^{section_spreadsheet_id}-content-'
-    col_id = get_a_matching_column_name_by_regex(df, r'content id')
-    filtered_df = df[df[col_id].str.contains(pattern, na=False)]
+    col_id = content_index.child_id_column_name
+    filtered_df = content_index.get_children(section_spreadsheet_id)
     # print('\n')
     # print(filtered_df)
 
-    col_format = get_a_matching_column_name_by_regex(df, r'\*section content format')
-    col_desc = get_a_matching_column_name_by_regex(df, r'description')
-    col_url = get_a_matching_column_name_by_regex(df, r'source url')
-    col_learning_mat = get_a_matching_column_name_by_regex(df, r'additional learning material ids')
+    col_format = columns['section_content_format']
+    col_desc = columns['description']
+    col_url = columns['source_url']
+    col_learning_mat = columns['additional_learning_material_ids']
 
     section_contents = []
     for index, row in filtered_df.iterrows():
@@ -73,7 +72,7 @@ def parse_excel_to_case_study_section_content_by_section_spreadsheet_id(excel_fi
         url = None if pd.isnull(row[col_url]) else row[col_url]
         # get additional learning material doc ids
         additional_mat = None if pd.isnull(row[col_learning_mat]) else (
-            get_doc_ids_by_their_spreadsheet_ids(row[col_learning_mat], learning_materials))
+            learning_material_resolver.resolve(row[col_learning_mat], spreadsheet_ref_id))
 
         content = ContentElement(
             parent_id=parent_id,
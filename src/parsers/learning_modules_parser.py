@@ -2,12 +2,12 @@ from typing import List
 import pandas
 from cloudant_models.learning_module import LearningModule
 from cloudant_models.topic_config import TopicConfig
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_learning_modules(args, topic_config) -> List[LearningModule]:
+def parse_excel_to_learning_modules(workbook: WorkbookSession, topic_config) -> List[LearningModule]:
     learning_module_list: List[LearningModule] = []
-    file = args.excel_file[0]
-    config_df = pandas.read_excel(file, sheet_name='Learning Modules')
+    config_df = workbook.get_sheet('Learning Modules')
     ref_id_col_name = '*Reference ID (1-9 if less than 10 modules, otherwise 01-xx, ' \
                       'for ordering the modules and for referencing in the subsequent sheets)'
 
@@ -6,12 +6,12 @@ from intermediate_models.meta_exercise import MetaExercise
 from parsers.meta_questions_parser import get_reference_id_from_question_id
 from cloudant_models.topic_config import TopicConfig
 from cloudant_models.learning_module import LearningModule
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_meta_exercises(args, topic_config) -> List[MetaExercise]:
+def parse_excel_to_meta_exercises(workbook: WorkbookSession, topic_config) -> List[MetaExercise]:
     meta_exercise_list: List[MetaExercise] = []
-    file = args.excel_file[0]
-    config_df = pandas.read_excel(file, sheet_name='Exercises', header=1)
+    config_df = workbook.get_sheet('Exercises')
 
 
     for i, row in config_df.iterrows():
@@ -49,11 +49,13 @@ def parse_excel_to_meta_exercises(args, topic_config) -> List[MetaExercise]:
 
 
 def add_questions_to_exercises(questions: List[Question], exercises: List[Exercise]):
+    # index the exercises by their reference ids once instead of scanning all the exercises for every question
+    exercises_by_ref_id = {}
+    for e in exercises:
+        exercises_by_ref_id.setdefault(e.referenceId, []).append(e)
     for q in questions:
-        ref_id = get_reference_id_from_question_id(q.questionId)
-        for e in exercises:
-            if e.referenceId == ref_id:
-                e.questions.append(q)
+        for e in exercises_by_ref_id.get(get_reference_id_from_question_id(q.questionId), []):
+            e.questions.append(q)
 
 
 def get_level_from_reference_id(reference_id: str) -> int:
@@ -4,12 +4,14 @@ from intermediate_models.meta_learning_material import MetaLearningMaterial
 from cloudant_models.learning_material import LearningMaterial
 from cloudant_models.topic_config import TopicConfig
 from cloudant_models.learning_module import LearningModule
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_meta_learning_materials(args, topic_config) -> List[MetaLearningMaterial]:
+def parse_excel_meta_learning_materials(workbook: WorkbookSession, topic_config) -> List[MetaLearningMaterial]:
     meta_learning_materials: List[MetaLearningMaterial] = []
-    file = args.excel_file[0]
-    config_df = pandas.read_excel(file, sheet_name='Learning Materials', header=1)
+    config_df = workbook.get_sheet('Learning Materials')
+    # the learning module of each module ref. id is found once for all the materials of the module
+    learning_module_reference_ids = {}
 
 
     for i, row in config_df.iterrows():
@@ -23,12 +25,11 @@ def parse_excel_meta_learning_materials(args, topic_config) -> List[MetaLearning
         _id = topic_config.orgId + '-' + topic_config.topicId + ':' + row['*Reference ID (<Learning Module Ref. ID>-mat-<order in the module, 1-9>)']
         topic_config_id = topic_config._id
         
-        learning_module_reference_id = None
-        for index, lm in enumerate(topic_config.learningModules):
-            if lm.referenceId.endswith(reference_id.split("-")[0]):
-                learning_module_reference_id = lm.referenceId
-                # print(learning_module_reference_id)
-                break
+        module_ref_id = reference_id.split("-")[0]
+        if module_ref_id not in learning_module_reference_ids:
+            learning_module_reference_ids[module_ref_id] = find_learning_module_reference_id(
+                topic_config.learningModules, module_ref_id)
+        learning_module_reference_id = learning_module_reference_ids[module_ref_id]
 
         lm = LearningMaterial(_id, format, source_url, level, name, description, learning_module_reference_id, topic_config_id )
 
@@ -40,6 +41,13 @@ def parse_excel_meta_learning_materials(args, topic_config) -> List[MetaLearning
     return meta_learning_materials
 
 
+def find_learning_module_reference_id(learning_modules: List[LearningModule], module_ref_id: str):
+    for lm in learning_modules:
+        if lm.referenceId.endswith(module_ref_id):
+            return lm.referenceId
+    return None
+
+
 def return_ref_id(m: MetaLearningMaterial):
     return m.reference_id
 
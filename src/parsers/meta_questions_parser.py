@@ -4,11 +4,11 @@ import pandas
 from cloudant_models.question import Question
 from cloudant_models.option import Option
 from intermediate_models.meta_question import MetaQuestion
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_meta_questions(args) -> List[MetaQuestion]:
-    file = args.excel_file[0]
-    excel_data_df = pandas.read_excel(file, sheet_name='Questions')
+def parse_excel_to_meta_questions(workbook: WorkbookSession) -> List[MetaQuestion]:
+    excel_data_df = workbook.get_sheet('Questions')
 
     question_list = []
     for index, row in excel_data_df.iterrows():
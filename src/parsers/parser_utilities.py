@@ -5,11 +5,61 @@ def get_now_in_unix_milliseconds():
     return round(time.time() * 1000)
 
 
-def get_doc_ids_by_their_spreadsheet_ids(spreadsheet_ids: str, list_objects):
-    doc_ids = []
-    ref_ids = [spreadsheet_id.strip() for spreadsheet_id in spreadsheet_ids.split(',')]
-    for ref_id in ref_ids:
-        result = [object._id for object in list_objects if object.spreadSheetRefId == ref_id]
-        # print(result)
-        doc_ids.append(result[0])
-    return doc_ids
+class SpreadsheetIdResolver:
+    """
+    A SpreadsheetIdResolver maps the spreadsheet ids of parsed objects, e.g., LearningMaterialV2, to their doc ids.
+    The mapping is built once, so resolving an id does not scan the list of objects again.
+    If the same spreadsheet id is used by more than one object, the first object wins.
+    The references which cannot be resolved are collected while the cells are resolved, so they are all reported
+    together by check_all_references_resolved instead of one at a time.
+    """
+    def __init__(self, list_objects):
+        self.doc_ids_by_spreadsheet_id = {}
+        for o in list_objects:
+            self.doc_ids_by_spreadsheet_id.setdefault(o.spreadSheetRefId, o._id)
+        self.invalid_references = []
+
+    def find_unresolved_ids(self, spreadsheet_ids: str) -> list:
+        ref_ids = split_spreadsheet_ids(spreadsheet_ids)
+        return [ref_id for ref_id in ref_ids if ref_id not in self.doc_ids_by_spreadsheet_id]
+
+    def resolve(self, spreadsheet_ids: str, referenced_by: str = None) -> list:
+        """
+        It takes comma separated spreadsheet ids and returns the doc ids of the resolved ones in the same order.
+        The ids which cannot be resolved are recorded with the referencing row, e.g., its spreadsheet id.
+        """
+        unresolved_ids = self.find_unresolved_ids(spreadsheet_ids)
+        if len(unresolved_ids) > 0:
+            self.invalid_references.append(f'Cannot find doc id(s) for {unresolved_ids} in "{spreadsheet_ids}"'
+                                           + get_referencing_row_text(referenced_by))
+        return [self.doc_ids_by_spreadsheet_id[ref_id] for ref_id in split_spreadsheet_ids(spreadsheet_ids)
+                if ref_id in self.doc_ids_by_spreadsheet_id]
+
+    def resolve_one(self, spreadsheet_id: str, referenced_by: str = None) -> str:
+        """
+        It resolves a cell referencing a single spreadsheet id, e.g., the solution of an exercise.
+        A cell with more than one id is recorded as invalid instead of dropping the other ids.
+        """
+        ref_ids = split_spreadsheet_ids(spreadsheet_id)
+        if len(ref_ids) > 1:
+            self.invalid_references.append(f'Only one id is allowed, but "{spreadsheet_id}" has {str(len(ref_ids))}'
+                                           + get_referencing_row_text(referenced_by))
+            return None
+        doc_ids = self.resolve(spreadsheet_id, referenced_by)
+        return doc_ids[0] if len(doc_ids) > 0 else None
+
+    def check_all_references_resolved(self):
+        """
+        It raises a ValueError listing every invalid reference collected so far.
+        """
+        if len(self.invalid_references) > 0:
+            raise ValueError(f'{str(len(self.invalid_references))} reference(s) to the spreadsheet ids are invalid:\n'
+                             + '\n'.join(self.invalid_references))
+
+
+def get_referencing_row_text(referenced_by: str) -> str:
+    return '' if referenced_by is None else f' (referenced by {referenced_by})'
+
+
+def split_spreadsheet_ids(spreadsheet_ids: str) -> list:
+    return [spreadsheet_id.strip() for spreadsheet_id in str(spreadsheet_ids).split(',')]
@@ -1,14 +1,15 @@
 from typing import List
 
 import pandas
-from cloudant_models.self_assessment_statement import SelfAssessmentStatement
+from cloudant_models.self_assessment_statement import SelfAssessmentStatement, get_self_assessment_statement_id
 from parsers.parser_utilities import get_now_in_unix_milliseconds
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_self_assessment_statements(args, topic_config) -> List[SelfAssessmentStatement]:
+def parse_excel_to_self_assessment_statements(workbook: WorkbookSession, topic_config) -> List[SelfAssessmentStatement]:
     sas_list: List[SelfAssessmentStatement] = []
-    file = args.excel_file[0]
-    exercise_df = pandas.read_excel(file, sheet_name='Exercises', header=1)
+    # the same sheet as the exercises, which is read only once by the workbook session
+    exercise_df = workbook.get_sheet('Exercises')
 
     for i, row in exercise_df.iterrows():
         statement = row['Self-Assessment Statement']
@@ -21,8 +22,7 @@ def parse_excel_to_self_assessment_statements(args, topic_config) -> List[SelfAs
         scope = 'exercise'
         exercise_id = topic_config.orgId + '-' + topic_config.topicId + ':' + str(exercise_reference_id)
         created_at = get_now_in_unix_milliseconds()
-        doc_id = topic_config.orgId + '-' + topic_config.topicId + ':sas_' + scope + '_' + \
-            exercise_id + '_' + str(created_at)
+        doc_id = get_self_assessment_statement_id(topic_config.orgId + '-' + topic_config.topicId, scope, exercise_id)
         updated_at = None
         is_active = True
 
@@ -1,11 +1,11 @@
 from typing import List
 import pandas
 from cloudant_models.topic_config import TopicConfig
+from utilities.workbook_session import WorkbookSession
 
 
-def parse_excel_to_topic_config(args) -> TopicConfig:
-    file = args.excel_file[0]
-    config_df = pandas.read_excel(file, sheet_name='Topic')
+def parse_excel_to_topic_config(workbook: WorkbookSession) -> TopicConfig:
+    config_df = workbook.get_sheet('Topic')
 
     if pandas.isna(config_df.loc[config_df.index[0], '*Organization Name']):
         raise TypeError("The value of Organization Name is missing in the Topic sheet")
@@ -2,7 +2,6 @@ import argparse
 import sys
 from typing import List
 
-import jsonpickle
 import pandas
 import re
 
@@ -10,46 +9,100 @@ from cloudant_models.survey import Survey
 from cloudant_models.survey_question import SurveyQuestion
 from cloudant_models.option_without_annotation import OptionWithoutAnnotation
 from validators.excel_validator import check_excel_file_has_expected_sheets, check_a_sheet_has_expected_columns, \
-    check_required_columns_have_values, check_values_in_column_are_unique
+    check_required_columns_have_values, check_values_in_column_are_unique, get_excel_row_number
 from validators.validation_message import ValidationMessage
+from utilities.parse_cache import create_parse_cache, add_parse_cache_arguments
+from utilities.json_serializer import write_output_file, add_output_file_arguments, get_output_file
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
+from utilities.workbook_session import WorkbookSession
+from validators.validation_report import ValidationReport, add_validation_report_arguments, \
+    finish_validation_report
 from parsers.survey_parser import parse_survey_sheet_to_survey
 from parsers.survey_sections_parser import parse_sections_sheet_to_survey_sections
 from parsers.survey_questions_parser import parse_questions_sheet_to_survey_questions
-from cloudant_db.utilities import get_db_name_from_env, get_active_docs_by_doc_type_and_scope, \
-    get_all_topic_config_id_and_name
-
-topic_db_name = get_db_name_from_env()
+from cloudant_db.config import get_db_name_from_env
 
 
 def main():
     print("Start survey parser...")
     try:
         args = parse_args()
-        validate_survey_excel_file(args)
-        doc = parse_excel_to_survey(args)
-        doc_json = jsonpickle.encode(doc, unpicklable=False)
-        file_path = "output/parsed-survey.json"
-        with open(file_path, "w") as outfile:
-            outfile.write(doc_json)
+        start_profiling_by_args(args)
+        file_path = get_output_file(args, 'output/parsed-survey')
+        parse_excel_file_to_survey_json_file(args, file_path)
         sys.exit("\nParsing is completed, the parsed result is stored at " + file_path + '.')
     except (AssertionError, RuntimeError) as e:
         print('\nError: ' + str(e))
         sys.exit('Parsing is aborted.')
 
 
+def parse_excel_file_to_survey_json_file(args, output_file):
+    """
+    It validates and parses the excel file of the args, or takes the result from the parse cache
+    if the file has not changed, and writes the json of the survey to the output file.
+    """
+    parse_cache = create_parse_cache(args)
+    cache_key = parse_cache.get_key(args.excel_file[0], 'survey', args.ndjson)
+    if parse_cache.copy_to_file(cache_key, output_file):
+        print('\nThe excel file has not changed since it was last parsed, the cached result is used.')
+        return
+    with profile_stage('read excel file'):
+        all_sheets = read_survey_excel_file(args)
+    report = ValidationReport(fail_fast=not args.collect_all)
+    with profile_stage('validate excel file'):
+        validate_survey_excel_file(args, report, all_sheets)
+    if args.collect_all:
+        finish_validation_report(report, args.report_file)
+    with profile_stage('parse excel file'):
+        doc = parse_excel_to_survey(args, all_sheets)
+    with profile_stage('write output file'):
+        write_output_file(doc, output_file, args.ndjson)
+    # the questions created from the self-assessment statements depend on the database, not only the file
+    if not has_sections_creating_questions_from_sas(all_sheets):
+        parse_cache.put_file(cache_key, output_file)
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description='The program parses \
         an excel file and attempts to convert it into a survey json object')
     parser.add_argument('excel_file', metavar='excel_file', nargs=1,
                         help='The excel file containing survey configuration')
+    add_validation_report_arguments(parser)
+    add_parse_cache_arguments(parser)
+    add_output_file_arguments(parser, 'output/parsed-survey')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     return args
 
 
-def parse_excel_to_survey(args) -> Survey:
+def read_survey_excel_file(args) -> dict:
+    """
+    It streams the survey sheets from the read-only workbook with only their expected columns.
+    The other sheets and columns are not read, and a missing survey sheet is left out, so the validation reports it.
+    """
+    with WorkbookSession(args.excel_file[0], column_regexes=get_survey_sheet_column_regexes()) as workbook:
+        return workbook.get_sheets([sheet_name for sheet_name in get_survey_sheet_names()
+                                    if sheet_name in workbook.sheet_names])
+
+
+def get_survey_sheet_names() -> tuple:
+    return 'Survey', 'Sections', 'Questions'
+
+
+def get_survey_sheet_column_regexes() -> dict:
+    # the expected column names are matched as a whole, so a column is read if and only if the checks look for it
+    return {sheet_name: tuple('^' + re.escape(column_name) + '$'
+                              for column_name in get_expected_column_names_and_row_number(sheet_name)[0])
+            for sheet_name in get_survey_sheet_names()}
+
+
+def parse_excel_to_survey(args, all_sheets: dict = None) -> Survey:
+    """
+    It parses the sheets of the survey excel file, which are read from the file of the args if they are not given.
+    """
     print('\nParse the excel file...')
-    file = args.excel_file[0]
-    all_sheets = pandas.read_excel(file, sheet_name=None)
+    if all_sheets is None:
+        all_sheets = read_survey_excel_file(args)
 
     print('\nParse "Survey" sheet...')
     expected_column_names, *_ = get_expected_column_names_and_row_number('Survey')
@@ -72,26 +125,45 @@ def parse_excel_to_survey(args) -> Survey:
 
     print('\nThere is(are) ' + str(len(sections_required_sas)) + ' section(s) required creating SA questions from SAS.')
     if len(sections_required_sas) > 0:
+        topic_db_name = get_db_name_from_env()
+        print('\nRead the self-assessment statements and the topics of database "' + topic_db_name + '"...')
+        # the database is only needed for the sections creating questions from the self-assessment statements,
+        # so the Cloudant SDK is not imported when parsing other surveys
+        from cloudant_db.metadata_snapshot import create_metadata_snapshot_cache
+        with profile_stage('read metadata snapshot'):
+            snapshot = create_metadata_snapshot_cache(args).get_snapshot(topic_db_name)
         print('\nCreate self-assessment survey questions from existing self-assessment statements...')
         expected_column_names, *_ = get_expected_column_names_and_row_number('Sections')
-        self_assessment_questions = create_survey_questions_from_self_assessment_statements()
+        self_assessment_questions = create_survey_questions_from_self_assessment_statements(snapshot)
         assign_sas_questions_to_sas_sections(survey, sections_required_sas, expected_column_names,
-                                             self_assessment_questions)
+                                             self_assessment_questions, snapshot)
     return survey
 
 
-def validate_survey_excel_file(args):
+def has_sections_creating_questions_from_sas(all_sheets: dict) -> bool:
+    expected_column_names, *_ = get_expected_column_names_and_row_number('Sections')
+    return (all_sheets['Sections'][expected_column_names[5]] == True).any()
+
+
+def validate_survey_excel_file(args, report: ValidationReport = None, all_sheets: dict = None) -> ValidationReport:
+    """
+    It validates the survey excel file. By default, it raises an AssertionError at the first error.
+    If a report in the collecting mode is given, it runs every check and collects all the errors in the report instead.
+    The sheets are read from the file of the args if they are not given.
+    """
     print("\nValidate excel file...")
-    file = args.excel_file[0]
-    all_sheets = pandas.read_excel(file, sheet_name=None)
+    if report is None:
+        report = ValidationReport(fail_fast=True)
+    if all_sheets is None:
+        all_sheets = read_survey_excel_file(args)
 
-    expected_sheet_names = ('Survey', 'Sections', 'Questions')
-    has_all_expected_sheets = check_excel_file_has_expected_sheets(all_sheets, expected_sheet_names)
+    expected_sheet_names = get_survey_sheet_names()
+    has_all_expected_sheets = report.check(None, check_excel_file_has_expected_sheets, all_sheets, expected_sheet_names)
 
     if has_all_expected_sheets.is_valid is False:
-        raise AssertionError(has_all_expected_sheets.message)
-    else:
-        print(has_all_expected_sheets.message)
+        # the other checks refer to the missing sheets, so the validation cannot continue
+        return report
+    print(has_all_expected_sheets.message)
 
     for expected_sheet in expected_sheet_names:
         print('\nInspect "' + expected_sheet + '" sheet...')
@@ -99,28 +171,28 @@ def validate_survey_excel_file(args):
         expected_column_names, required_columns, expected_rows = \
             get_expected_column_names_and_row_number(expected_sheet)
 
-        has_all_expected_columns = check_a_sheet_has_expected_columns(expected_sheet, all_sheets[expected_sheet],
-                                                                      expected_column_names)
+        has_all_expected_columns = report.check(expected_sheet, check_a_sheet_has_expected_columns, expected_sheet,
+                                                all_sheets[expected_sheet], expected_column_names)
         if has_all_expected_columns.is_valid is False:
-            raise AssertionError(has_all_expected_columns.message)
-        else:
-            print(has_all_expected_columns.message)
-
-        check_expected_rows_in_survey_excel_sheet(expected_sheet, all_sheets, expected_rows)
-
-        has_missing_value = check_if_missing_required_values_in_survey_excel_sheet(expected_sheet,
-                                                                                   all_sheets[expected_sheet],
-                                                                                   expected_column_names,
-                                                                                   required_columns)
-        if has_missing_value.is_valid is False:
-            raise AssertionError(has_missing_value.message)
-        else:
+            # the other checks of the sheet need the columns
+            continue
+        print(has_all_expected_columns.message)
+
+        report.check(expected_sheet, check_expected_rows_in_survey_excel_sheet, expected_sheet, all_sheets,
+                     expected_rows)
+
+        has_missing_value = report.check(expected_sheet, check_if_missing_required_values_in_survey_excel_sheet,
+                                         expected_sheet, all_sheets[expected_sheet], expected_column_names,
+                                         required_columns)
+        if has_missing_value.is_valid:
             print(has_missing_value.message)
 
         if expected_sheet == 'Sections' or expected_sheet == 'Questions':
-            check_ref_id_uniqueness_for_sections_or_questions(expected_sheet, all_sheets, required_columns)
+            report.check(expected_sheet, check_ref_id_uniqueness_for_sections_or_questions, expected_sheet, all_sheets,
+                         required_columns)
 
-        print('The sheet seems ok.')
+        print('The sheet has been inspected.')
+    return report
 
 
 def get_expected_column_names_and_row_number(sheet_name: str):
@@ -213,14 +285,14 @@ def inspect_rows_in_sections_sheet(dataframe, required_columns: tuple, expected_
     for index, row in dataframe.iterrows():
         if row[required_columns[1]] and pandas.isna(row[expected_columns[3]]):
             result.is_valid = False
-            result.message = '\nRow ' + str(index + 1) + ' has a missing value. When column "' \
+            result.message = '\nRow ' + str(get_excel_row_number(index)) + ' has a missing value. When column "' \
                              + required_columns[1] + '" is true, column "' + expected_columns[3] \
                              + '" should not be empty.'
             break
         elif row[required_columns[1]] and row[expected_columns[3]] != 'all' and \
                 pandas.isna(row[expected_columns[4]]):
             result.is_valid = False
-            result.message = '\nRow ' + str(index + 1) + ' has a missing value. When column "' \
+            result.message = '\nRow ' + str(get_excel_row_number(index)) + ' has a missing value. When column "' \
                              + expected_columns[3] + '" has a value other than "all", column "' + \
                              expected_columns[4] + '" should not be empty.'
             break
@@ -232,7 +304,7 @@ def inspect_missing_value_in_questions_sheet(dataframe, required_columns: tuple)
     for index, row in dataframe.iterrows():
         if row[required_columns[2]] == 'singleSelect' and pandas.isna(row[5]):
             result.is_valid = False
-            result.message = '\nRow ' + str(index + 1) + ' has a missing value. When column "' \
+            result.message = '\nRow ' + str(get_excel_row_number(index)) + ' has a missing value. When column "' \
                              + required_columns[2] + '" is singleSelect, column "Option 1" should not be empty.'
             break
     return result
@@ -252,25 +324,13 @@ def check_ref_id_uniqueness_for_sections_or_questions(expected_sheet, all_sheets
         raise AssertionError(are_ref_ids_unique.message)
 
 
-def create_survey_questions_from_self_assessment_statements() -> List[SurveyQuestion]:
-    topic_db = get_db_name_from_env()
-    self_assessment_statements = get_active_docs_by_doc_type_and_scope(topic_db, 'selfAssessmentStatement', 'exercise')
-    survey_questions = []
-
-    if 'docs' in self_assessment_statements:
-        if len(self_assessment_statements['docs']) == 0:
-            msg = 'Found no self-assessment statements in the database. Please check if the target database name is ' \
-                  'set correctly in the .env file. Or create those questions to the excel file.'
-            raise AssertionError(msg)
-
-        survey_questions = []
-        for sas in self_assessment_statements['docs']:
-            survey_questions.append(create_survey_question_from_self_assessment_statement(sas))
-
-    elif 'error' in self_assessment_statements:
-        raise AssertionError(self_assessment_statements['error'])
-
-    return survey_questions
+def create_survey_questions_from_self_assessment_statements(snapshot) -> List[SurveyQuestion]:
+    self_assessment_statements = snapshot.get_sas_docs('exercise')
+    if len(self_assessment_statements) == 0:
+        msg = 'Found no self-assessment statements in the database. Please check if the target database name is ' \
+              'set correctly in the .env file. Or create those questions to the excel file.'
+        raise AssertionError(msg)
+    return [create_survey_question_from_self_assessment_statement(sas) for sas in self_assessment_statements]
 
 
 def create_survey_question_from_self_assessment_statement(self_assessment_statement) -> SurveyQuestion:
@@ -301,49 +361,39 @@ def create_likert_options(likert_labels: tuple) -> List[OptionWithoutAnnotation]
 
 
 def assign_sas_questions_to_sas_sections(survey: Survey, sas_sections_df, expected_columns: tuple,
-                                         sas_questions: [SurveyQuestion]):
-    print('\nGet existing topic config ids and names from database "' + topic_db_name + '"...')
-    all_topic_ids_and_names = get_all_topic_config_id_and_name(topic_db_name)
-    if 'error' in all_topic_ids_and_names:
-        raise AssertionError(all_topic_ids_and_names['error'])
-    if len(all_topic_ids_and_names['docs']) == 0:
+                                         sas_questions: [SurveyQuestion], snapshot):
+    """
+    It assigns all the SA questions to the sections of the scope "all", and the SA questions of the topic
+    to the sections of the scope "topic", looking up the topics and their SAS in the indexes of the snapshot.
+    """
+    if len(snapshot.topic_configs) == 0:
         raise AssertionError('No topics are found in the database')
+    section_indexes = {}
+    for i, section in enumerate(survey.sections):
+        section_indexes.setdefault(section.referenceId, i)
 
     for i, row in sas_sections_df.iterrows():
         print('\nAssign SA survey questions to SA section ' + row[expected_columns[6]] + '...')
         section_ref_id = row[expected_columns[6]]
-        survey_section_index = next((i for i, s in enumerate(survey.sections) if s.referenceId == section_ref_id), -1)
+        survey_section_index = section_indexes.get(section_ref_id, -1)
         if survey_section_index != -1 and row[expected_columns[3]].lower().strip() == 'all':
             survey.sections[survey_section_index].questions = sas_questions
         elif survey_section_index != -1 and row[expected_columns[3]].lower().strip() == 'topic':
             scope_name = row[expected_columns[4]]
-            topic_config_id = get_topic_config_id_by_topic_name(all_topic_ids_and_names['docs'], scope_name)
-            # print(topic_config_id)
+            topic_config_id = snapshot.get_topic_config_id_by_name(scope_name)
             if topic_config_id is None:
                 msg = 'The section SA scope is topic but the SA scope name "' + scope_name + \
                       '" cannot be found in the existing topic names. Please update the section SA scope name.'
                 raise AssertionError(msg)
             topic_config_partition_key = topic_config_id.split(':')[0]
             survey.sections[survey_section_index].questions = \
-                filter_sa_questions_by_partition_key(sas_questions, topic_config_partition_key)
+                [create_survey_question_from_self_assessment_statement(sas)
+                 for sas in snapshot.get_sas_docs_by_partition_key(topic_config_partition_key, 'exercise')]
             if len(survey.sections[survey_section_index].questions) == 0:
                 msg = 'There is no SA questions for the section "' + scope_name + \
                       '", please create SA statements first or remove the survey section from the survey excel file.'
                 raise AssertionError(msg)
 
 
-def get_topic_config_id_by_topic_name(topic_ids_names, scope_name) -> str:
-    topic_config_id = None
-    for item in topic_ids_names:
-        if item['name'].lower().strip() == scope_name.lower().strip():
-            topic_config_id = item['_id']
-            break
-    return topic_config_id
-
-
-def filter_sa_questions_by_partition_key(sa_questions, partition_key) -> List[SurveyQuestion]:
-    return list(filter(lambda q: (q.referenceId.split(':')[0] == partition_key), sa_questions))
-
-
 if __name__ == '__main__':
     main()
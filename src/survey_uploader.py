@@ -1,47 +1,51 @@
 import argparse
-import json
+import itertools
 import sys
-from json import JSONDecodeError
 
 import pandas
 
 from validators.validation_message import ValidationMessage
-from cloudant_db.utilities import get_db_name_from_env, put_a_document, \
-    post_documents_to_topic_db, get_docs_by_partition_key
+from cloudant_db.config import get_db_name_from_env
 from parsers.parser_utilities import get_now_in_unix_milliseconds
-
-topic_db_name = get_db_name_from_env()
+from utilities.json_stream import load_json_doc
+from utilities.profiler import add_profile_arguments, start_profiling_by_args, profile_stage
 
 
 def main():
     print('\nStart Survey Uploader...')
     try:
         args = parse_args()
-        with open(args.json_file[0], 'r') as file:
-            file_dict = json.loads(file.read())
-
-        input_validation(file_dict)
+        start_profiling_by_args(args)
+        with profile_stage('load and validate json'):
+            file_dict = load_json_doc(args.json_file[0])
+            input_validation(file_dict)
 
         print('\n******************** '
               'Check if there is any existing survey sharing the same partition key'
               ' ********************')
         partition_key = file_dict['_id'].split(':')[0]
         print('Partition key in json survey id: "' + partition_key + '"')
-        existing_surveys = get_docs_by_partition_key(topic_db_name, partition_key, True)
-        if 'error' in existing_surveys:
-            raise AssertionError(existing_surveys['error'])
-        elif 'rows' in existing_surveys and len(existing_surveys['rows']) == 0:
+        # the database modules are imported after the arguments are parsed, so --help does not pay for them
+        from cloudant_db.utilities import iterate_docs_by_partition_key
+        topic_db_name = get_db_name_from_env()
+        existing_survey_rows = iterate_docs_by_partition_key(topic_db_name, partition_key, True)
+        with profile_stage('read existing surveys'):
+            first_existing_survey_row = next(existing_survey_rows, None)
+        if first_existing_survey_row is None:
             print('There is no document sharing the same partition key.')
-            create_a_new_survey_document(topic_db_name, file_dict)
-        elif 'rows' in existing_surveys and len(existing_surveys['rows']) > 0:
-            doc_with_same_id, other_active_surveys = analyze_existing_survey_documents(existing_surveys['rows'],
-                                                                                       file_dict['_id'])
+            with profile_stage('write documents'):
+                create_a_new_survey_document(topic_db_name, file_dict)
+        else:
+            with profile_stage('read existing surveys'):
+                doc_with_same_id, other_active_surveys = analyze_existing_survey_documents(
+                    itertools.chain([first_existing_survey_row], existing_survey_rows), file_dict['_id'])
             user_input = input('\nWhat would you like to do?'
                                + create_prompt(doc_with_same_id, other_active_surveys) +
                                '\nenter other key to abort the process.\n')
-            handle_user_input(user_input, file_dict, doc_with_same_id, other_active_surveys)
+            with profile_stage('write documents'):
+                handle_user_input(user_input, file_dict, doc_with_same_id, other_active_surveys)
         sys.exit('\nSurvey Uploader is completed.')
-    except (AssertionError, JSONDecodeError) as e:
+    except (AssertionError, ValueError) as e:
         print('\nSurvey Uploader has aborted due to ' + e.__class__.__name__ + ':')
         sys.exit(e)
 
@@ -49,7 +53,8 @@ def main():
 def parse_args():
     parser = argparse.ArgumentParser(description='Survey Uploader uploads a valid survey JSON to the topic database.')
     parser.add_argument('json_file', metavar='json_file', nargs=1,
-                        help='The resulted json file from survey_parser.py')
+                        help='The resulted json or ndjson file from survey_parser.py')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     return args
 
@@ -230,10 +235,13 @@ def deactivate_survey_documents(documents):
     for doc in documents:
         doc['isActive'] = False
         doc['updatedAt'] = get_now_in_unix_milliseconds()
-    result = post_documents_to_topic_db(topic_db_name, {'docs': documents})
-    if 'error' in result:
-        raise AssertionError('Encountered an error when updating active survey documents: ' + result['error'])
-    print(result)
+    from cloudant_db.utilities import write_documents_to_topic_db
+    result = write_documents_to_topic_db(get_db_name_from_env(), {'docs': documents})
+    result.print_summary()
+    if len(result.error_results) > 0:
+        raise AssertionError('Encountered an error when updating active survey documents: ' +
+                             str(result.error_results))
+    print(result.results)
 
 
 def analyze_existing_survey_documents(doc_list, json_survey_id):
@@ -294,6 +302,7 @@ def create_a_new_survey_document(db_name, file_dict):
     print('\n******************** '
           'Create a new survey document'
           ' ********************')
+    from cloudant_db.utilities import put_a_document
     db_result = put_a_document(db_name, file_dict)
     print('A new survey document is created.')
     print(db_result)
@@ -311,7 +320,8 @@ def update_survey_document(file_dict, doc_with_same_id, other_active_surveys):
         raise AssertionError('There are more than one active surveys!')
     else:
         raise AssertionError('There is no document to be updated!')
-    db_result = put_a_document(topic_db_name, file_dict)
+    from cloudant_db.utilities import put_a_document
+    db_result = put_a_document(get_db_name_from_env(), file_dict)
     print(db_result)
 
 
@@ -323,7 +333,7 @@ def handle_user_input(user_input, file_dict, doc_with_same_id, other_active_surv
             raise AssertionError('There is a document with the same id!')
         if len(other_active_surveys) > 0:
             deactivate_survey_documents(other_active_surveys)
-            create_a_new_survey_document(topic_db_name, file_dict)
+            create_a_new_survey_document(get_db_name_from_env(), file_dict)
     else:
         print('\nYou chose to abort the process.')
         print('No document is created or updated.')
@@ -1,14 +1,62 @@
-def add_zero_to_section_ref_id(section_ref_id):
-    s_id = int(section_ref_id)
-    if s_id < 10:
-        return f'0{str(s_id)}'
+from utilities.child_row_index import ChildRowIndex
+from utilities.case_study_sheet_schemas import get_case_study_sheet_schemas
+
+
+def add_zero_to_section_ref_id(section_ref_id: str) -> str:
+    # the ids are read as strings, e.g., the section "1" becomes "01"
+    return section_ref_id.zfill(2)
+
+
+def add_zero_to_assignment_ref_id(assignment_ref_id: str) -> str:
+    # e.g., the exercise "1.2" becomes "01.2"
+    section_ref_id, separator, order = assignment_ref_id.partition('.')
+    return f'{add_zero_to_section_ref_id(section_ref_id)}{separator}{order}'
+
+
+def get_regex_for_spreadsheet_id_column_name(sheet_name: str):
+    schema = get_case_study_sheet_schemas().get(sheet_name)
+    if schema is None or schema.id_column is None:
+        return None
+    return schema.get_column(schema.id_column).regex
+
+
+def get_regex_for_id_pattern_in_case_study(sheet_name: str) -> str:
+    """
+    This function returns a regex pattern based on the sheet_name input.
+    """
+    if sheet_name == 'Section':
+        return r"([1-9][0-9]|[1-9]|0[1-9])"
+    elif sheet_name == 'Section Content':
+        return r"([1-9][0-9]|[1-9]|0[1-9])-content-(0[1-9]|[1-9][0-9])"
+    elif sheet_name == 'Exercises':
+        return r"([1-9][0-9]|[1-9]|0[1-9])\.([1-9])"
+    elif sheet_name == 'Questions':
+        return r"([1-9][0-9]|[1-9]|0[1-9])\.([1-9])\.(0[1-9]|[1-9][0-9])"
+    elif sheet_name == 'Additional Learning Material':
+        return r"([1-9][0-9]|[1-9]|0[1-9])-mat-(0[1-9]|[1-9][0-9])"
     else:
-        return str(s_id)
+        raise AssertionError(f'the given sheet name {sheet_name} is invalid.')
 
 
-def add_zero_to_assignment_ref_id(assignment_ref_id):
-    a_id = float(assignment_ref_id)
-    if a_id < 10:
-        return f'0{str(a_id)}'
+def get_separator_after_parent_id_in_case_study(child_sheet_name: str) -> str:
+    """
+    This function returns the string separating the parent id from the rest of a child id, e.g.,
+    "-content-" in the section content id "1-content-01" whose parent is the section "1".
+    """
+    if child_sheet_name == 'Section Content':
+        return '-content-'
+    elif child_sheet_name == 'Exercises' or child_sheet_name == 'Questions':
+        return '.'
+    elif child_sheet_name == 'Additional Learning Material':
+        return '-mat-'
     else:
-        return str(assignment_ref_id)
+        raise AssertionError(f'the given sheet name {child_sheet_name} does not have a parent sheet.')
+
+
+def create_case_study_child_row_index(child_sheet_df, child_sheet_name: str, parent_sheet_name: str) -> ChildRowIndex:
+    child_schema = get_case_study_sheet_schemas()[child_sheet_name]
+    child_id_column_name = child_schema.resolve(child_sheet_df).get_id_column_name()
+    return ChildRowIndex(child_sheet_df,
+                         child_id_column_name,
+                         get_regex_for_id_pattern_in_case_study(parent_sheet_name),
+                         get_separator_after_parent_id_in_case_study(child_sheet_name))
@@ -0,0 +1,72 @@
+import functools
+
+from utilities.sheet_schema import ColumnSpec, SheetSchema
+
+
+@functools.lru_cache(maxsize=None)
+def get_case_study_sheet_schemas() -> dict:
+    """
+    It returns the schemas of the case study sheets by sheet name, in the order of the sheets in the excel file.
+    Most of the sheets show instruction in the first row, so their header is the second row.
+    The id columns are read as strings, e.g., the exercise id 1.2 is read as "1.2" instead of a float.
+    The schemas are built once and shared by all the callers, so they should not be modified.
+    """
+    return {
+        'Case Study': SheetSchema('Case Study', 0, (
+            ColumnSpec('organization_name', r'organization name'),
+            ColumnSpec('org_id', r'org id', dtype=str),
+            ColumnSpec('case_study_id', r'case study id', dtype=str),
+            ColumnSpec('name', r'^\*name'),
+            ColumnSpec('description', r'description'),
+            ColumnSpec('objectives', r'objectives'),
+            ColumnSpec('tags', r'tags')
+        )),
+        'Section': SheetSchema('Section', 1, (
+            ColumnSpec('section_name', r'section name'),
+            ColumnSpec('section_id', r'section id', dtype=str)
+        ), id_column='section_id'),
+        'Section Content': SheetSchema('Section Content', 1, (
+            ColumnSpec('section_content_format', r'\*section content format'),
+            ColumnSpec('description', r'description'),
+            ColumnSpec('source_url', r'source url'),
+            ColumnSpec('additional_learning_material_ids', r'additional learning material ids', dtype=str),
+            ColumnSpec('content_id', r'content id', dtype=str)
+        ), id_column='content_id'),
+        'Exercises': SheetSchema('Exercises', 1, (
+            ColumnSpec('exercise_name', r'exercise name'),
+            ColumnSpec('description', r'description'),
+            ColumnSpec('objectives', r'objectives'),
+            ColumnSpec('level', r'level'),
+            ColumnSpec('solution_id', r'solution id', dtype=str),
+            ColumnSpec('additional_learning_material_ids', r'additional learning material ids', dtype=str),
+            ColumnSpec('exercise_id', r'exercise id', dtype=str)
+        ), id_column='exercise_id'),
+        'Questions': SheetSchema('Questions', 1, (
+            ColumnSpec('question_id', r'question id', dtype=str),
+            ColumnSpec('description', r'description'),
+            ColumnSpec('image_url', r'image url'),
+            ColumnSpec('option_header', r'option header'),
+            ColumnSpec('option_a', r'option a'),
+            ColumnSpec('option_b', r'option b'),
+            ColumnSpec('option_c', r'option c'),
+            ColumnSpec('option_d', r'option d'),
+            ColumnSpec('answer', r'^answer'),
+            ColumnSpec('feedback_for_correct_answer', r'feedback for correct answer'),
+            ColumnSpec('feedback_for_incorrect_answer', r'feedback for incorrect answer'),
+            ColumnSpec('additional_learning_material_id', r'additional learning material id', dtype=str),
+            ColumnSpec('tags', r'tags')
+        ), id_column='question_id'),
+        'Additional Learning Material': SheetSchema('Additional Learning Material', 1, (
+            ColumnSpec('learning_material_name', r'learning material name'),
+            ColumnSpec('description', r'description'),
+            ColumnSpec('source_url', r'source url'),
+            ColumnSpec('format', r'format'),
+            # the level is checked by the checks of the level columns of every sheet
+            ColumnSpec('level', r'level', is_required=False),
+            ColumnSpec('learning_material_id', r'additional learning material id', dtype=str)
+        ), id_column='learning_material_id')
+    }
+
+
+def get_case_study_sheet_schema(sheet_name: str) -> SheetSchema:
+    return get_case_study_sheet_schemas()[sheet_name]
@@ -0,0 +1,33 @@
+import re
+import pandas as pd
+
+
+class ChildRowIndex:
+    """
+    A ChildRowIndex groups the rows of a child sheet by the parent id extracted from the child ids, e.g.,
+    the questions "1.2.01" and "1.2.02" are grouped under the exercise "1.2".
+    The parent ids are extracted once with the parent id pattern followed by the given separator,
+    so looking up the child rows of a parent does not scan the whole child sheet again.
+    """
+    def __init__(self, child_df: pd.DataFrame, child_id_column_name: str, parent_id_pattern: str, separator: str):
+        self.child_df = child_df
+        self.child_id_column_name = child_id_column_name
+        regex = f'^(?P<parent_id>{parent_id_pattern}){re.escape(separator)}'
+        parent_ids = child_df[child_id_column_name].astype(str).str.extract(regex)['parent_id']
+        self._row_labels = {parent_id: labels for parent_id, labels in child_df.groupby(parent_ids).groups.items()}
+
+    @property
+    def parent_ids(self) -> list:
+        return list(self._row_labels.keys())
+
+    def has_children(self, parent_id: str) -> bool:
+        return parent_id in self._row_labels
+
+    def get_children(self, parent_id: str) -> pd.DataFrame:
+        """
+        It returns the child rows of the given parent id in their original order,
+        or an empty data frame if the parent id is not referred by any child ids.
+        """
+        if parent_id not in self._row_labels:
+            return self.child_df.iloc[0:0]
+        return self.child_df.loc[self._row_labels[parent_id]]
@@ -0,0 +1,95 @@
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+
+def open_workbook(excel_file):
+    """
+    It opens the excel file in the read-only mode of openpyxl, where the rows of a sheet are streamed from the file
+    instead of loading every cell of the workbook first.
+    """
+    from openpyxl import load_workbook
+    return load_workbook(excel_file, read_only=True, data_only=True, keep_links=False)
+
+
+def convert_cell(cell):
+    """
+    It converts the value of a cell the same way as pandas.read_excel does with openpyxl,
+    e.g., an empty cell becomes "" and a whole number stored as float becomes an int.
+    """
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+    if cell.value is None:
+        return ''
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        return value if value == cell.value else float(cell.value)
+    return cell.value
+
+
+def has_value(cells) -> bool:
+    return any(cell.value is not None and cell.value != '' for cell in cells)
+
+
+def get_matching_column_indexes(header: list, column_regexes) -> list:
+    """
+    It returns the positions of the header names matching any of the regexes, ignoring the case.
+    """
+    patterns = [re.compile(regex, re.IGNORECASE) for regex in column_regexes]
+    return [i for i, name in enumerate(header)
+            if type(name) == str and any(pattern.search(name) for pattern in patterns)]
+
+
+def read_sheet_data(worksheet, header_row: int = 0, column_regexes=None) -> list:
+    """
+    It streams the rows of the worksheet and returns the converted values as rows of equal length,
+    the same as pandas.read_excel reads them before building the data frame.
+    If column regexes are given, only the columns whose names in the header row match them are converted and kept,
+    the cells of the other columns, e.g., long instructions and notes, are skipped as the rows are read.
+    """
+    worksheet.reset_dimensions()
+    data = []
+    last_row_with_data = -1
+    column_indexes = None
+    for row_number, cells in enumerate(worksheet.rows):
+        if row_number == header_row and column_regexes is not None:
+            column_indexes = get_matching_column_indexes([convert_cell(cell) for cell in cells], column_regexes)
+        if column_indexes is None:
+            row = [convert_cell(cell) for cell in cells]
+            while len(row) > 0 and row[-1] == '':
+                row.pop()
+        else:
+            row = [convert_cell(cells[i]) if i < len(cells) else '' for i in column_indexes]
+        # the trailing rows are trimmed by the values of all the columns, so the number of rows does not change
+        if has_value(cells):
+            last_row_with_data = row_number
+        data.append(row)
+    data = data[:last_row_with_data + 1]
+    if column_indexes is not None:
+        # the rows above the header were read before the columns were known
+        data = [[''] * len(column_indexes) if i < header_row else row for i, row in enumerate(data)]
+    if len(data) > 0:
+        max_width = max(len(row) for row in data)
+        data = [row + [''] * (max_width - len(row)) for row in data]
+    return data
+
+
+def read_sheet(worksheet, header_row: int = 0, column_regexes=None, string_column_regexes=None) -> pd.DataFrame:
+    """
+    It returns the data frame of the worksheet, the same as pandas.read_excel with the given header row,
+    but with only the columns matching the column regexes if they are given.
+    The values of the columns matching the string column regexes are read as strings, the same as pandas.read_excel
+    with the dtype str, e.g., the id 1.2 is read as "1.2", and the empty cells stay NaN.
+    """
+    data = read_sheet_data(worksheet, header_row, column_regexes)
+    if len(data) == 0:
+        return pd.DataFrame()
+    dtype = None
+    if string_column_regexes is not None and header_row < len(data):
+        header = data[header_row]
+        dtype = {header[i]: str for i in get_matching_column_indexes(header, string_column_regexes)}
+    # the same parser as pandas.read_excel, so the values and the types of the columns do not change
+    return TextParser(data, header=header_row, skip_blank_lines=False, dtype=dtype).read()
@@ -0,0 +1,121 @@
+import json
+
+from cloudant_models.documents import Documents
+from cloudant_models.model import Model
+
+# the values json can write as they are
+plain_types = (str, int, float, bool, type(None))
+
+
+def flatten(value):
+    """
+    It converts the models of the documents into dicts and lists json can write,
+    the same way as jsonpickle.encode(value, unpicklable=False) does for plain values:
+    - a model becomes the dict of its properties, like its to_dict,
+    - tuples and sets become lists,
+    - the keys of a dict which are not strings become their repr, or "null" for None.
+    Any other type, e.g., a numpy scalar, is left to jsonpickle, so the output stays the same.
+    """
+    value_type = type(value)
+    if value_type in plain_types:
+        return value
+    if value_type in (list, tuple, set):
+        return [flatten(item) for item in value]
+    if value_type is dict:
+        return {get_key(key): flatten(item) for key, item in value.items()}
+    if isinstance(value, Model):
+        return {key: flatten(item) for key, item in value.iterate_items()}
+    import jsonpickle
+    return json.loads(jsonpickle.encode(value, unpicklable=False))
+
+
+def get_key(key) -> str:
+    if type(key) is str:
+        return key
+    return 'null' if key is None else repr(key)
+
+
+def iterate_json_chunks(value):
+    """
+    It yields the json of the value in chunks. The items of the lists at the top two levels, e.g., the documents
+    of a Documents, are flattened and encoded one at a time, so the json is never held in memory as a whole.
+    """
+    yield from iterate_json_chunks_of_level(value, 0)
+
+
+def iterate_json_chunks_of_level(value, level: int):
+    if level >= 2 or type(value) in plain_types:
+        yield json.dumps(flatten(value))
+        return
+    if type(value) in (list, tuple, set):
+        yield '['
+        for i, item in enumerate(value):
+            if i > 0:
+                yield ', '
+            yield from iterate_json_chunks_of_level(item, level + 1)
+        yield ']'
+        return
+    if type(value) is dict:
+        items = ((get_key(key), item) for key, item in value.items())
+    elif isinstance(value, Model):
+        # the nested models are converted as they are written, not all at once by to_dict
+        items = value.iterate_items()
+    else:
+        yield json.dumps(flatten(value))
+        return
+    yield '{'
+    for i, (key, item) in enumerate(items):
+        if i > 0:
+            yield ', '
+        yield json.dumps(key) + ': '
+        yield from iterate_json_chunks_of_level(item, level + 1)
+    yield '}'
+
+
+def encode(value) -> str:
+    return ''.join(iterate_json_chunks(value))
+
+
+def write_json_file(value, file_path):
+    """
+    It streams the json of the value to the file.
+    """
+    with open(file_path, 'w') as outfile:
+        for chunk in iterate_json_chunks(value):
+            outfile.write(chunk)
+
+
+def iterate_ndjson_lines(value):
+    """
+    It yields the json of each document on its own line, i.e., the docs of a Documents or a single document.
+    """
+    docs = value.docs if isinstance(value, Documents) else [value]
+    for doc in docs:
+        yield json.dumps(flatten(doc)) + '\n'
+
+
+def write_ndjson_file(value, file_path):
+    with open(file_path, 'w') as outfile:
+        for line in iterate_ndjson_lines(value):
+            outfile.write(line)
+
+
+def write_output_file(value, file_path, is_ndjson: bool = False):
+    if is_ndjson:
+        write_ndjson_file(value, file_path)
+    else:
+        write_json_file(value, file_path)
+
+
+def add_output_file_arguments(parser, default_file_stem: str):
+    parser.add_argument('--output-file', metavar='output_file', default=None,
+                        help=f'The file to store the parsed result, {default_file_stem}.json by default, '
+                             f'or {default_file_stem}.ndjson with --ndjson')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Store one document per line (NDJSON) instead of a single json object')
+
+
+def get_output_file(args, default_file_stem: str) -> str:
+    if args.output_file is not None:
+        return args.output_file
+    return default_file_stem + ('.ndjson' if args.ndjson else '.json')
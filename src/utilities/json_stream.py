@@ -0,0 +1,174 @@
+import json
+
+_decoder = json.JSONDecoder()
+_whitespace = ' \t\n\r'
+
+
+class JsonArrayReader:
+    """
+    A JsonArrayReader reads the items of an array of a top-level json object, e.g., the "docs" of a parsed file,
+    one at a time. The file is read in chunks and only the current item and a chunk are kept in memory,
+    so a file of any size can be read with a bounded memory.
+    The other properties of the object are skipped.
+    """
+    def __init__(self, file, array_key: str = 'docs', chunk_size: int = 1024 * 1024):
+        self.file = file
+        self.array_key = array_key
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.is_eof = False
+
+    def __iter__(self):
+        self.expect('{')
+        while True:
+            if self.peek() == '}':
+                raise ValueError(f'"{self.array_key}" is missing from the json')
+            key = self.read_value()
+            self.expect(':')
+            if key == self.array_key:
+                break
+            # the other properties are read and dropped
+            self.read_value()
+            if self.peek() == '}':
+                raise ValueError(f'"{self.array_key}" is missing from the json')
+            self.expect(',')
+        if self.peek() != '[':
+            raise ValueError(f'"{self.array_key}" should be an array')
+        self.expect('[')
+        if self.peek() == ']':
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ']':
+                return
+            self.expect(',')
+
+    def fill(self) -> bool:
+        """
+        It appends the next chunk of the file to the buffer and drops the part already read,
+        and returns False at the end of the file.
+        """
+        if self.is_eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if chunk == '':
+            self.is_eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _whitespace:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                raise ValueError('The json ends unexpectedly.')
+
+    def expect(self, character: str):
+        found = self.peek()
+        if found != character:
+            raise ValueError(f'Expecting "{character}" but found "{found}" in the json.')
+        self.position += 1
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+                # a number at the end of the buffer, e.g., "3.5" of "3.5e10", may continue in the next chunk
+                if self.is_eof or self.buffer[end - 1] in '"]}' or self.is_followed_by_delimiter(end):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.is_eof:
+                    raise
+            if not self.fill():
+                if self.is_eof and self.position < len(self.buffer):
+                    continue
+                raise ValueError('The json ends unexpectedly.')
+
+    def is_followed_by_delimiter(self, position: int) -> bool:
+        while position < len(self.buffer) and self.buffer[position] in _whitespace:
+            position += 1
+        return position < len(self.buffer) and self.buffer[position] in ',:]}'
+
+
+def iterate_json_array_items(file_path, array_key: str = 'docs'):
+    """
+    It yields the items of the array of the top-level object in the json file one at a time.
+    """
+    with open(file_path, 'r') as file:
+        yield from JsonArrayReader(file, array_key)
+
+
+class JsonFileArray:
+    """
+    A JsonFileArray stands for the array of a top-level json object in a file, e.g., the "docs" of a parsed file,
+    without loading it. Each iteration reads the items from the file again one at a time.
+    The length is counted by reading the file once, which also checks the whole file is valid json.
+    """
+    def __init__(self, file_path, array_key: str = 'docs'):
+        self.file_path = file_path
+        self.array_key = array_key
+        self._length = None
+
+    def __iter__(self):
+        return iterate_json_array_items(self.file_path, self.array_key)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+
+
+class NdjsonFileArray(JsonFileArray):
+    """
+    A NdjsonFileArray stands for the documents of a NDJSON file, one per line, without loading them.
+    """
+    def __init__(self, file_path):
+        super().__init__(file_path, None)
+
+    def __iter__(self):
+        return iterate_ndjson_items(self.file_path)
+
+
+def iterate_ndjson_items(file_path):
+    with open(file_path, 'r') as file:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip() == '':
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f'Line {str(line_number)} of {file_path} is not valid json: {e}')
+
+
+def is_ndjson_file(file_path) -> bool:
+    return file_path.lower().endswith(('.ndjson', '.jsonl'))
+
+
+def load_json_docs(file_path) -> dict:
+    """
+    It returns {"docs": docs} of a json file having "docs", or of a NDJSON file having a document per line,
+    where the docs are read from the file when they are iterated.
+    """
+    if is_ndjson_file(file_path):
+        return {'docs': NdjsonFileArray(file_path)}
+    return {'docs': JsonFileArray(file_path, 'docs')}
+
+
+def load_json_doc(file_path) -> dict:
+    """
+    It returns the single document of a json file, or of a NDJSON file having one line.
+    """
+    if not is_ndjson_file(file_path):
+        with open(file_path, 'r') as file:
+            return json.loads(file.read())
+    docs = list(iterate_ndjson_items(file_path))
+    if len(docs) != 1:
+        raise ValueError(f'{file_path} should have one document, but it has {str(len(docs))}.')
+    return docs[0]
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from cloudant_db.config import load_env
+
+# the src folder, whose source files make up the parser version
+source_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_parser_version = None
+
+
+class ParseCache:
+    """
+    A ParseCache stores the json produced from a workbook on disk, keyed by the content hash of the workbook,
+    the name of the parser and the parser version, so an unchanged workbook does not have to be parsed again.
+    The least recently used entries are evicted when the cache grows over the maximum size.
+    A disabled cache never hits and stores nothing.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    def get_key(self, excel_file, parser_name: str, is_ndjson: bool = False) -> str:
+        if not self.enabled:
+            return None
+        file_hash = hashlib.sha256()
+        with open(excel_file, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                file_hash.update(chunk)
+        # the json and the ndjson of a workbook are different entries
+        output_format = 'ndjson' if is_ndjson else 'json'
+        return f'{parser_name}-{output_format}-{get_parser_version()[:16]}-{file_hash.hexdigest()}'
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def copy_to_file(self, key: str, file_path) -> bool:
+        """
+        It copies the cached json of the key to the file, and returns False if there is no entry.
+        """
+        if not self.enabled or key is None or not os.path.isfile(self.get_path(key)):
+            return False
+        shutil.copyfile(self.get_path(key), file_path)
+        # the modification time marks the entry as recently used for the eviction
+        os.utime(self.get_path(key))
+        return True
+
+    def put_file(self, key: str, file_path):
+        """
+        It stores a copy of the json file as the entry of the key.
+        """
+        if not self.enabled or key is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # copy to a temporary file first, so concurrent parsers never read a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(file_descriptor)
+        shutil.copyfile(file_path, temp_path)
+        os.replace(temp_path, self.get_path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # it has been evicted by another parser at the same time
+                pass
+            total_bytes -= size
+
+
+def get_parser_version() -> str:
+    """
+    It hashes the python source files of the src folder, so any change of the parsers invalidates the cache.
+    """
+    global _parser_version
+    if _parser_version is None:
+        version_hash = hashlib.sha256()
+        for folder, _, files in sorted(os.walk(source_root)):
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(folder, name)
+                    version_hash.update(os.path.relpath(path, source_root).encode('utf-8'))
+                    with open(path, 'rb') as file:
+                        version_hash.update(file.read())
+        _parser_version = version_hash.hexdigest()
+    return _parser_version
+
+
+def add_parse_cache_arguments(parser):
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse the excel file even if it has not changed since it was last parsed')
+
+
+def create_parse_cache(args) -> ParseCache:
+    # the settings may be in the .env file, which the parsers do not load otherwise
+    load_env()
+    cache_dir = os.getenv('PARSE_CACHE_DIR', os.path.join('output', '.parse-cache'))
+    max_bytes = int(os.getenv('PARSE_CACHE_MAX_MB', '256')) * 1024 * 1024
+    return ParseCache(cache_dir, max_bytes, enabled=not getattr(args, 'no_cache', False))
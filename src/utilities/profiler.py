@@ -0,0 +1,199 @@
+import atexit
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+_profiler = None
+
+
+class Profiler:
+    """
+    A Profiler records the stages of a program, e.g., validating, parsing and writing the output, with
+    - the wall time of the stage,
+    - the number of excel sheets read, counted by the readers of the sheets, e.g., a WorkbookSession,
+    - the number of rows processed, i.e., the rows of the sheets read or the documents written to the database,
+    - the peak memory allocated by python during the stage, if the memory is traced by tracemalloc.
+    A stage nested in another stage is also counted in the outer stage.
+    The total also has the peak resident memory of the process, which is the highest value since the process started.
+    """
+    def __init__(self, trace_memory: bool = False):
+        self.start_time = time.perf_counter()
+        self.trace_memory = trace_memory
+        self.n_excel_reads = 0
+        self.n_rows = 0
+        self.stages = []
+        self.peak_memory = 0
+        # the peak memory of each stage being recorded, the innermost stage last
+        self._stage_peak_memories = []
+
+    def update_peak_memory(self):
+        """
+        It adds the traced peak since the last update to the stages being recorded, and resets the traced peak,
+        so the next stage starts from the memory allocated at its start.
+        """
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._stage_peak_memories = [max(stage_peak, peak_memory) for stage_peak in self._stage_peak_memories]
+        self.peak_memory = max(self.peak_memory, peak_memory)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start_time = time.perf_counter()
+        n_excel_reads = self.n_excel_reads
+        n_rows = self.n_rows
+        self.update_peak_memory()
+        self._stage_peak_memories.append(tracemalloc.get_traced_memory()[0] if self.trace_memory else 0)
+        try:
+            yield
+        finally:
+            self.update_peak_memory()
+            peak_memory = self._stage_peak_memories.pop()
+            self.stages.append({
+                'name': name,
+                'seconds': time.perf_counter() - start_time,
+                'excelReads': self.n_excel_reads - n_excel_reads,
+                'rows': self.n_rows - n_rows,
+                'peakMemoryMb': peak_memory / 1024 / 1024 if self.trace_memory else None
+            })
+
+    def count_excel_read(self, n_rows: int):
+        self.n_excel_reads += 1
+        self.n_rows += n_rows
+
+    def count_rows(self, n_rows: int):
+        self.n_rows += n_rows
+
+    def add_profile(self, profile: dict, name_prefix: str):
+        """
+        It adds the stages and the counts of a profile recorded elsewhere, e.g., in a worker process.
+        """
+        for stage in profile['stages']:
+            self.stages.append(dict(stage, name=f'{name_prefix}{stage["name"]}'))
+        self.n_excel_reads += profile['total']['excelReads']
+        self.n_rows += profile['total']['rows']
+
+    def to_dict(self) -> dict:
+        self.update_peak_memory()
+        return {
+            'stages': self.stages,
+            'total': {
+                'name': 'total',
+                'seconds': time.perf_counter() - self.start_time,
+                'excelReads': self.n_excel_reads,
+                'rows': self.n_rows,
+                'peakMemoryMb': self.peak_memory / 1024 / 1024 if self.trace_memory else None,
+                'processPeakRssMb': get_process_peak_rss_mb()
+            }
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def write_json(self, file_path):
+        with open(file_path, 'w') as outfile:
+            outfile.write(self.to_json())
+
+    def print_table(self):
+        profile = self.to_dict()
+        print('\n******************** Profile ********************')
+        print(f'{"stage":<50} {"seconds":>9} {"excel reads":>12} {"rows":>9} {"peak memory (MB)":>17}')
+        for stage in profile['stages'] + [profile['total']]:
+            peak_memory = '-' if stage['peakMemoryMb'] is None else f'{stage["peakMemoryMb"]:.1f}'
+            print(f'{stage["name"][:50]:<50} {stage["seconds"]:>9.3f} {stage["excelReads"]:>12} '
+                  f'{stage["rows"]:>9} {peak_memory:>17}')
+        if profile['total']['processPeakRssMb'] is not None:
+            print(f'The peak resident memory of the process is {profile["total"]["processPeakRssMb"]:.1f} MB.')
+
+
+def get_process_peak_rss_mb() -> float:
+    """
+    It returns the peak resident memory of the process since it started, which never goes down,
+    or None where it is not available, e.g., on Windows.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # the peak is in bytes on macOS and in kilobytes on Linux
+    return peak_rss / 1024 / 1024 if sys.platform == 'darwin' else peak_rss / 1024
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+def start_profiling(trace_memory: bool = False) -> Profiler:
+    """
+    It starts recording the stages, and the excel reads and the rows counted, until the profiling is stopped.
+    If trace_memory is True, the memory allocations are traced until then as well, which makes the program slower,
+    so the seconds of the stages are only comparable between runs with the same setting.
+    """
+    global _profiler
+    if trace_memory:
+        tracemalloc.start()
+    _profiler = Profiler(trace_memory)
+    return _profiler
+
+
+def stop_profiling() -> Profiler:
+    global _profiler
+    profiler = _profiler
+    _profiler = None
+    if profiler is not None and profiler.trace_memory:
+        profiler.update_peak_memory()
+        tracemalloc.stop()
+    return profiler
+
+
+def profile_stage(name: str):
+    """
+    It returns a context manager recording the stage if the profiling is started, and doing nothing otherwise.
+    """
+    if _profiler is None:
+        return contextlib.nullcontext()
+    return _profiler.stage(name)
+
+
+def count_excel_read(n_rows: int):
+    if _profiler is not None:
+        _profiler.count_excel_read(n_rows)
+
+
+def count_rows(n_rows: int):
+    if _profiler is not None:
+        _profiler.count_rows(n_rows)
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the time, the excel reads and the rows of each stage at the end')
+    parser.add_argument('--profile-file', metavar='profile_file', default=None,
+                        help='The json file to store the profile, used together with --profile')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='Trace the peak memory of each stage, which makes the program slower, '
+                             'used together with --profile')
+
+
+def start_profiling_by_args(args):
+    """
+    It starts the profiling if --profile is given. The profile is printed when the program exits,
+    so it is also printed when the program stops with sys.exit or an error.
+    """
+    if args.profile:
+        start_profiling(args.profile_memory)
+        atexit.register(finish_profiling, args.profile_file)
+
+
+def finish_profiling(profile_file=None):
+    profiler = stop_profiling()
+    if profiler is None:
+        return
+    profiler.print_table()
+    if profile_file is not None:
+        profiler.write_json(profile_file)
+        print(f'\nThe profile is stored at {profile_file}.')
@@ -0,0 +1,68 @@
+import re
+
+import pandas as pd
+
+
+class ColumnSpec:
+    """
+    A ColumnSpec declares a column of a sheet by its logical name and the regex of its header, ignoring the case.
+    A required column is checked by the validation, an optional column is only looked up by the parsers.
+    The values of a column with the dtype str, e.g., the id columns, are read as strings instead of numbers.
+    """
+    def __init__(self, name: str, regex: str, is_required: bool = True, dtype=None):
+        self.name = name
+        self.regex = regex
+        self.is_required = is_required
+        self.dtype = dtype
+        self.pattern = re.compile(regex, re.IGNORECASE)
+
+
+class SheetSchema:
+    """
+    A SheetSchema declares the header row and the columns of a sheet once for the validators and the parsers.
+    The id column is the column of the spreadsheet ids of the rows, if the sheet has one.
+    """
+    def __init__(self, sheet_name: str, header_row: int, columns: tuple, id_column: str = None):
+        self.sheet_name = sheet_name
+        self.header_row = header_row
+        self.columns = {column.name: column for column in columns}
+        self.id_column = id_column
+
+    def get_column(self, name: str) -> ColumnSpec:
+        return self.columns[name]
+
+    def get_required_column_regexes(self) -> tuple:
+        return tuple(column.regex for column in self.columns.values() if column.is_required)
+
+    def get_column_regexes(self) -> tuple:
+        return tuple(column.regex for column in self.columns.values())
+
+    def get_string_column_regexes(self) -> tuple:
+        return tuple(column.regex for column in self.columns.values() if column.dtype is str)
+
+    def resolve(self, df: pd.DataFrame):
+        return SheetColumns(self, df.columns)
+
+
+class SheetColumns:
+    """
+    SheetColumns map the logical names of a sheet schema to the column names of a data frame.
+    The column names matching each column spec are found once, so a parser looking up a column for every parent row,
+    e.g., the question columns for every exercise, does not search the column names again.
+    A logical name is resolved only if exactly one column matches, the same as get_a_matching_column_name_by_regex.
+    """
+    def __init__(self, schema: SheetSchema, column_names):
+        self.schema = schema
+        self._matching_column_names = {
+            name: [col for col in column_names if type(col) == str and column.pattern.search(col)]
+            for name, column in schema.columns.items()
+        }
+
+    def __getitem__(self, name: str) -> str:
+        matching_columns = self._matching_column_names[name]
+        assert len(matching_columns) != 0, "No matching column found"
+        assert len(matching_columns) == 1, f"Multiple matching columns found: {matching_columns}"
+        return matching_columns[0]
+
+    def get_id_column_name(self) -> str:
+        return self[self.schema.id_column]
@@ -0,0 +1,78 @@
+import pandas as pd
+
+from utilities.excel_sheet_reader import open_workbook, read_sheet
+from utilities.profiler import count_excel_read
+from utilities.sheet_schema import SheetColumns
+
+
+class WorkbookSession:
+    """
+    A WorkbookSession opens an excel file once and reads each sheet at most once.
+    The header row can be configured per sheet, e.g., sheets showing instructions in the first row use header 1.
+    The columns can also be pruned per sheet by the regexes of the column names, the other columns are skipped
+    while the rows are streamed from the read-only workbook, so they are never loaded.
+    The loaded data frames are shared by the validators and the parsers, so they should not be modified in place.
+    If the sheet schemas are given, the string columns of a sheet are read as strings, and the columns of a sheet
+    are resolved to their logical names once and shared as well.
+    """
+    def __init__(self, excel_file, header_rows: dict = None, default_header_row: int = 0,
+                 column_regexes: dict = None, schemas: dict = None):
+        self.excel_file = excel_file
+        self.header_rows = {} if header_rows is None else header_rows
+        self.default_header_row = default_header_row
+        self.column_regexes = {} if column_regexes is None else column_regexes
+        self.schemas = {} if schemas is None else schemas
+        self._workbook = None
+        self._sheets = {}
+        self._sheet_columns = {}
+
+    def _get_workbook(self):
+        if self._workbook is None:
+            self._workbook = open_workbook(self.excel_file)
+        return self._workbook
+
+    @property
+    def sheet_names(self) -> list:
+        return self._get_workbook().sheetnames
+
+    def get_header_row(self, sheet_name: str) -> int:
+        return self.header_rows.get(sheet_name, self.default_header_row)
+
+    def get_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """
+        It returns the data frame of the given sheet and reads the sheet only on the first call.
+        It raises a ValueError if the sheet is not in the file, the same as pandas.read_excel.
+        """
+        if sheet_name not in self._sheets:
+            if sheet_name not in self.sheet_names:
+                raise ValueError(f"Worksheet named '{sheet_name}' not found")
+            schema = self.schemas.get(sheet_name)
+            self._sheets[sheet_name] = read_sheet(self._get_workbook()[sheet_name], self.get_header_row(sheet_name),
+                                                  self.column_regexes.get(sheet_name),
+                                                  None if schema is None else schema.get_string_column_regexes())
+            # the validators show the excel row numbers of the offending rows by the header row
+            self._sheets[sheet_name].attrs['header_row'] = self.get_header_row(sheet_name)
+            count_excel_read(len(self._sheets[sheet_name]))
+        return self._sheets[sheet_name]
+
+    def get_columns(self, sheet_name: str) -> SheetColumns:
+        """
+        It returns the columns of the given sheet resolved by its schema, and resolves them only on the first call.
+        """
+        if sheet_name not in self._sheet_columns:
+            self._sheet_columns[sheet_name] = self.schemas[sheet_name].resolve(self.get_sheet(sheet_name))
+        return self._sheet_columns[sheet_name]
+
+    def get_sheets(self, sheet_names) -> dict:
+        return {sheet_name: self.get_sheet(sheet_name) for sheet_name in sheet_names}
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,5 +1,8 @@
 from .validation_message import ValidationMessage
+from .referential_integrity_result import ReferentialIntegrityResult
+from .validation_error import ValidationError
 import re
+import numpy as np
 import pandas as pd
 from utilities.regex_utilities import get_matching_column_names_by_regex
 
@@ -71,17 +74,28 @@ def check_required_columns_have_values_by_regex(
         result.is_valid = True
         result.message = sheet_name + ' does not have required columns as no columns match the pattern: ' + regex_pattern
         return result
+    error_messages = []
+    error_columns = []
+    error_rows = []
+    # every required column is checked, so all the empty cells can be reported at once
     for (column_name, column_data) in filtered_columns.items():
         if check_first_row_only:
             if pd.isnull(column_data[0]):
-                result.message = ('The first row in required column ' + column_name + ' in ' + sheet_name +
-                                  ' is empty!')
-                return result
+                error_messages.append('The first row in required column ' + column_name + ' in ' + sheet_name +
+                                      ' is empty!')
+                error_columns.append(column_name)
+                error_rows.append(column_data.index[0])
         else:
             if column_data.isna().sum() > 0:
-                result.message = ('In sheet "' + sheet_name + '", a required column "' + column_name +
-                                  '" has ' + str(column_data.isna().sum()) + ' empty cell(s)!')
-                return result
+                error_messages.append('In sheet "' + sheet_name + '", a required column "' + column_name +
+                                      '" has ' + str(column_data.isna().sum()) + ' empty cell(s)!')
+                error_columns.append(column_name)
+                error_rows += find_empty_cells(filtered_columns, column_name)
+    if len(error_messages) > 0:
+        result.message = '\n'.join(error_messages)
+        result.column_name = ', '.join(error_columns)
+        result.rows = sorted(set(error_rows))
+        return result
     result.is_valid = True
     result.message = 'All required columns have value(s)'
     return result
@@ -98,61 +112,177 @@ def check_uniqueness_of_list_items_in_cell(sheet_data_frame, column_names: list,
                 assert len(items) == len(set(items)), f"Non-unique item found in column '{column}': {value}"
 
 
+def get_excel_row_number(row_index, header_row: int = 0) -> int:
+    # the data frame index 0 is the row after the header row, and excel rows start from 1
+    return int(row_index) + header_row + 2
+
+
+def get_header_row(sheet_data_frame) -> int:
+    # a WorkbookSession keeps the header row of a sheet in the attrs of its data frame
+    return sheet_data_frame.attrs.get('header_row', 0)
+
+
+def format_row_numbers(sheet_data_frame, row_indexes: list, max_rows_shown: int = 20) -> str:
+    """
+    This function formats the indexes of offending rows of the sheet as excel row numbers for error messages,
+    the same row numbers as the validation report shows.
+    """
+    header_row = get_header_row(sheet_data_frame)
+    row_numbers = [str(get_excel_row_number(index, header_row)) for index in row_indexes[:max_rows_shown]]
+    if len(row_indexes) > max_rows_shown:
+        row_numbers.append(f'... ({len(row_indexes) - max_rows_shown} more)')
+    return ', '.join(row_numbers)
+
+
+def find_empty_cells(sheet_data_frame, column_name: str) -> list:
+    """
+    This function returns the indexes of the rows whose cell in the given column is NaN or None.
+    """
+    return sheet_data_frame.index[sheet_data_frame[column_name].isnull()].tolist()
+
+
+def find_values_not_matching_a_regex_pattern(sheet_data_frame, column_name: str, regex_pattern: str) -> list:
+    """
+    This function returns the indexes of the rows whose non-empty value in the given column does not match
+    the regex pattern. Like re.match, the pattern is matched from the beginning of the value.
+    """
+    values = sheet_data_frame[column_name].dropna()
+    is_matching = convert_values_to_strings(values).str.match(regex_pattern)
+    return values.index[~is_matching].tolist()
+
+
+def convert_values_to_strings(values):
+    """
+    This function converts the values of a column to strings as they are shown in the excel file.
+    A numeric column with an empty cell is read as floats, so its whole numbers, e.g., the level 4.0,
+    are converted as integers, e.g., "4".
+    """
+    strings = values.astype(str)
+    if pd.api.types.is_float_dtype(values):
+        is_whole_number = np.isfinite(values) & (values == values.round())
+        strings[is_whole_number] = values[is_whole_number].astype('int64').astype(str)
+    return strings
+
+
+def find_cell_strings_not_existing_in_another_sheet_column(current_sheet, column_name: str, separator: str,
+                                                           referencing_sheet, referencing_column_name: str) -> list:
+    """
+    This function returns (row index, item) pairs for the separated items in the cells of the given column
+    which do not exist in the referencing sheet column. Cells which are not strings are compared as a whole.
+    """
+    values = current_sheet[column_name].dropna()
+    is_string = values.map(lambda value: isinstance(value, str))
+    split_items = values[is_string].astype(object).str.split(separator).explode().str.strip()
+    items = pd.concat([split_items, values[~is_string]])
+    missing_items = items[~items.isin(referencing_sheet[referencing_column_name].values)]
+    return list(missing_items.sort_index(kind='stable').items())
+
+
 def check_cell_string_exists_in_another_sheet_column(current_sheet, column_names: list, separator: str,
                                                      referencing_sheet, referencing_column_name: str):
     """
     This function checks if a cell string exists in another sheet column.
-    If the cell string does not exist, it raises an assertion error.
+    If any cell string does not exist, it raises an assertion error listing all the missing items.
     """
+    error_messages = []
+    error_columns = []
+    error_rows = []
+    header_row = get_header_row(current_sheet)
     for column_name in column_names:
-        for cell_value in current_sheet[column_name]:
-            if pd.isnull(cell_value):
-                continue
-            try:
-                split_items = [item.strip() for item in cell_value.split(separator)]
-            except AttributeError:
-                assert cell_value in referencing_sheet[referencing_column_name].values, \
-                    f"{cell_value} does not exist in the referencing column"
-            else:
-                for item in split_items:
-                    assert item in referencing_sheet[referencing_column_name].values, \
-                        f"{item} does not exist in the referencing column"
+        missing_items = find_cell_strings_not_existing_in_another_sheet_column(
+            current_sheet, column_name, separator, referencing_sheet, referencing_column_name)
+        if len(missing_items) > 0:
+            items = ', '.join(f'{item} (row {str(get_excel_row_number(index, header_row))})'
+                              for index, item in missing_items)
+            error_messages.append(f"{items} in column '{column_name}' do(es) not exist in the referencing column")
+            error_columns.append(column_name)
+            error_rows.extend(index for index, item in missing_items)
+    if len(error_messages) > 0:
+        raise ValidationError('\n'.join(error_messages), ', '.join(error_columns), sorted(set(error_rows)))
 
 
 def check_column_values_match_a_regex_pattern(sheet_data_frame, column_name, regex_pattern, allow_empty_values):
     """
     This function checks if the values in a specific column of a dataframe match a given regex pattern.
     If allow_empty_values is False, it also checks if there are any NaN or None values in the column.
-    If the column does not exist, or if a value does not match the regex pattern, or if a value is NaN or None when allow_empty_values is False,
-    it raises an assertion error.
+    If the column does not exist, or if a value does not match the regex pattern,
+    or if a value is NaN or None when allow_empty_values is False, it raises an assertion error listing all
+    the offending rows. The whole numbers of a numeric column with an empty cell are matched without ".0".
     """
     assert column_name in sheet_data_frame.columns, f"the column '{column_name}' does not exist."
 
-    for value in sheet_data_frame[column_name]:
-        if pd.isnull(value):
-            assert allow_empty_values, f"the column '{column_name}' has empty cell(s)."
-        else:
-            assert re.match(regex_pattern, str(value)), (f"The cell value '{value}' "
-                                                         f"does not match the given regex pattern {regex_pattern}")
+    error_messages = []
+    empty_rows = [] if allow_empty_values else find_empty_cells(sheet_data_frame, column_name)
+    if len(empty_rows) > 0:
+        error_messages.append(f"the column '{column_name}' has empty cell(s) in row(s) "
+                              f"{format_row_numbers(sheet_data_frame, empty_rows)}.")
+    mismatched_rows = find_values_not_matching_a_regex_pattern(sheet_data_frame, column_name, regex_pattern)
+    if len(mismatched_rows) > 0:
+        values = sheet_data_frame.loc[mismatched_rows[:20], column_name].tolist()
+        error_messages.append(f"The cell value(s) {values} in row(s) "
+                              f"{format_row_numbers(sheet_data_frame, mismatched_rows)} "
+                              f"do(es) not match the given regex pattern {regex_pattern}")
+    if len(error_messages) > 0:
+        raise ValidationError('\n'.join(error_messages), column_name, sorted(empty_rows + mismatched_rows))
+
+
+def format_list_items(items: list, max_items_shown: int = 20) -> str:
+    shown_items = [f"'{str(item)}'" for item in items[:max_items_shown]]
+    if len(items) > max_items_shown:
+        shown_items.append(f'... ({len(items) - max_items_shown} more)')
+    return ', '.join(shown_items)
+
+
+def check_referential_integrity(parent_sheet, parent_sheet_id_column_name: str, parent_id_pattern: str,
+                                child_sheet, child_sheet_id_column_name: str) -> ReferentialIntegrityResult:
+    """
+    This function extracts the parent ids from all the child ids once with the parent id pattern
+    and compares them with the ids in the parent sheet using set operations.
+    It returns the unextractable child ids, the child ids referring to a non-existing parent id,
+    and the parent ids which are not referred by any child ids in one result.
+    """
+    child_ids = child_sheet[child_sheet_id_column_name]
+    extracted_parent_ids = child_ids.astype(str).str.extract(f'(?P<parent_id>{parent_id_pattern})')['parent_id']
+    existing_parent_ids = set(parent_sheet[parent_sheet_id_column_name].astype(str))
+    referred_parent_ids = set(extracted_parent_ids.dropna())
+
+    is_unextractable = extracted_parent_ids.isna()
+    is_orphan = ~is_unextractable & ~extracted_parent_ids.isin(existing_parent_ids)
+    result = ReferentialIntegrityResult(
+        unextractable_child_ids=child_ids[is_unextractable].tolist(),
+        orphan_child_ids=child_ids[is_orphan].tolist(),
+        childless_parent_ids=[parent_id for parent_id in parent_sheet[parent_sheet_id_column_name]
+                              if str(parent_id) not in referred_parent_ids]
+    )
+
+    if len(result.unextractable_child_ids) > 0:
+        result.unextractable_message = (f"Parent id cannot be extracted from the child id(s) "
+                                        f"{format_list_items(result.unextractable_child_ids)} "
+                                        f"using the pattern {parent_id_pattern}")
+    if len(result.orphan_child_ids) > 0:
+        orphan_parent_ids = extracted_parent_ids[is_orphan].unique().tolist()
+        result.orphan_message = (f"The child id(s) {format_list_items(result.orphan_child_ids)} refer to "
+                                 f"non-existing parent id(s) {format_list_items(orphan_parent_ids)} "
+                                 f"in the {parent_sheet_id_column_name}")
+    if len(result.childless_parent_ids) > 0:
+        result.childless_message = (f"The id(s) {format_list_items(result.childless_parent_ids)} have not been "
+                                    f"referred by any child ids in {child_sheet_id_column_name}")
+    messages = [m for m in (result.unextractable_message, result.orphan_message, result.childless_message)
+                if m is not None]
+    result.message = '\n'.join(messages) if len(messages) > 0 else 'The parent and child ids refer to each other.'
+    return result
 
 
 def check_referring_to_an_existing_parent_id(
         child_sheet, child_sheet_id_column_name, parent_id_pattern, parent_sheet, parent_sheet_id_column_name):
     """
     This function checks if the parent id extracted from the child sheet exists in the parent sheet.
-    If the parent id does not exist in the parent sheet, it raises an error.
+    If any parent id cannot be extracted or does not exist in the parent sheet, it raises an error listing all of them.
     """
-    for child_id in child_sheet[child_sheet_id_column_name]:
-        # Extract parent id using the parent id pattern
-        # print(child_id)
-        match = re.search(parent_id_pattern, str(child_id))
-        if match is None:
-            raise ValueError(f"Parent id cannot be extracted from {child_id} using the pattern {parent_id_pattern}")
-        parent_id = match.group(0)
-        # print(parent_id)
-        # Check if the parent id exists in the parent sheet
-        if parent_id not in parent_sheet[parent_sheet_id_column_name].values.astype(str):
-            raise ValueError(f"Referenced parent id '{parent_id}' does not exist in the {parent_sheet_id_column_name}")
+    result = check_referential_integrity(parent_sheet, parent_sheet_id_column_name, parent_id_pattern,
+                                         child_sheet, child_sheet_id_column_name)
+    if not result.has_valid_child_ids():
+        raise ValueError('\n'.join(m for m in (result.unextractable_message, result.orphan_message) if m is not None))
 
 
 def check_ids_are_referred_by_child_ids_in_another_sheet(current_sheet_df, current_sheet_id_column_name: str,
@@ -160,26 +290,14 @@ def check_ids_are_referred_by_child_ids_in_another_sheet(current_sheet_df, curre
                                                          child_sheet_id_column_name: str):
     """
     This function checks if the ids in the current sheet are referred by child ids in another sheet.
-    It raises an error if a parent id cannot be extracted or if an id in the current sheet is not referred by any child ids.
-    """
-    # Loop through the id column in the current sheet
-    for current_id in current_sheet_df[current_sheet_id_column_name]:
-        # print(current_id)
-        # Go through the child id in the child id column in the child sheet
-        for child_id in child_sheet_df[child_sheet_id_column_name]:
-            # print(child_id)
-            # Extract the parent id using the parent id pattern
-            parent_id = re.search(parent_id_pattern, child_id)
-            # print(type(parent_id))
-            if parent_id is None:
-                raise ValueError(f"Parent id cannot be extracted from child id {child_id}")
-            # Compare the id in the id column with the extracted parent id
-            if str(current_id) == parent_id.group():
-                break
-        else:
-            # If the id does not equal to any extracted parent id in the child ids, raise an error
-            raise ValueError(f"The id '{current_id}' has not been referred by any child ids in "
-                             f"{child_sheet_id_column_name}")
+    It raises an error if a parent id cannot be extracted
+    or if an id in the current sheet is not referred by any child ids.
+    """
+    result = check_referential_integrity(current_sheet_df, current_sheet_id_column_name, parent_id_pattern,
+                                         child_sheet_df, child_sheet_id_column_name)
+    if len(result.unextractable_child_ids) > 0 or len(result.childless_parent_ids) > 0:
+        raise ValueError('\n'.join(m for m in (result.unextractable_message, result.childless_message)
+                                   if m is not None))
 
 
 def check_column_y_has_value_given_column_x_values(
@@ -188,14 +306,35 @@ def check_column_y_has_value_given_column_x_values(
     This function checks if column y has a value given column x values.
     If column x value is one of the given_x_values, it raises an error if column y is None or NaN.
     If column x value is not one of the given_x_values, it raises an error if column y is not None or NaN.
+    The ValidationError lists all the offending rows.
+    """
+    rows_missing_y, rows_having_unexpected_y = find_rows_violating_dependency_between_two_columns(
+        current_sheet_df, column_x_name, column_y_name, given_x_values)
+    error_messages = []
+    if len(rows_missing_y) > 0:
+        error_messages.append(f'In row(s) {format_row_numbers(current_sheet_df, rows_missing_y)}, '
+                              f'column "{column_x_name}" has one of the values {given_x_values} '
+                              f'so column "{column_y_name}" should have a value too.')
+    if len(rows_having_unexpected_y) > 0:
+        error_messages.append(f'In row(s) {format_row_numbers(current_sheet_df, rows_having_unexpected_y)}, '
+                              f'column "{column_x_name}" is not one of the values {given_x_values} '
+                              f'so column "{column_y_name}" should not have a value either.')
+    if len(error_messages) > 0:
+        raise ValidationError('\n'.join(error_messages), column_y_name,
+                              sorted(rows_missing_y + rows_having_unexpected_y))
+
+
+def find_rows_violating_dependency_between_two_columns(
+        current_sheet_df, column_x_name: str, column_y_name: str, given_x_values: tuple):
+    """
+    This function returns the indexes of the rows missing a value in column y although column x has one of the
+    given_x_values, and the indexes of the rows having a value in column y although column x has none of them.
     """
-    for index, row in current_sheet_df.iterrows():
-        if row[column_x_name] in given_x_values and pd.isnull(row[column_y_name]):
-            raise ValueError(f'In row {str(index + 1)}, column "{column_x_name}" has value "{row[column_x_name]}" '
-                             f'so column "{column_y_name}" should have a value too.')
-        elif row[column_x_name] not in given_x_values and not pd.isnull(row[column_y_name]):
-            raise ValueError(f'In row {str(index + 1)}, column "{column_x_name}" is "{row[column_x_name]}" '
-                             f'so column "{column_y_name}" should not have a value either.')
+    has_given_x_value = current_sheet_df[column_x_name].isin(given_x_values)
+    is_y_empty = current_sheet_df[column_y_name].isnull()
+    rows_missing_y = current_sheet_df.index[has_given_x_value & is_y_empty].tolist()
+    rows_having_unexpected_y = current_sheet_df.index[~has_given_x_value & ~is_y_empty].tolist()
+    return rows_missing_y, rows_having_unexpected_y
 
 
 def check_values_of_columns_matching_given_regex(sheet_df, column_name_regex, value_regex, allow_empty: bool):
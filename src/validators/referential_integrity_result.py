@@ -0,0 +1,20 @@
+from .validation_message import ValidationMessage
+
+
+class ReferentialIntegrityResult(ValidationMessage):
+    """
+    A ReferentialIntegrityResult reports the relation between the ids of a parent sheet and a child sheet at once:
+    the child ids whose parent id cannot be extracted, the child ids referring to a non-existing parent id,
+    and the parent ids which are not referred by any child ids.
+    """
+    def __init__(self, unextractable_child_ids: list, orphan_child_ids: list, childless_parent_ids: list):
+        self.unextractable_child_ids = unextractable_child_ids
+        self.orphan_child_ids = orphan_child_ids
+        self.childless_parent_ids = childless_parent_ids
+        self.unextractable_message = None
+        self.orphan_message = None
+        self.childless_message = None
+        super().__init__(self.has_valid_child_ids() and len(childless_parent_ids) == 0, None)
+
+    def has_valid_child_ids(self) -> bool:
+        return len(self.unextractable_child_ids) == 0 and len(self.orphan_child_ids) == 0
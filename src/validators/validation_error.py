@@ -0,0 +1,10 @@
+class ValidationError(AssertionError):
+    """
+    A ValidationError is an AssertionError which also carries the coordinates of the offending cells,
+    so a ValidationReport can show them in addition to the message.
+    The rows are the indexes in the sheet data frame.
+    """
+    def __init__(self, message, column_name=None, rows=None):
+        super().__init__(message)
+        self.column_name = column_name
+        self.rows = rows
@@ -1,4 +1,8 @@
 class ValidationMessage:
-    def __init__(self, is_valid, message):
+    def __init__(self, is_valid, message, sheet_name=None, column_name=None, rows=None):
         self.is_valid = is_valid
         self.message = message
+        # optional coordinates of the offending cells, rows are the indexes in the sheet data frame
+        self.sheet_name = sheet_name
+        self.column_name = column_name
+        self.rows = rows
@@ -0,0 +1,119 @@
+import json
+
+from .excel_validator import get_excel_row_number
+from .validation_message import ValidationMessage
+
+
+class ValidationReport:
+    """
+    A ValidationReport runs the checks of an excel file and keeps their failed ValidationMessages.
+    In fail-fast mode, the first failed check raises an AssertionError, which is the default behavior of the parsers.
+    Otherwise, every check is run once and all the failures are collected with their sheet, row and column,
+    so they can be fixed in one go.
+    """
+    def __init__(self, fail_fast: bool = True, header_rows: dict = None):
+        self.fail_fast = fail_fast
+        self.header_rows = {} if header_rows is None else header_rows
+        self.messages = []
+
+    @property
+    def is_valid(self) -> bool:
+        return len(self.messages) == 0
+
+    def add(self, message: ValidationMessage):
+        if message.is_valid is not False:
+            return
+        if self.fail_fast:
+            raise AssertionError(message.message)
+        self.messages.append(message)
+
+    def check(self, sheet_name, check_function, *args, column_name=None, **kwargs) -> ValidationMessage:
+        """
+        It runs a check function which either returns a ValidationMessage or raises an AssertionError or a ValueError,
+        and adds a failed result to the report. It always returns a ValidationMessage,
+        so the caller can tell whether the check has passed in both modes.
+        """
+        try:
+            result = check_function(*args, **kwargs)
+        except (AssertionError, ValueError) as e:
+            if self.fail_fast:
+                raise
+            result = ValidationMessage(False, str(e).strip(), sheet_name,
+                                       getattr(e, 'column_name', None) or column_name, getattr(e, 'rows', None))
+            print('\nFailed! The error is added to the validation report.')
+            self.messages.append(result)
+            return result
+        if not isinstance(result, ValidationMessage):
+            return ValidationMessage(True, None, sheet_name, column_name)
+        if result.is_valid is False:
+            if result.sheet_name is None:
+                result.sheet_name = sheet_name
+            if result.column_name is None:
+                result.column_name = column_name
+            if not self.fail_fast:
+                print('\nFailed! The error is added to the validation report.')
+            self.add(result)
+        return result
+
+    def get_excel_row_numbers(self, message: ValidationMessage):
+        if message.rows is None:
+            return None
+        header_row = self.header_rows.get(message.sheet_name, 0)
+        return [get_excel_row_number(row, header_row) for row in message.rows]
+
+    def to_dict(self) -> dict:
+        return {
+            'isValid': self.is_valid,
+            'numberOfErrors': len(self.messages),
+            'errors': [{
+                'sheet': m.sheet_name,
+                'column': m.column_name,
+                'rows': self.get_excel_row_numbers(m),
+                'message': str(m.message).strip()
+            } for m in self.messages]
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def write_json(self, file_path):
+        with open(file_path, 'w') as outfile:
+            outfile.write(self.to_json())
+
+    def print_report(self):
+        print('\n******************** Validation report ********************')
+        if self.is_valid:
+            print('No errors are found.')
+            return
+        print(f'Found {str(len(self.messages))} error(s):')
+        for i, m in enumerate(self.messages):
+            coordinates = [f'sheet "{m.sheet_name}"'] if m.sheet_name is not None else []
+            if m.column_name is not None:
+                coordinates.append(f'column "{m.column_name}"')
+            rows = self.get_excel_row_numbers(m)
+            if rows is not None and len(rows) > 0:
+                coordinates.append('row(s) ' + ', '.join(str(row) for row in rows[:20]) +
+                                   (f' ... ({len(rows) - 20} more)' if len(rows) > 20 else ''))
+            print(f'\n{str(i + 1)}. {", ".join(coordinates)}')
+            print(str(m.message).strip())
+
+
+def add_validation_report_arguments(parser):
+    parser.add_argument('--collect-all', action='store_true',
+                        help='Run all the validation checks and report every error '
+                             'instead of stopping at the first one')
+    parser.add_argument('--report-file', metavar='report_file', default=None,
+                        help='The json file to store the validation report, used together with --collect-all')
+
+
+def finish_validation_report(report: ValidationReport, report_file=None):
+    """
+    It prints the collected report, stores it as json if a report file is given,
+    and raises an AssertionError if the report has errors, so the parsing is aborted.
+    """
+    report.print_report()
+    if report_file is not None:
+        report.write_json(report_file)
+        print(f'\nThe validation report is stored at {report_file}.')
+    if not report.is_valid:
+        raise AssertionError(f'The excel file has {str(len(report.messages))} validation error(s).')